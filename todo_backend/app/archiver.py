@@ -0,0 +1,104 @@
+# todo_backend/app/archiver.py
+# Archivierung: läuft im Lifespan alle ARCHIVE_INTERVAL Sekunden und verschiebt
+# erledigte Todos, die seit ARCHIVE_AFTER_DAYS nicht mehr geändert wurden, von
+# todos nach todos_archive (TodoRepository.archive_done). Die heiße Tabelle –
+# und damit Indextiefe und Buffer-Pool-Bedarf der Listen-Queries – wächst so
+# nicht mit der Historie mit.
+#
+# Batches von ARCHIVE_BATCH Zeilen, je eine kurze Transaktion; der Fortschritt
+# sind die Daten selbst (verschobene Zeilen sind weg), ein Abbruch verliert
+# also nichts. Nach jedem Batch mindestens ARCHIVE_PAUSE Sekunden bzw. so lange
+# Pause, wie der Batch gedauert hat – das Archiv belegt höchstens die Hälfte
+# einer Connection.
+import asyncio
+import logging
+import os
+import time
+from datetime import timedelta
+
+from sqlalchemy import Table, func, select, text
+
+from database.crud import TodoRepository
+from database.db_session import SessionLocal, get_engine
+from model.models import Todo, TodoArchive, utcnow
+from monitoring.metrics import ARCHIVE_BATCH_SECONDS, ARCHIVE_ERRORS, ARCHIVE_ROWS, DB_TABLE_ROWS
+
+ARCHIVER = os.getenv("ARCHIVER", "1") == "1"
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))      # Tage seit dem letzten Write
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "3600"))      # Sekunden
+ARCHIVE_BATCH = int(os.getenv("ARCHIVE_BATCH", "500"))               # Zeilen pro Transaktion
+ARCHIVE_MAX_PER_TICK = int(os.getenv("ARCHIVE_MAX_PER_TICK", "50000"))
+ARCHIVE_PAUSE = float(os.getenv("ARCHIVE_PAUSE", "0.2"))             # Sekunden zwischen Batches
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_TABLES = (Todo.__table__, TodoArchive.__table__)
+
+
+def table_rows(db, table: Table) -> int:
+    """Zeilen einer Tabelle – MySQL/PostgreSQL aus der Statistik (kein Full Scan), sonst COUNT(*)."""
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        rows = db.scalar(text(
+            "SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = :t"
+        ), {"t": table.name})
+    elif dialect == "postgresql":
+        rows = db.scalar(text("SELECT reltuples::bigint FROM pg_class WHERE relname = :t"), {"t": table.name})
+    else:
+        rows = None
+    if rows is None or rows < 0:  # PostgreSQL: -1 vor dem ersten ANALYZE
+        rows = db.scalar(select(func.count()).select_from(table))
+    return int(rows)
+
+
+class TodoArchiver:
+    def __init__(self, after_days: int = ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH,
+                 max_per_tick: int = ARCHIVE_MAX_PER_TICK, pause: float = ARCHIVE_PAUSE):
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.max_per_tick = max_per_tick
+        self.pause = pause
+        self.table_rows: dict[str, int] = {}  # Stand nach dem letzten Lauf (Metrik db_table_rows)
+        self.last_run: dict = {}
+        for table in ARCHIVE_TABLES:
+            DB_TABLE_ROWS.set_function(lambda name=table.name: self.table_rows.get(name, 0), table=table.name)
+
+    def archive(self) -> int:
+        """Ein Tick: höchstens max_per_tick Todos in Batches von batch_size."""
+        started = time.perf_counter()
+        before = utcnow() - timedelta(days=self.after_days)
+        moved = 0
+        with SessionLocal(bind=get_engine()) as db:
+            repo = TodoRepository(db)
+            below_id = db.scalar(select(func.max(Todo.id))) or 0
+            db.commit()
+            while moved < self.max_per_tick:
+                t0 = time.perf_counter()
+                batch = repo.archive_done(before, below_id, min(self.batch_size, self.max_per_tick - moved))
+                seconds = time.perf_counter() - t0
+                if not batch:
+                    break
+                ARCHIVE_BATCH_SECONDS.observe(seconds)
+                ARCHIVE_ROWS.inc(len(batch))
+                moved += len(batch)
+                time.sleep(max(self.pause, seconds))
+            for table in ARCHIVE_TABLES:
+                self.table_rows[table.name] = table_rows(db, table)
+            db.commit()
+        seconds = time.perf_counter() - started
+        self.last_run = {"rows": moved, "seconds": round(seconds, 3), "at": time.time()}
+        if moved:
+            logger.info("archived %d todos in %.2fs", moved, seconds)
+        return moved
+
+
+async def run_archiver(archiver: TodoArchiver, warmup: asyncio.Task, interval: float = ARCHIVE_INTERVAL) -> None:
+    """Hintergrund-Task aus dem Lifespan; wartet auf das Warmup, dann alle interval Sekunden ein Lauf."""
+    await warmup
+    while True:
+        try:
+            await asyncio.to_thread(archiver.archive)
+        except Exception:
+            ARCHIVE_ERRORS.inc()
+            logger.exception("todo archive run failed")
+        await asyncio.sleep(interval)
@@ -1,36 +1,73 @@
 # todo_backend/app/main.py
-from fastapi import FastAPI, Depends
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+import time
 
-from fast.routers import user_router, todo_router,status_router
-from database.db_session import Base, engine, SessionLocal
+_import_started = time.perf_counter()
 
-app = FastAPI(title="Todo API")
+# Die Router werden hier importiert und registriert (nicht erst im Lifespan): fast
+# die ganze Importzeit ist FastAPI/Pydantic beim Anlegen der Routen, das fiele
+# sonst nur in den ersten Request; mit gunicorn-preload zahlt es der Master einmal.
+# Nur bei Bedarf geladen: async Router (DB_ASYNC=1), Webhook-Sink, bcrypt-Pool.
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.startup import health_router, lifespan_with
+from database.crud import StaleTodoError
+from database.db_session import DATABASE_READ_URLS, DB_ASYNC
+from fast.etag import todo_etag
+from fast.read_pin import ReadPinMiddleware
+from fast.responses import default_response_class
+from monitoring.metrics import metrics_router
+from monitoring.middleware import MetricsMiddleware
+from security.pwd import PasswordHasherBusy
+from fast.events import events_router
+from fast.routers import batch_router, stats_router
+from fast.transfer import transfer_router
+
+# DB_ASYNC=1: async Engine + async Router, sonst der bisherige sync-Pfad
+if DB_ASYNC:
+    from fast.routers_async import user_router, todo_router, status_router
+else:
+    from fast.routers import user_router, todo_router, status_router
+
+# Engine, Schema und Pool-Warmup laufen im Lifespan (app/startup.py), nicht beim Import
+app = FastAPI(
+    title="Todo API",
+    lifespan=lifespan_with(time.perf_counter() - _import_started),
+    default_response_class=default_response_class(),  # JSON_RESPONSE=orjson
+)
+app.add_middleware(MetricsMiddleware)
+if DATABASE_READ_URLS:
+    app.add_middleware(ReadPinMiddleware)  # Primary-Pin per Cookie, gilt für alle Worker
 
 # Router registrieren
+app.include_router(batch_router)  # vor todo_router (DELETE /todos/batch vs /todos/{id})
+app.include_router(transfer_router)
+app.include_router(stats_router)  # Admin: GET /stats
+app.include_router(events_router)  # SSE: GET /users/{id}/todos/events
 app.include_router(user_router)
 app.include_router(todo_router)
 app.include_router(status_router)  # check backend
+app.include_router(health_router)  # /livez, /readyz
+app.include_router(metrics_router)  # Prometheus: GET /metrics
+
+
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server ausgelastet, bitte später erneut versuchen"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 
-# ---- Lazy-Bootstrap statt beim Import blockieren ----
-_bootstrapped = False
-
-def _ensure_bootstrapped():
-    """Tabellen nur einmal erzeugen – beim ersten Health-Aufruf."""
-    global _bootstrapped
-    if _bootstrapped:
-        return
-    Base.metadata.create_all(bind=engine)
-    _bootstrapped = True
-
-# ---- DB-Session Dependency (falls du sie hier brauchst) ----
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+@app.exception_handler(StaleTodoError)
+def stale_todo(request: Request, exc: StaleTodoError):
+    # If-Match passt nicht mehr: aktuelle Version mitschicken, Client lädt neu und entscheidet
+    return JSONResponse(
+        status_code=412,
+        content={"detail": "Todo wurde inzwischen geändert", "version": exc.version},
+        headers={"ETag": todo_etag(exc.version)},
+    )
 
 # ---- Lokaler Dev-Start (Render startet über start.sh) ----
 if __name__ == "__main__":
@@ -0,0 +1,195 @@
+# todo_backend/app/reminders.py
+# Reminder-Sweeper: läuft im Lifespan alle REMINDER_INTERVAL Sekunden und
+# gibt nicht erledigte Todos, deren Deadline erreicht ist (bis heute +
+# REMINDER_LEAD_DAYS), an einen Sink weiter (Log, Webhook oder eigene Klasse).
+#
+# Inkrementell über eine High-Water-Mark in sweeper_state:
+#   (deadline, todo_id) – Keyset über ix_todos_deadline_id, jede Zeile genau einmal
+#   max_id              – später angelegte Todos mit Deadline hinter der Marke;
+#                         rückt nur bis vor das erste Todo hinter der neuen Marke vor,
+#                         das der Batch nicht enthält (zwischen den Scans committed)
+# Jeder Batch wird per Compare-and-Swap auf die Marke "geclaimt"; laufen
+# mehrere Worker, bekommt jeder Batch trotzdem nur einer.
+import asyncio
+import importlib
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+
+from sqlalchemy import and_, func, or_, select, update
+
+from database.db_session import SessionLocal, get_engine
+from model.enums import TodoState
+from model.models import SweeperState, Todo
+from monitoring.metrics import REMINDER_ERRORS, REMINDER_SWEEP_SECONDS, REMINDER_TODOS
+
+REMINDER_SWEEPER = os.getenv("REMINDER_SWEEPER", "1") == "1"
+REMINDER_INTERVAL = float(os.getenv("REMINDER_INTERVAL", "60"))      # Sekunden
+REMINDER_BATCH = int(os.getenv("REMINDER_BATCH", "500"))             # Zeilen pro Batch
+REMINDER_MAX_PER_TICK = int(os.getenv("REMINDER_MAX_PER_TICK", "5000"))
+REMINDER_LEAD_DAYS = int(os.getenv("REMINDER_LEAD_DAYS", "1"))       # 1 = heute und morgen fällig
+REMINDER_SINK = os.getenv("REMINDER_SINK", "log")                    # log | webhook | modul:factory
+REMINDER_WEBHOOK_URL = os.getenv("REMINDER_WEBHOOK_URL", "")
+
+logger = logging.getLogger(__name__)
+
+SWEEPER_NAME = "reminders"
+
+
+class ReminderSink(ABC):
+    """Schnittstelle für die Ziele der Erinnerungen."""
+
+    @abstractmethod
+    def send(self, todos: list[dict]) -> None:
+        """Eine Exception lässt den Batch im nächsten Tick erneut zustellen."""
+
+
+class LogSink(ReminderSink):
+    def send(self, todos: list[dict]) -> None:
+        for todo in todos:
+            logger.info("reminder: todo %s (user %s) due %s: %s",
+                        todo["id"], todo["user_id"], todo["deadline"], todo["task"])
+
+
+class WebhookSink(ReminderSink):
+    """POST {"todos": [...]} als JSON an REMINDER_WEBHOOK_URL."""
+
+    def __init__(self, url: str = REMINDER_WEBHOOK_URL, timeout: float = 10):
+        if not url:
+            raise RuntimeError("REMINDER_WEBHOOK_URL fehlt")
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, todos: list[dict]) -> None:
+        import urllib.request  # nur für REMINDER_SINK=webhook, nicht beim Start
+
+        body = json.dumps({"todos": todos}, default=str).encode()
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+def load_sink(spec: str = REMINDER_SINK) -> ReminderSink:
+    """'log', 'webhook' oder 'paket.modul:factory' (Factory ohne Argumente, liefert einen ReminderSink)."""
+    if spec == "log":
+        return LogSink()
+    if spec == "webhook":
+        return WebhookSink()
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+def _row(todo) -> dict:
+    return {"id": todo.id, "user_id": todo.user_id, "task": todo.task,
+            "deadline": todo.deadline, "state": TodoState(todo.state).value}
+
+
+class ReminderSweeper:
+    def __init__(self, sink: ReminderSink, batch_size: int = REMINDER_BATCH,
+                 max_per_tick: int = REMINDER_MAX_PER_TICK, lead_days: int = REMINDER_LEAD_DAYS):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.max_per_tick = max_per_tick
+        self.lead_days = lead_days
+        self.last_run: dict = {}
+
+    def _state(self, db) -> SweeperState:
+        state = db.get(SweeperState, SWEEPER_NAME)
+        if state is None:
+            # erster Start: ab heute fällige Todos, ältere gelten als bekannt
+            max_id = db.scalar(select(func.max(Todo.id))) or 0
+            state = SweeperState(name=SWEEPER_NAME, deadline=date.today() - timedelta(days=1),
+                                 todo_id=0, max_id=max_id)
+            db.add(state)
+            db.commit()
+        return state
+
+    def _claim(self, db, state: SweeperState, **new) -> bool:
+        """Marke nur weiterschieben, wenn sie noch auf dem gelesenen Stand ist (CAS)."""
+        result = db.execute(
+            update(SweeperState)
+            .where(SweeperState.name == SWEEPER_NAME, SweeperState.deadline == state.deadline,
+                   SweeperState.todo_id == state.todo_id, SweeperState.max_id == state.max_id)
+            .values(**new)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def _deliver(self, db, state: SweeperState, rows: list[dict], kind: str, **new) -> bool:
+        old = {"deadline": state.deadline, "todo_id": state.todo_id, "max_id": state.max_id}
+        if not self._claim(db, state, **new):
+            return False
+        try:
+            self.sink.send(rows)
+        except Exception:
+            # Claim zurücknehmen – der Batch kommt im nächsten Tick wieder
+            db.execute(update(SweeperState).where(SweeperState.name == SWEEPER_NAME).values(**old))
+            db.commit()
+            raise
+        REMINDER_TODOS.inc(len(rows), kind=kind)
+        return True
+
+    def sweep(self) -> int:
+        """Ein Tick: höchstens max_per_tick Todos in Batches von batch_size."""
+        started = time.perf_counter()
+        horizon = date.today() + timedelta(days=self.lead_days)
+        open_todo = and_(Todo.state != TodoState.DONE, Todo.deadline.is_not(None))
+        processed = 0
+        with SessionLocal(bind=get_engine()) as db:
+            while processed < self.max_per_tick:
+                # nach jedem commit frisch aus der DB – ein anderer Worker kann die Marke verschoben haben
+                state = self._state(db)
+                # 1) nachträglich angelegte Todos mit Deadline hinter der Marke (id-Range über den PK)
+                late = list(db.scalars(
+                    select(Todo).where(open_todo, Todo.id > state.max_id, Todo.deadline < state.deadline)
+                    .order_by(Todo.id).limit(self.batch_size)
+                ))
+                if late:
+                    if self._deliver(db, state, [_row(t) for t in late], "late", max_id=late[-1].id):
+                        processed += len(late)
+                    continue
+                # 2) Keyset über (deadline, id) bis zum Horizont
+                todos = list(db.scalars(
+                    select(Todo).where(
+                        open_todo,
+                        Todo.deadline <= horizon,
+                        or_(Todo.deadline > state.deadline,
+                            and_(Todo.deadline == state.deadline, Todo.id > state.todo_id)),
+                    ).order_by(Todo.deadline, Todo.id).limit(self.batch_size)
+                ))
+                if not todos:
+                    break
+                last = todos[-1]
+                ids = [t.id for t in todos]
+                # offene Todos hinter der neuen Marke, die der Batch nicht hat (nach dem Late-Scan
+                # angelegt/wieder geöffnet) – max_id darf nicht über sie hinweg, sonst sind sie verloren;
+                # Batch-Todos oberhalb davon kommen dafür später als "late" noch einmal
+                gap = db.scalar(select(func.min(Todo.id)).where(
+                    open_todo, Todo.id > state.max_id, Todo.id.not_in(ids),
+                    or_(Todo.deadline < last.deadline, and_(Todo.deadline == last.deadline, Todo.id < last.id)),
+                ))
+                max_id = max([state.max_id, *(i for i in ids if gap is None or i < gap)])
+                if self._deliver(db, state, [_row(t) for t in todos], "due",
+                                 deadline=last.deadline, todo_id=last.id, max_id=max_id):
+                    processed += len(todos)
+        seconds = time.perf_counter() - started
+        REMINDER_SWEEP_SECONDS.observe(seconds)
+        self.last_run = {"rows": processed, "seconds": round(seconds, 3), "at": time.time()}
+        if processed:
+            logger.info("reminder sweep: %d todos in %.2fs", processed, seconds)
+        return processed
+
+
+async def run_sweeper(sweeper: ReminderSweeper, warmup: asyncio.Task, interval: float = REMINDER_INTERVAL) -> None:
+    """Hintergrund-Task aus dem Lifespan; wartet auf das Warmup, dann alle interval Sekunden ein Sweep."""
+    await warmup
+    while True:
+        try:
+            await asyncio.to_thread(sweeper.sweep)
+        except Exception:
+            REMINDER_ERRORS.inc()
+            logger.exception("reminder sweep failed")
+        await asyncio.sleep(interval)
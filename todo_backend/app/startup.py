@@ -0,0 +1,137 @@
+# todo_backend/app/startup.py
+# Lifespan: Engine anlegen, Schema-Bootstrap und Pool-Prewarm im Hintergrund.
+# Der Port ist sofort offen (/livez), /readyz meldet erst nach dem Warmup 200.
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+
+from app.archiver import ARCHIVER, TodoArchiver, run_archiver
+from app.reminders import REMINDER_SWEEPER, ReminderSweeper, load_sink, run_sweeper
+from database.db_session import (
+    DB_BOOTSTRAP,
+    bootstrap_schema,
+    dispose_engines,
+    get_async_engine,
+    get_engine,
+    prewarm_async_pool,
+    prewarm_pool,
+    replicas,
+)
+from database.search import detect_search_mode, ensure_search_index
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MAX_BACKOFF = 30  # Sekunden zwischen Versuchen, solange die DB nicht erreichbar ist
+
+
+class Readiness:
+    def __init__(self):
+        self.ready = False
+        self.error: str | None = None
+        self.attempts = 0
+        self.timings: dict[str, float] = {}
+
+
+readiness = Readiness()
+
+
+def _bootstrap() -> None:
+    bootstrap_schema()
+    # Volltext-Index (FTS5-Tabelle + Trigger bzw. MySQL FULLTEXT) ist DDL – nur mit DB_BOOTSTRAP
+    mode = ensure_search_index(get_engine()) if DB_BOOTSTRAP else detect_search_mode(get_engine())
+    logger.info("search mode: %s", mode)
+
+
+async def _prewarm_replicas() -> int:
+    """Replica-Pools parallel vorwärmen; eine nicht erreichbare Replica blockiert /readyz nicht."""
+    if replicas is None:
+        return 0
+    if get_async_engine() is not None:
+        jobs = [prewarm_async_pool(engine) for engine in replicas.async_engines()]
+    else:
+        jobs = [asyncio.to_thread(prewarm_pool, engine) for engine in replicas.engines()]
+    connections = 0
+    for i, result in enumerate(await asyncio.gather(*jobs, return_exceptions=True)):
+        if isinstance(result, Exception):
+            logger.warning("replica%d warmup failed: %s: %s", i, result.__class__.__name__, result)
+        else:
+            connections += result
+    return connections
+
+
+async def warm_up(started: float) -> None:
+    """Bootstrap + Prewarm, bei DB-Fehlern mit Backoff bis es klappt."""
+    backoff = 1.0
+    while True:
+        readiness.attempts += 1
+        try:
+            t0 = time.perf_counter()
+            await asyncio.to_thread(_bootstrap)
+            t1 = time.perf_counter()
+            async_engine = get_async_engine()
+            if async_engine is not None:
+                connections = await prewarm_async_pool(async_engine)
+            else:
+                connections = await asyncio.to_thread(prewarm_pool, get_engine())
+            connections += await _prewarm_replicas()
+            t2 = time.perf_counter()
+        except Exception as e:
+            readiness.error = f"{e.__class__.__name__}: {e}"
+            logger.warning("warmup attempt %d failed: %s", readiness.attempts, readiness.error)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, WARMUP_MAX_BACKOFF)
+            continue
+        readiness.timings.update(bootstrap=round(t1 - t0, 3), prewarm=round(t2 - t1, 3),
+                                 total=round(t2 - started, 3))
+        readiness.error = None
+        readiness.ready = True
+        logger.info("ready after %.2fs (bootstrap %.2fs, %d connections in %.2fs)",
+                    t2 - started, t1 - t0, connections, t2 - t1)
+        return
+
+
+def lifespan_with(import_seconds: float):
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        started = time.perf_counter()
+        readiness.timings["import"] = round(import_seconds, 3)
+        # DB_ASYNC=1: nur die AsyncEngine; die Sync-Engine (kleiner Pool) entsteht erst bei Bedarf
+        if get_async_engine() is None:
+            get_engine()
+        task = asyncio.create_task(warm_up(started))
+        tasks = [task]
+        if REMINDER_SWEEPER:
+            tasks.append(asyncio.create_task(run_sweeper(ReminderSweeper(load_sink()), task)))
+        if ARCHIVER:
+            tasks.append(asyncio.create_task(run_archiver(TodoArchiver(), task)))
+        yield
+        for t in tasks:
+            t.cancel()
+        await dispose_engines()
+
+    return lifespan
+
+
+health_router = APIRouter(tags=["status"])
+
+
+@health_router.get("/livez")
+async def livez():
+    """Prozess lebt – ohne DB-Zugriff."""
+    return {"status": "alive"}
+
+
+@health_router.get("/readyz")
+async def readyz():
+    """200 sobald Schema und Pool bereit sind, sonst 503 + Retry-After."""
+    if readiness.ready:
+        return {"status": "ready", "timings": readiness.timings}
+    return JSONResponse(
+        status_code=503,
+        content={"status": "starting", "attempts": readiness.attempts, "detail": readiness.error},
+        headers={"Retry-After": "1"},
+    )
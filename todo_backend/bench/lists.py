@@ -0,0 +1,112 @@
+# todo_backend/bench/lists.py
+# Rows/sec für Todo-Listen: Query + Serialisierung, alter Pfad gegen Fast-Path.
+#
+#   orm_from_attributes  select(Todo) -> TodoRead.model_validate(obj) -> dump_json   (ursprüngliche Router)
+#   orm_dict_validate    select(Todo) -> todo_dict -> TypeAdapter validate + dump_json (FastAPI response_model)
+#   columns_validate     Spalten-Query -> dicts -> TypeAdapter validate + dump_json   (Fast-Path ohne orjson)
+#   columns_orjson       Spalten-Query -> dicts -> orjson.dumps                       (Fast-Path)
+#   http_list            GET /users/{id}/todos über die ASGI-App (TestClient, Cache aus)
+#
+#   python -m bench.lists --todos 5000
+import argparse
+import json
+import os
+import statistics
+import time
+
+from bench.load import RESULTS_DIR, git_revision
+from bench.seed import seed
+
+
+def rows_per_sec(fn, rows: int, repeat: int) -> dict:
+    fn()  # warmup
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    mean = statistics.fmean(samples)
+    return {"repeat": repeat, "mean_ms": round(mean * 1000, 3), "rows_per_sec": round(rows / mean)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rows/sec for todo list serialization")
+    parser.add_argument("--database-url", default="sqlite:///bench_lists.db")
+    parser.add_argument("--todos", type=int, default=5000, help="Todos des gemessenen Users")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-http", action="store_true", help="ohne den Durchlauf über die ASGI-App")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["TODO_CACHE"] = "off"
+    os.environ["REMINDER_SWEEPER"] = "0"
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    os.environ.setdefault("BCRYPT_WORKERS", "0")
+    seed(args.database_url, 1, args.todos)
+
+    from sqlalchemy import select
+
+    from database.crud import todo_dict, todo_rows, todos_page_stmt
+    from database.db_session import SessionLocal, get_engine
+    from fast.responses import dump_todos, orjson, todo_list_adapter
+    from fast.schemas import TodoRead
+    from model.models import Todo
+
+    user_id = 1
+    orm_stmt = select(Todo).where(Todo.user_id == user_id).order_by(Todo.id)
+    results = {}
+    with SessionLocal(bind=get_engine()) as db:
+
+        def orm_from_attributes():
+            todos = list(db.scalars(orm_stmt))
+            db.expunge_all()  # wie pro Request eine neue Session
+            return todo_list_adapter.dump_json([TodoRead.model_validate(t) for t in todos])
+
+        def orm_dict_validate():
+            rows = [todo_dict(t) for t in db.scalars(orm_stmt)]
+            db.expunge_all()
+            return todo_list_adapter.dump_json(todo_list_adapter.validate_python(rows))
+
+        def columns_validate():
+            rows = todo_rows(db.execute(todos_page_stmt(user_id)))
+            return todo_list_adapter.dump_json(todo_list_adapter.validate_python(rows))
+
+        def columns_fast():
+            return dump_todos(todo_rows(db.execute(todos_page_stmt(user_id))))
+
+        results["orm_from_attributes"] = rows_per_sec(orm_from_attributes, args.todos, args.repeat)
+        results["orm_dict_validate"] = rows_per_sec(orm_dict_validate, args.todos, args.repeat)
+        results["columns_validate"] = rows_per_sec(columns_validate, args.todos, args.repeat)
+        if orjson is not None:
+            results["columns_orjson"] = rows_per_sec(columns_fast, args.todos, args.repeat)
+
+    if not args.no_http:
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        with TestClient(app) as client:
+            while client.get("/readyz").status_code != 200:
+                time.sleep(0.05)
+            results["http_list"] = rows_per_sec(lambda: client.get(f"/users/{user_id}/todos").raise_for_status(),
+                                                args.todos, args.repeat)
+
+    before = results["orm_from_attributes"]["rows_per_sec"]
+    for name, result in results.items():
+        result["speedup"] = round(result["rows_per_sec"] / before, 2)
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "result": results,
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out = RESULTS_DIR / f"lists-{time.strftime('%Y%m%d-%H%M%S')}-{report['revision']}.json"
+    out.write_text(json.dumps(report, indent=2))
+    for name, result in results.items():
+        print(f"{name:22s} {result['mean_ms']:9.2f} ms {result['rows_per_sec']:>12,} rows/s  x{result['speedup']}")
+    print(f"\nErgebnis gespeichert: {out}")
+
+
+if __name__ == "__main__":
+    main()
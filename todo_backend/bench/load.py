@@ -0,0 +1,254 @@
+# todo_backend/bench/load.py
+# Lasttest gegen einen lokal gestarteten Server (uvicorn app.main:app).
+# Das Request-Mix bildet die Streamlit-Flows aus todo_frontend/app.py nach:
+# Login, Liste laden (mit If-None-Match), Todo anlegen, State ändern, löschen.
+#
+#   pip install -r bench/requirements.txt
+#   python -m bench.load --users 50 --todos 200 --concurrency 16 --duration 30
+#   python -m bench.load --compare bench/results/<vorheriger-lauf>.json
+#
+# Gegen MySQL (z.B. lokaler mysqld/MariaDB ohne Container):
+#   python -m bench.load --database-url mysql+pymysql://root@127.0.0.1/todo_bench
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from bench.seed import BENCH_PASSWORD, seed
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Gewichte pro Schritt – grob wie ein Streamlit-Nutzer: jeder Rerun lädt die Liste
+MIX = {"list": 60, "create": 15, "state": 12, "delete": 8, "login": 5}
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(p / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float]) -> dict:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+    }
+
+
+def query_counters(metrics_text: str) -> dict[str, list[float]]:
+    """route -> [Summe, Anzahl] aus dem Histogramm db_queries_per_request."""
+    counters: dict[str, list[float]] = {}
+    for name, route, value in re.findall(r'^db_queries_per_request_(sum|count)\{route="([^"]*)"\} (\S+)$',
+                                         metrics_text, re.M):
+        counters.setdefault(route, [0.0, 0.0])[0 if name == "sum" else 1] = float(value)
+    return counters
+
+
+def queries_per_request(before: dict, after: dict) -> dict[str, float]:
+    """Queries pro Request je Route, nur für das Messfenster."""
+    result = {}
+    for route, (total, count) in after.items():
+        total_before, count_before = before.get(route, (0.0, 0.0))
+        if route != "/metrics" and count > count_before:
+            result[route] = round((total - total_before) / (count - count_before), 2)
+    return result
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, user_id: int, name: str):
+        self.client = client
+        self.user_id = user_id
+        self.name = name
+        self.headers: dict[str, str] = {}
+        self.etag: str | None = None
+        self.todo_ids: list[int] = []
+
+    async def login(self) -> httpx.Response:
+        r = await self.client.post("/users/login", json={"name": self.name, "password": BENCH_PASSWORD})
+        if r.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        return r
+
+    async def list(self) -> httpx.Response:
+        headers = dict(self.headers)
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        r = await self.client.get(f"/users/{self.user_id}/todos", headers=headers)
+        if r.status_code == 200:
+            self.etag = r.headers.get("ETag")
+            self.todo_ids = [t["id"] for t in r.json()]
+        return r
+
+    async def create(self) -> httpx.Response:
+        payload = {"task": "bench", "description": "load test", "state": "OPEN"}
+        r = await self.client.post("/todos/", params={"user_id": self.user_id}, json=payload, headers=self.headers)
+        if r.status_code == 200:
+            self.todo_ids.append(r.json()["id"])
+        return r
+
+    async def state(self) -> httpx.Response:
+        if not self.todo_ids:
+            return await self.list()
+        todo_id = random.choice(self.todo_ids)
+        return await self.client.put(f"/todos/{todo_id}/state", params={"new_state": random.choice(["OPEN", "DONE"])},
+                                     headers=self.headers)
+
+    async def delete(self) -> httpx.Response:
+        if not self.todo_ids:
+            return await self.list()
+        todo_id = self.todo_ids.pop(random.randrange(len(self.todo_ids)))
+        return await self.client.delete(f"/todos/{todo_id}", headers=self.headers)
+
+
+async def run_load(base_url: str, users: int, concurrency: int, duration: float, warmup: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        user_rows = (await client.get("/users/")).json()[:users]
+        vusers = [VirtualUser(client, u["id"], u["name"]) for u in user_rows]
+        for vu in vusers[:concurrency]:
+            await vu.login()
+
+        latencies: dict[str, list[float]] = {op: [] for op in MIX}
+        statuses: dict[str, int] = {}
+        ops, weights = zip(*MIX.items())
+        deadline = time.perf_counter() + warmup + duration
+        measure_from = time.perf_counter() + warmup
+
+        async def worker(index: int):
+            rnd = random.Random(index)
+            while time.perf_counter() < deadline:
+                vu = vusers[rnd.randrange(len(vusers))]
+                op = rnd.choices(ops, weights)[0]
+                started = time.perf_counter()
+                r = await getattr(vu, op)()
+                if started >= measure_from:
+                    latencies[op].append(time.perf_counter() - started)
+                    statuses[str(r.status_code)] = statuses.get(str(r.status_code), 0) + 1
+
+        tasks = [asyncio.create_task(worker(i)) for i in range(concurrency)]
+        await asyncio.sleep(warmup)
+        # bei mehreren Workern sieht /metrics nur einen Prozess – Stichprobe
+        metrics_before = query_counters((await client.get("/metrics")).text)
+        await asyncio.gather(*tasks)
+        metrics_after = query_counters((await client.get("/metrics")).text)
+
+    total = sum(len(v) for v in latencies.values())
+    return {
+        "throughput_rps": round(total / duration, 1),
+        "requests": total,
+        "status_codes": statuses,
+        "overall": summarize([x for v in latencies.values() for x in v]),
+        "per_op": {op: summarize(v) for op, v in latencies.items()},
+        "queries_per_request": queries_per_request(metrics_before, metrics_after),
+    }
+
+
+def start_server(database_url: str, port: int, extra_env: dict[str, str], workers: int = 1,
+                 server: str = "uvicorn") -> subprocess.Popen:
+    env = {**os.environ, "DATABASE_URL": database_url, **extra_env}
+    if server == "gunicorn":
+        # wie start.sh; WEB_CONCURRENCY statt Auto-Erkennung, damit Läufe vergleichbar bleiben
+        env.update(WEB_CONCURRENCY=str(workers), HOST="127.0.0.1", PORT=str(port), GUNICORN_ACCESS_LOG="")
+        cmd = [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py", "--log-level", "warning"]
+        return subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env)
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--log-level", "warning"]
+    if workers > 1:
+        cmd += ["--workers", str(workers)]
+    return subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env)
+
+
+def wait_until_up(base_url: str, server: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server beendet (exit code {server.returncode})")
+        try:
+            if httpx.get(f"{base_url}/readyz", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server nicht erreichbar")
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, previous_path: str) -> None:
+    previous = json.loads(Path(previous_path).read_text())
+    print(f"\nVergleich mit {previous_path} ({previous.get('revision')}):")
+    for key in ("throughput_rps",):
+        print(f"  {key}: {previous['result'][key]} -> {current['result'][key]}")
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        print(f"  {key}: {previous['result']['overall'][key]} -> {current['result']['overall'][key]}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test for the Todo API")
+    parser.add_argument("--database-url", default="sqlite:///bench.db")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--todos", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--server", default="uvicorn", choices=["uvicorn", "gunicorn"],
+                        help="gunicorn = gunicorn.conf.py wie in start.sh")
+    parser.add_argument("--env", action="append", default=[], help="KEY=VALUE for the server, e.g. DB_ASYNC=1")
+    parser.add_argument("--no-seed", action="store_true")
+    parser.add_argument("--compare", help="previous result JSON")
+    parser.add_argument("--label", default="")
+    args = parser.parse_args()
+
+    extra_env = dict(item.split("=", 1) for item in args.env)
+    extra_env.setdefault("BCRYPT_ROUNDS", "10")
+    if not args.no_seed:
+        os.environ.setdefault("BCRYPT_ROUNDS", extra_env["BCRYPT_ROUNDS"])
+        seed(args.database_url, args.users, args.todos)
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.database_url, args.port, extra_env, args.workers, args.server)
+    try:
+        wait_until_up(base_url, server)
+        result = asyncio.run(run_load(base_url, args.users, args.concurrency, args.duration, args.warmup))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    report = {
+        "revision": git_revision(),
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: v for k, v in vars(args).items() if k != "compare"},
+        "result": result,
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out = RESULTS_DIR / f"load-{time.strftime('%Y%m%d-%H%M%S')}-{report['revision']}.json"
+    out.write_text(json.dumps(report, indent=2))
+    print(json.dumps(result, indent=2))
+    print(f"\nErgebnis gespeichert: {out}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
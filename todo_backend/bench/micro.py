@@ -0,0 +1,97 @@
+# todo_backend/bench/micro.py
+# Micro-Benchmarks ohne HTTP: Repository-Methoden aus database/crud.py und
+# die Serialisierung über TodoRead/UserRead. Cache ist abgeschaltet, damit
+# jeder Aufruf die DB trifft.
+#
+#   python -m bench.micro --users 20 --todos 1000
+import argparse
+import json
+import os
+import statistics
+import time
+
+from bench.load import RESULTS_DIR, git_revision
+from bench.seed import seed
+
+
+def timed(fn, repeat: int) -> dict:
+    fn()  # warmup
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return {
+        "repeat": repeat,
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro benchmarks for crud.py and schemas")
+    parser.add_argument("--database-url", default="sqlite:///bench_micro.db")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--todos", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["TODO_CACHE"] = "off"
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    os.environ.setdefault("BCRYPT_WORKERS", "0")
+    seed(args.database_url, args.users, args.todos)
+
+    from pydantic import TypeAdapter
+
+    from database.crud import TodoRepository, UserRepository
+    from database.db_session import SessionLocal, get_engine
+    from fast.schemas import TodoRead, UserRead
+    from model.models import Todo
+
+    user_id = 1
+    todo_list = TypeAdapter(list[TodoRead])
+    results = {}
+    with SessionLocal(bind=get_engine()) as db:
+        todos = TodoRepository(db)
+        users = UserRepository(db)
+        results["get_todos_by_user"] = timed(lambda: todos.get_todos_by_user(user_id), args.repeat)
+        results["get_todos_page_50"] = timed(lambda: todos.get_todos_page(user_id, limit=50, after=args.todos // 2),
+                                             args.repeat)
+        results["get_open_todos"] = timed(lambda: users.get_open_todos(user_id), args.repeat)
+        results["get_users_summary"] = timed(
+            lambda: users.count_todos_by_state([u.id for u in users.get_users()]), args.repeat)
+        results["get_users_include_todos"] = timed(lambda: users.get_users(include_todos=True), max(args.repeat // 10, 1))
+
+        def create_and_delete():
+            todo = todos.create_todo(Todo(task="micro", user_id=user_id))
+            todos.update_todo_state(todo["id"], "DONE")
+            todos.delete_todo(todo["id"])
+
+        results["create_update_delete"] = timed(create_and_delete, args.repeat)
+
+        rows = todos.get_todos_by_user(user_id)
+        orm_todos = list(db.scalars(db.query(Todo).filter(Todo.user_id == user_id).statement))
+        user = users.get_user_by_id(user_id, include_todos=True)
+        results["serialize_todoread_from_dicts"] = timed(lambda: todo_list.dump_json(todo_list.validate_python(rows)),
+                                                         args.repeat)
+        results["serialize_todoread_from_orm"] = timed(
+            lambda: todo_list.dump_json([TodoRead.model_validate(t) for t in orm_todos]), args.repeat)
+        results["serialize_userread"] = timed(lambda: UserRead.model_validate(user).model_dump_json(), args.repeat)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "result": results,
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out = RESULTS_DIR / f"micro-{time.strftime('%Y%m%d-%H%M%S')}-{report['revision']}.json"
+    out.write_text(json.dumps(report, indent=2))
+    print(json.dumps(results, indent=2))
+    print(f"\nErgebnis gespeichert: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# todo_backend/bench/replicas.py
+# Lokales Setup für das Read-Replica-Routing: eine SQLite-Datei als Primary,
+# Kopien davon als "Replicas". Replikation = Datei per sqlite3-Backup kopieren,
+# dazwischen hängen die Replicas also absichtlich hinterher.
+#
+#   python -m bench.replicas                 # Ablauf durchspielen (TestClient)
+#   python -m bench.replicas --replicas 2 --serve
+#       -> legt die Dateien an und gibt die Env für uvicorn aus
+import argparse
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from bench.seed import seed
+
+
+def sync_replicas(primary: Path, replicas: list[Path]) -> None:
+    """'Replikation': Primary komplett in jede Replica kopieren."""
+    with sqlite3.connect(primary) as source:
+        for replica in replicas:
+            with sqlite3.connect(replica) as target:
+                source.backup(target)
+
+
+def read_sessions(metrics_text: str) -> dict[str, float]:
+    return {engine: float(value) for engine, value in
+            re.findall(r'^db_read_sessions_total\{engine="([^"]+)"\} (\S+)$', metrics_text, re.M)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Two-SQLite-file setup for read replica routing")
+    parser.add_argument("--dir", default=".", help="Verzeichnis für die .db-Dateien")
+    parser.add_argument("--replicas", type=int, default=1)
+    parser.add_argument("--pin-seconds", type=float, default=1.0)
+    parser.add_argument("--balance", default="round_robin", choices=["round_robin", "least_loaded"])
+    parser.add_argument("--serve", action="store_true", help="nur Dateien anlegen und Env ausgeben")
+    args = parser.parse_args()
+
+    base = Path(args.dir).resolve()
+    primary = base / "replica_primary.db"
+    replicas = [base / f"replica_read{i}.db" for i in range(args.replicas)]
+    primary_url = f"sqlite:///{primary}"
+    read_urls = ",".join(f"sqlite:///{replica}" for replica in replicas)
+
+    env = {
+        "DATABASE_URL": primary_url,
+        "DATABASE_READ_URLS": read_urls,
+        "READ_BALANCE": args.balance,
+        "READ_PIN_SECONDS": str(args.pin_seconds),
+    }
+    # vor seed(): database.db_session liest die Env beim Import
+    os.environ.update(env, TODO_CACHE="off", REMINDER_SWEEPER="0", BCRYPT_WORKERS="0")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    seed(primary_url, users=2, todos=5)
+    sync_replicas(primary, replicas)
+
+    if args.serve:
+        print(" ".join(f"{key}={value}" for key, value in env.items()) + " uvicorn app.main:app")
+        print(f"Replicas nachziehen: python -c \"from bench.replicas import sync_replicas; "
+              f"from pathlib import Path; sync_replicas(Path('{primary}'), {[str(r) for r in replicas]!r})\"")
+        return
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    def count(client) -> int:
+        return len(client.get("/users/1/todos").raise_for_status().json())
+
+    with TestClient(app) as client:
+        while client.get("/readyz").status_code != 200:
+            time.sleep(0.05)
+        print(f"{'Start (alle synchron):':36s}{count(client)} Todos")
+        client.post("/todos/", params={"user_id": 1}, json={"task": "neu"}).raise_for_status()
+        print(f"{'direkt nach dem Write (Primary):':36s}{count(client)} Todos")
+        time.sleep(args.pin_seconds + 0.1)
+        print(f"{f'nach {args.pin_seconds}s Pin (Replica, alt):':36s}{count(client)} Todos")
+        sync_replicas(primary, replicas)
+        print(f"{'nach Replikation (Replica):':36s}{count(client)} Todos")
+        for _ in range(4 * args.replicas):
+            count(client)
+        print("\nSessions aus get_read_db:", read_sessions(client.get("/metrics").text))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# todo_backend/bench/seed.py
+# Testdaten für Benchmarks: N User mit je M Todos, direkt per SQL (schnell).
+#
+#   python -m bench.seed --database-url sqlite:///bench.db --users 50 --todos 200
+import argparse
+import os
+import random
+from datetime import date, timedelta
+
+BENCH_PASSWORD = "bench-pass"
+
+
+def seed(database_url: str, users: int, todos: int, *, reset: bool = True) -> None:
+    os.environ.setdefault("DATABASE_URL", database_url)
+    from sqlalchemy import create_engine, insert
+
+    import bcrypt
+    from database.db_session import Base
+    from model.models import Todo, User
+
+    engine = create_engine(database_url)
+    if reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    # ein Hash für alle User – bcrypt pro User würde das Seeding dominieren
+    hashed = bcrypt.hashpw(BENCH_PASSWORD.encode(), bcrypt.gensalt(int(os.getenv("BCRYPT_ROUNDS", "12")))).decode()
+    rnd = random.Random(42)
+    states = ["OPEN", "IN_PROGRESS", "DONE"]
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"name": f"bench{u}", "password": hashed} for u in range(users)])
+        user_ids = [row[0] for row in conn.exec_driver_sql("SELECT id FROM users ORDER BY id")]
+        for user_id in user_ids:
+            conn.execute(insert(Todo), [
+                {
+                    "task": f"Task {i}",
+                    "description": f"Beschreibung {i} für User {user_id}",
+                    "deadline": today + timedelta(days=rnd.randint(-30, 60)),
+                    "state": rnd.choice(states),
+                    "user_id": user_id,
+                }
+                for i in range(todos)
+            ])
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed benchmark data")
+    parser.add_argument("--database-url", default="sqlite:///bench.db")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--todos", type=int, default=200)
+    args = parser.parse_args()
+    seed(args.database_url, args.users, args.todos)
+    print(f"seeded {args.users} users x {args.todos} todos into {args.database_url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# todo_backend/database/cache.py
+# Read-Through-Cache für Todo-Listen pro User.
+#
+# Jeder Eintrag hängt an der aktuellen "Version" des Users; Schreibzugriffe
+# im TodoRepository erhöhen die Version (invalidate_user) und machen damit
+# alle alten Einträge dieses Users unerreichbar. Die Version wird vor dem
+# DB-Zugriff gelesen – ein paralleler Write kann also nie veraltete Daten
+# unter der neuen Version ablegen.
+import os
+import pickle
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+TODO_CACHE = os.getenv("TODO_CACHE", "memory")          # memory | redis | off
+TODO_CACHE_URL = os.getenv("TODO_CACHE_URL", "redis://localhost:6379/0")
+TODO_CACHE_TTL = float(os.getenv("TODO_CACHE_TTL", "30"))  # Sekunden
+TODO_CACHE_SIZE = int(os.getenv("TODO_CACHE_SIZE", "1024"))  # Einträge
+
+
+class TodoCache(ABC):
+    """Schnittstelle für Cache-Backends."""
+
+    # Präfix für ETags: In-Process-Versionen beginnen nach jedem Neustart bei 0,
+    # daher ein Zufallswert pro Prozess; Redis-Versionen sind global gültig.
+    etag_prefix = ""
+    # Versionen für alle Worker gleich (sieht jeden Write) – Voraussetzung für
+    # ETags/304 mit mehr als einem Worker (fast/etag.py)
+    shared = False
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def version(self, user_id: int) -> int: ...
+
+    @abstractmethod
+    def invalidate_user(self, user_id: int) -> None: ...
+
+    @abstractmethod
+    def _get(self, user_id: int, version: int, key: Hashable) -> tuple[bool, Any]: ...
+
+    @abstractmethod
+    def _set(self, user_id: int, version: int, key: Hashable, value: Any) -> None: ...
+
+    def get_or_load(self, user_id: int, key: Hashable, loader: Callable[[], Any]) -> Any:
+        version = self.version(user_id)
+        found, value = self._get(user_id, version, key)
+        if found:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = loader()
+        self._set(user_id, version, key, value)
+        return value
+
+    async def get_or_load_async(self, user_id: int, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        version = self.version(user_id)
+        found, value = self._get(user_id, version, key)
+        if found:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = await loader()
+        self._set(user_id, version, key, value)
+        return value
+
+    def _after_fork(self) -> None:
+        """Im gunicorn-Worker nach preload; nur In-Process-Backends haben etwas zurückzusetzen."""
+
+    def stats(self) -> dict:
+        return {"backend": type(self).__name__, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+
+class LRUTodoCache(TodoCache):
+    """In-Process LRU mit TTL und fester Maximalgröße (Default-Backend)."""
+
+    def __init__(self, max_entries: int = TODO_CACHE_SIZE, ttl: float = TODO_CACHE_TTL):
+        super().__init__()
+        self.etag_prefix = secrets.token_hex(4)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def _get(self, user_id, version, key):
+        entry_key = (user_id, version, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[entry_key]
+                self.evictions += 1
+                return False, None
+            self._entries.move_to_end(entry_key)
+            return True, value
+
+    def _set(self, user_id, version, key, value):
+        with self._lock:
+            self._entries[(user_id, version, key)] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end((user_id, version, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _after_fork(self) -> None:
+        # eigener ETag-Präfix pro Worker: gleiche Versionsnummern in zwei Workern sind verschiedene Stände
+        self.etag_prefix = secrets.token_hex(4)
+        self._entries.clear()
+        self._versions.clear()
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        return {**super().stats(), "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+class NullTodoCache(LRUTodoCache):
+    """TODO_CACHE=off – jeder Zugriff geht auf die DB (Versionen zählen trotzdem)."""
+
+    def _get(self, user_id, version, key):
+        return False, None
+
+    def _set(self, user_id, version, key, value):
+        pass
+
+
+class RedisTodoCache(TodoCache):
+    """Gemeinsamer Cache für mehrere Worker/Instanzen (pip install redis)."""
+
+    shared = True
+
+    def __init__(self, url: str = TODO_CACHE_URL, ttl: float = TODO_CACHE_TTL):
+        super().__init__()
+        import redis  # optional, nur für TODO_CACHE=redis
+
+        self.ttl = ttl
+        self.etag_prefix = "r"
+        self._redis = redis.Redis.from_url(url)
+
+    def version(self, user_id: int) -> int:
+        return int(self._redis.get(f"todos:ver:{user_id}") or 0)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._redis.incr(f"todos:ver:{user_id}")
+
+    @staticmethod
+    def _key(user_id, version, key) -> str:
+        return f"todos:{user_id}:{version}:{key!r}"
+
+    def _get(self, user_id, version, key):
+        raw = self._redis.get(self._key(user_id, version, key))
+        if raw is None:
+            return False, None
+        return True, pickle.loads(raw)
+
+    def _set(self, user_id, version, key, value):
+        # Eviction übernimmt Redis (TTL + maxmemory-policy)
+        self._redis.set(self._key(user_id, version, key), pickle.dumps(value), ex=max(int(self.ttl), 1))
+
+
+def build_cache(kind: str = TODO_CACHE) -> TodoCache:
+    if kind == "off":
+        return NullTodoCache()
+    if kind == "redis":
+        return RedisTodoCache()
+    return LRUTodoCache()
+
+
+todo_cache = build_cache()
+os.register_at_fork(after_in_child=todo_cache._after_fork)
@@ -1,66 +1,695 @@
-from typing import Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from model.models import Todo, User
-from security.pwd import verify_password
+import os
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Optional
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import (
+    Delete, Executable, Insert, Select, Update, case, delete, func, insert, literal, select, tuple_, union_all,
+    update,
+)
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from model.models import Todo, TodoArchive, TodoCounter, User, utcnow
+from model.enums import TodoState
+from database.cache import todo_cache
+from database.db_session import primary_pins
+from database.events import todo_events
+from database.search import search_stmt, search_terms, split_search_page
+from security.pwd import hash_password, needs_rehash, verify_password
 
-ALLOWED_STATES = {"OPEN", "DONE"}  # ggf. an dein Enum anpassen
+ALLOWED_STATES = {state.value for state in TodoState}
+# 1 = Tabelle todo_counters bei jedem Write mitpflegen; Stats lesen die Anzahl dann dort
+STATS_COUNTERS = os.getenv("STATS_COUNTERS", "0") == "1"
+
+
+# ---- Statements – gemeinsam für die sync und async Repositories ----
+
+# Listen selektieren nur Spalten (Tupel statt ORM-Entities): keine Identity-Map,
+# kein Objekt pro Zeile – die Router serialisieren die dicts direkt (fast/responses.py)
+TODO_COLUMNS = tuple(Todo.__table__.columns)
+
+
+def todo_rows(result) -> list[dict]:
+    """Result einer Spalten-Query -> list[dict] (gleiche Keys wie todo_dict)."""
+    # str(): Spalten aus Subqueries (UNION) heißen quoted_name – orjson nimmt nur echte str als Keys
+    keys = tuple(str(key) for key in result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def todos_page_stmt(
+    user_id: int,
+    *,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+    state: Optional[TodoState] = None,
+    deadline_before: Optional[date] = None,
+    deadline_after: Optional[date] = None,
+    include_archived: bool = False,
+) -> Select:
+    """Keyset-Query über Todo.id; holt bei limit eine Zeile mehr (siehe split_page).
+
+    include_archived: UNION ALL mit todos_archive (ids sind über beide Tabellen eindeutig).
+    """
+    tables = (Todo.__table__, TodoArchive.__table__) if include_archived else (Todo.__table__,)
+    parts = []
+    for table in tables:
+        c = table.c
+        stmt = select(*(c[col.key] for col in TODO_COLUMNS)).where(c.user_id == user_id)
+        if state is not None:
+            stmt = stmt.where(c.state == state)
+        if after is not None:
+            stmt = stmt.where(c.id > after)
+        if deadline_before is not None:
+            stmt = stmt.where(c.deadline <= deadline_before)
+        if deadline_after is not None:
+            stmt = stmt.where(c.deadline >= deadline_after)
+        stmt = stmt.order_by(c.id.asc())
+        if limit is not None:
+            # eine Zeile mehr holen, um zu wissen, ob es weitergeht
+            stmt = stmt.limit(limit + 1)
+        parts.append(stmt)
+    if len(parts) == 1:
+        return parts[0]
+    # jede Tabelle liefert höchstens limit + 1 Zeilen (eigener Index), sortiert wird danach
+    both = union_all(*(part.subquery().select() for part in parts)).subquery()
+    stmt = select(*both.c).order_by(both.c.id.asc())
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def split_page(todos: list[dict], limit: Optional[int]) -> tuple[list[dict], Optional[int]]:
+    if limit is not None and len(todos) > limit:
+        todos = todos[:limit]
+        return todos, todos[-1]["id"]
+    return todos, None
+
+
+def todos_by_state_stmt(user_id: int, state: str, include_archived: bool = False) -> Select:
+    return todos_page_stmt(user_id, state=TodoState(state), include_archived=include_archived)
+
+
+def users_stmt(include_todos: bool = False) -> Select:
+    stmt = select(User)
+    if include_todos:
+        # alle Todos in einer zweiten Query statt einer pro User
+        stmt = stmt.options(selectinload(User.todos))
+    return stmt.order_by(User.id.asc())
+
+
+def state_counts_stmt(user_ids: list[int]) -> Select:
+    return (
+        select(Todo.user_id, Todo.state, func.count(Todo.id))
+        .where(Todo.user_id.in_(user_ids))
+        .group_by(Todo.user_id, Todo.state)
+    )
+
+
+def collect_state_counts(user_ids: list[int], rows) -> dict[int, dict[str, int]]:
+    counts: dict[int, dict[str, int]] = {user_id: {} for user_id in user_ids}
+    for user_id, state, n in rows:
+        counts[user_id][TodoState(state).value] = n
+    return counts
+
+
+def user_by_name_stmt(name: str) -> Select:
+    return select(User).where(User.name == name).limit(1)
+
+
+class StaleTodoError(Exception):
+    """Todo wurde inzwischen geändert – erwartete version passt nicht mehr (If-Match -> 412)."""
+
+    def __init__(self, todo_id: int, version: int):
+        super().__init__(f"Todo {todo_id} ist jetzt in Version {version}")
+        self.todo_id = todo_id
+        self.version = version
+
+
+class UnknownUserError(ValueError):
+    """Zeilen für user_ids, die es nicht gibt (Import) – portabel statt FK-Fehler bzw. Waisen unter SQLite."""
+
+    def __init__(self, user_ids: Iterable[int]):
+        self.user_ids = set(user_ids)
+        super().__init__(f"unbekannte user_id: {', '.join(map(str, sorted(self.user_ids)))}")
+
+
+def normalize_state(new_state: str) -> str:
+    state_norm = (new_state or "").strip().upper()
+    if state_norm not in ALLOWED_STATES:
+        raise ValueError(f"State {new_state} not allowed")
+    return state_norm
+
+
+# ---- Einzel-Writes: ein Statement pro Write, keine ORM-Objekte in der Session ----
+
+def todo_values(todo: Todo) -> dict:
+    """Spalten für einen neuen Todo – alle explizit, damit kein Reload für Defaults nötig ist."""
+    return {
+        "task": todo.task,
+        "description": todo.description,
+        "deadline": todo.deadline,
+        "state": TodoState(todo.state or TodoState.OPEN),
+        "version": 1,
+        "updated_at": utcnow(),
+    }
+
+
+def insert_todo_stmt(user_id: int, values: dict) -> Insert:
+    """INSERT … SELECT FROM users WHERE id = ? – legt nichts an, wenn es den User nicht gibt.
+
+    Ersetzt session.get(User) + user.todos.append (lädt sonst die ganze Collection).
+    """
+    columns = Todo.__table__.c
+    row = select(User.id, *(literal(value, columns[key].type) for key, value in values.items()))
+    return insert(Todo).from_select(["user_id", *values], row.where(User.id == user_id))
+
+
+def update_todo_stmt(todo_id: int, expected_version: Optional[int], **values) -> Update:
+    """UPDATE … SET …, version = version + 1 WHERE id = ? [AND version = ?]."""
+    stmt = update(Todo).where(Todo.id == todo_id).values(**values, version=Todo.version + 1)
+    if expected_version is not None:
+        stmt = stmt.where(Todo.version == expected_version)
+    return stmt
+
+
+def delete_todo_stmt(todo_id: int, expected_version: Optional[int]) -> Delete:
+    stmt = delete(Todo).where(Todo.id == todo_id)
+    if expected_version is not None:
+        stmt = stmt.where(Todo.version == expected_version)
+    return stmt
+
+
+def todo_row_stmt(todo_id: int) -> Select:
+    return select(*Todo.__table__.columns).where(Todo.id == todo_id)
+
+
+# Core-Semantik: kein Abgleich mit Objekten in der Session (spart bei MySQL den "fetch"-SELECT)
+NO_SYNC = {"synchronize_session": False}
+
+
+def todo_dict(todo: Todo) -> dict:
+    """Spaltenwerte als dict – bleibt nach commit gültig (kein Reload pro Objekt)."""
+    return {col.key: getattr(todo, col.key) for col in Todo.__table__.columns}
+
+
+def page_cache_key(**filters) -> tuple:
+    return ("page",) + tuple(sorted(filters.items()))
+
+
+# ---- Stats: eine GROUP BY Query über ix_todos_user_state_deadline ----
+
+def stats_stmt(today: date, user_id: Optional[int] = None) -> Select:
+    """Je State: Anzahl, überfällige und nächste Deadline – für einen User oder alle."""
+    stmt = select(
+        Todo.state,
+        func.count(),
+        func.sum(case((Todo.deadline < today, 1), else_=0)),
+        func.min(case((Todo.deadline >= today, Todo.deadline))),
+    ).group_by(Todo.state)
+    if user_id is not None:
+        stmt = stmt.where(Todo.user_id == user_id)
+    return stmt
+
+
+def open_deadlines_stmt(today: date, user_id: int) -> Select:
+    """Nur overdue/next_deadline (Counter-Modus) – Range-Scan über die offenen Todos mit Deadline."""
+    return (
+        select(func.count(case((Todo.deadline < today, 1))), func.min(case((Todo.deadline >= today, Todo.deadline))))
+        .where(Todo.user_id == user_id, Todo.state != TodoState.DONE, Todo.deadline.is_not(None))
+    )
+
+
+def due_todos_stmt(user_id: int, start: Optional[date], end: date, limit: int) -> Select:
+    """Nicht erledigte Todos mit start <= deadline <= end (start None = ohne Untergrenze), nach Deadline."""
+    stmt = select(*TODO_COLUMNS).where(Todo.user_id == user_id, Todo.deadline <= end, Todo.state != TodoState.DONE)
+    if start is not None:
+        stmt = stmt.where(Todo.deadline >= start)
+    return stmt.order_by(Todo.deadline.asc(), Todo.id.asc()).limit(limit)
+
+
+def counters_stmt(user_id: int) -> Select:
+    return select(TodoCounter.state, TodoCounter.n).where(TodoCounter.user_id == user_id)
+
+
+def stats_dict(counts: dict[str, int], overdue: int, next_deadline: Optional[date]) -> dict:
+    counts = {state: n for state, n in counts.items() if n}
+    return {"counts": counts, "total": sum(counts.values()), "overdue": overdue or 0, "next_deadline": next_deadline}
+
+
+def collect_stats(rows) -> dict:
+    """Zeilen aus stats_stmt zusammenfassen; DONE zählt nie als überfällig."""
+    counts, overdue, next_deadline = {}, 0, None
+    for state, n, n_overdue, state_next in rows:
+        state = TodoState(state)
+        counts[state.value] = n
+        if state is TodoState.DONE:
+            continue
+        overdue += n_overdue or 0
+        if state_next is not None and (next_deadline is None or state_next < next_deadline):
+            next_deadline = state_next
+    return stats_dict(counts, overdue, next_deadline)
+
+
+def _state_value(state) -> str:
+    return TodoState(state or TodoState.OPEN).value
+
+
+def counter_deltas(added: Iterable[tuple[int, object]] = (), removed: Iterable[tuple[int, object]] = ()) -> Counter:
+    """(user_id, state)-Paare -> {(user_id, state): +/-n} für counter_upsert_stmts."""
+    deltas = Counter()
+    for user_id, state in added:
+        deltas[(user_id, _state_value(state))] += 1
+    for user_id, state in removed:
+        deltas[(user_id, _state_value(state))] -= 1
+    return deltas
+
+
+def cas_groups(found: dict[int, tuple]) -> dict[tuple[int, object], list[tuple[int, int]]]:
+    """id -> (user_id, state, version) nach (user_id, state) -> [(id, version), …] für tuple_(id, version).in_()."""
+    groups: dict[tuple[int, object], list[tuple[int, int]]] = {}
+    for todo_id, (user_id, state, version) in found.items():
+        groups.setdefault((user_id, state), []).append((todo_id, version))
+    return groups
+
+
+def counter_upsert_stmts(dialect_name: str, deltas: Counter) -> list[Executable]:
+    """Upserts für todo_counters – in derselben Transaktion wie der Write ausführen."""
+    if not STATS_COUNTERS:
+        return []
+    stmts = []
+    for (user_id, state), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        values = {"user_id": user_id, "state": state, "n": delta}
+        if dialect_name == "mysql":
+            stmt = mysql.insert(TodoCounter).values(values).on_duplicate_key_update(n=TodoCounter.n + delta)
+        else:
+            dialect = postgresql if dialect_name == "postgresql" else sqlite
+            stmt = dialect.insert(TodoCounter).values(values).on_conflict_do_update(
+                index_elements=[TodoCounter.user_id, TodoCounter.state], set_={"n": TodoCounter.n + delta}
+            )
+        stmts.append(stmt)
+    return stmts
+
+
+def todos_changed(*user_ids: int) -> None:
+    """Nach jedem commit eines Writes aufrufen: invalidiert die Caches der User
+    und liest für sie eine Weile vom Primary (Read-Replicas hängen evtl. hinterher)."""
+    for user_id in set(user_ids):
+        todo_cache.invalidate_user(user_id)
+    primary_pins.pin(*user_ids)
+
+
+def publish_todos(type: str, todos: Iterable[dict]) -> None:
+    """Deltas nach dem commit an den Event-Bus (database/events.py), pro User gruppiert."""
+    by_user: dict[int, list[dict]] = {}
+    for todo in todos:
+        by_user.setdefault(todo["user_id"], []).append(todo)
+    for user_id, items in by_user.items():
+        todo_events.publish(user_id, type, items)
 
 
 class TodoRepository:
     def __init__(self, session: Session):
         self.session = session
 
-    def create_todo(self, todo: Todo) -> Todo:
-        self.session.add(todo)
-        self.session.commit()
-        self.session.refresh(todo)
-        return todo
+    def _count(self, deltas: Counter) -> None:
+        """todo_counters nachziehen (STATS_COUNTERS=1) – vor dem commit des Writes."""
+        for stmt in counter_upsert_stmts(self.session.bind.dialect.name, deltas):
+            self.session.execute(stmt)
+
+    def create_todo(self, todo: Todo) -> dict:
+        """Todo (transient, nicht in der Session) für todo.user_id anlegen."""
+        return self.new_todo_by_user(todo.user_id, todo)
 
     # optional, falls du es brauchst
     def find_all_todos(self) -> list[Todo]:
         return self.session.query(Todo).order_by(Todo.id.asc()).all()
 
-    def new_todo_by_user(self, user_id: int, todo: Todo) -> Todo:
-        user = self.session.get(User, user_id)
-        if not user:
+    def new_todo_by_user(self, user_id: int, todo: Todo) -> dict:
+        """Ein INSERT + commit; ValueError, falls es den User nicht gibt."""
+        values = todo_values(todo)
+        stmt = insert_todo_stmt(user_id, values)
+        if self.session.bind.dialect.insert_returning:
+            todo_id = self.session.scalar(stmt.returning(Todo.id))
+        else:
+            result = self.session.execute(stmt)
+            todo_id = result.lastrowid if result.rowcount == 1 else None
+        if todo_id is None:
+            self.session.rollback()
             raise ValueError(f"User {user_id} not found")
-        user.todos.append(todo)
+        self._count(counter_deltas(added=[(user_id, values["state"])]))
         self.session.commit()
-        self.session.refresh(todo)
+        todos_changed(user_id)
+        todo = {"id": todo_id, "user_id": user_id, **values}
+        publish_todos("created", [todo])
         return todo
 
-    def get_todos_by_user(self, user_id: int) -> list[Todo]:
-        return (
-            self.session.query(Todo)
-            .filter(Todo.user_id == user_id)
-            .order_by(Todo.id.asc())
-            .all()
+    def get_todos_by_user(self, user_id: int) -> list[dict]:
+        todos, _ = self.get_todos_page(user_id)
+        return todos
+
+    def get_todos_page(
+        self,
+        user_id: int,
+        *,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+        state: Optional[TodoState] = None,
+        deadline_before: Optional[date] = None,
+        deadline_after: Optional[date] = None,
+        include_archived: bool = False,
+    ) -> tuple[list[dict], Optional[int]]:
+        """Keyset-Pagination über Todo.id.
+
+        Liefert (todos, next_cursor); next_cursor ist die id des letzten
+        Eintrags, falls es weitere Seiten gibt, sonst None.
+        Deadline-Filter sind inklusive. Ergebnis kommt aus dem todo_cache.
+        """
+        filters = dict(
+            limit=limit,
+            after=after,
+            state=state,
+            deadline_before=deadline_before,
+            deadline_after=deadline_after,
+            include_archived=include_archived,
         )
 
-    def update_todo_state(self, todo_id: int, new_state: str) -> Optional[Todo]:
-        if not new_state:
-            return None
-        state_norm = new_state.strip().upper()
-        if state_norm not in ALLOWED_STATES:
-            # optional: ValueError werfen und im Router 400 zurückgeben
-            return None
+        def load():
+            return split_page(todo_rows(self.session.execute(todos_page_stmt(user_id, **filters))), limit)
 
-        todo = self.session.get(Todo, todo_id)
-        if not todo:
-            return None
+        return todo_cache.get_or_load(user_id, page_cache_key(**filters), load)
 
-        todo.state = state_norm
+    def search_todos(self, user_id: int, q: str, *, limit: int, offset: int = 0) -> tuple[list[dict], Optional[int]]:
+        """Volltextsuche (database/search.py); liefert (todos, next_offset)."""
+        terms = search_terms(q)
+        if not terms:
+            return [], None
+
+        def load():
+            todos = todo_rows(self.session.execute(search_stmt(user_id, terms, limit=limit, offset=offset)))
+            return split_search_page(todos, limit, offset)
+
+        return todo_cache.get_or_load(user_id, ("search", tuple(terms), limit, offset), load)
+
+    def get_due_todos(self, user_id: int, today: date, within_days: int, limit: int) -> list[dict]:
+        """Fällig von heute bis heute + within_days (ix_todos_user_deadline)."""
+        end = today + timedelta(days=within_days)
+        return todo_cache.get_or_load(
+            user_id,
+            ("due", today, within_days, limit),
+            lambda: todo_rows(self.session.execute(due_todos_stmt(user_id, today, end, limit))),
+        )
+
+    def get_overdue_todos(self, user_id: int, today: date, limit: int) -> list[dict]:
+        """Deadline vor heute und nicht DONE."""
+        yesterday = today - timedelta(days=1)
+        return todo_cache.get_or_load(
+            user_id,
+            ("overdue", today, limit),
+            lambda: todo_rows(self.session.execute(due_todos_stmt(user_id, None, yesterday, limit))),
+        )
+
+    # ---- Batch: eine Transaktion, set-basierte Statements ----
+
+    def create_todos(self, user_id: int, items: list[dict]) -> list[dict]:
+        """Legt alle Todos in einer Transaktion an (executemany statt n × commit/refresh)."""
+        if self.session.get(User, user_id) is None:
+            raise ValueError(f"User {user_id} not found")
+        rows = [{**item, "user_id": user_id} for item in items]
+        if self.session.bind.dialect.insert_executemany_returning:
+            # multi-row INSERT … RETURNING; Reihenfolge über die id herstellen
+            todos = sorted(
+                self.session.scalars(insert(Todo).returning(Todo), rows),
+                key=lambda todo: todo.id,
+            )
+        else:
+            # MySQL kennt kein INSERT … RETURNING: ORM-Flush holt die ids
+            todos = [Todo(**row) for row in rows]
+            self.session.add_all(todos)
+            self.session.flush()
+        created = [todo_dict(todo) for todo in todos]
+        self._count(counter_deltas(added=[(user_id, todo["state"]) for todo in created]))
         self.session.commit()
-        self.session.refresh(todo)
-        return todo
+        todos_changed(user_id)
+        publish_todos("created", created)
+        return created
+
+    def _owners(self, todo_ids: list[int], lock: bool = False) -> dict[int, tuple[int, TodoState, int]]:
+        """todo_id -> (user_id, state, version) für alle existierenden ids.
+
+        lock: FOR UPDATE – für Dialekte ohne RETURNING (MySQL), dann trifft jedes folgende CAS.
+        """
+        stmt = select(Todo.id, Todo.user_id, Todo.state, Todo.version).where(Todo.id.in_(todo_ids))
+        if lock:
+            stmt = stmt.with_for_update()
+        return {row.id: (row.user_id, row.state, row.version) for row in self.session.execute(stmt)}
 
-    def delete_todo(self, todo_id: int) -> bool:
-        todo = self.session.get(Todo, todo_id)
-        if not todo:
+    def update_todo_states(self, todo_ids: list[int], new_state: str) -> dict[int, bool]:
+        """Ein UPDATE je (User, alter State) mit version-CAS; liefert je id, ob sie geändert wurde.
+
+        Zähler und Events nur aus den tatsächlich geänderten Zeilen. Verliert eine Zeile das CAS
+        gegen einen parallelen Write, wird sie neu gelesen (höchstens drei Runden).
+        """
+        state_norm = normalize_state(new_state)
+        returning = self.session.bind.dialect.update_returning
+        changed: list[dict] = []
+        deltas = Counter()
+        pending = list(todo_ids)
+        for _ in range(3):
+            found = self._owners(pending, lock=not returning)
+            for (user_id, state), pairs in cas_groups(found).items():
+                stmt = (
+                    update(Todo)
+                    .where(tuple_(Todo.id, Todo.version).in_(pairs))
+                    .values(state=state_norm, version=Todo.version + 1)
+                )
+                if returning:
+                    rows = todo_rows(self.session.execute(stmt.returning(*TODO_COLUMNS), execution_options=NO_SYNC))
+                else:
+                    # Zeilen sind gesperrt: das CAS trifft alle, die Events lesen wir in derselben Transaktion
+                    self.session.execute(stmt, execution_options=NO_SYNC)
+                    ids = [todo_id for todo_id, _ in pairs]
+                    rows = todo_rows(self.session.execute(select(*TODO_COLUMNS).where(Todo.id.in_(ids))))
+                changed += rows
+                # update() statt +=: Counter-Addition verwirft negative Deltas
+                deltas.update(counter_deltas(added=[(user_id, state_norm)] * len(rows),
+                                             removed=[(user_id, state)] * len(rows)))
+            done = {todo["id"] for todo in changed}
+            pending = [todo_id for todo_id in found if todo_id not in done]
+            if not pending:
+                break
+        self._count(deltas)
+        self.session.commit()
+        todos_changed(*(todo["user_id"] for todo in changed))
+        publish_todos("updated", changed)
+        done = {todo["id"] for todo in changed}
+        return {todo_id: todo_id in done for todo_id in todo_ids}
+
+    def delete_todos(self, todo_ids: list[int]) -> dict[int, bool]:
+        """Ein DELETE je (User, State) mit version-CAS, Zähler nur für tatsächlich gelöschte Zeilen."""
+        returning = self.session.bind.dialect.delete_returning
+        deleted: dict[int, int] = {}  # id -> user_id
+        deltas = Counter()
+        pending = list(todo_ids)
+        for _ in range(3):
+            found = self._owners(pending, lock=not returning)
+            for (user_id, state), pairs in cas_groups(found).items():
+                stmt = delete(Todo).where(tuple_(Todo.id, Todo.version).in_(pairs))
+                if returning:
+                    ids = self.session.scalars(stmt.returning(Todo.id), execution_options=NO_SYNC).all()
+                else:
+                    self.session.execute(stmt, execution_options=NO_SYNC)  # gesperrt: trifft alle
+                    ids = [todo_id for todo_id, _ in pairs]
+                deleted.update(dict.fromkeys(ids, user_id))
+                deltas.update(counter_deltas(removed=[(user_id, state)] * len(ids)))
+            pending = [todo_id for todo_id in found if todo_id not in deleted]
+            if not pending:
+                break
+        self._count(deltas)
+        self.session.commit()
+        todos_changed(*deleted.values())
+        publish_todos("deleted", [{"id": todo_id, "user_id": user_id} for todo_id, user_id in deleted.items()])
+        return {todo_id: todo_id in deleted for todo_id in todo_ids}
+
+    # ---- Export/Import: Streaming ohne ORM-Objekte ----
+
+    def iter_todos(
+        self,
+        *,
+        user_id: Optional[int] = None,
+        state: Optional[TodoState] = None,
+        chunk_size: int = 1000,
+        include_archived: bool = False,
+    ) -> Iterator[dict]:
+        """Alle (gefilterten) Todos als dicts, serverseitiger Cursor + yield_per.
+
+        include_archived: danach die Zeilen aus todos_archive (je Tabelle nach id sortiert),
+        zusätzlich mit archived_at – insert_rows legt sie damit wieder ins Archiv.
+        """
+        tables = (Todo.__table__, TodoArchive.__table__) if include_archived else (Todo.__table__,)
+        for table in tables:
+            c = table.c
+            columns = [c[col.key] for col in TODO_COLUMNS]
+            if table is TodoArchive.__table__:
+                columns.append(c.archived_at)
+            stmt = select(*columns).order_by(c.id.asc())
+            if user_id is not None:
+                stmt = stmt.where(c.user_id == user_id)
+            if state is not None:
+                stmt = stmt.where(c.state == state)
+            result = self.session.execute(
+                stmt, execution_options={"stream_results": True, "yield_per": chunk_size}
+            )
+            for row in result.mappings():
+                yield dict(row)
+
+    def insert_rows(self, rows: list[dict]) -> int:
+        """Ein Chunk = ein executemany-INSERT pro Tabelle + ein commit. Alle rows mit gleichen Keys.
+
+        version/updated_at aus dem Export bleiben erhalten (If-Match, Archiv-Uhr), fehlen sie:
+        1 bzw. jetzt. Zeilen mit archived_at (Export mit include_archived) gehen nach
+        todos_archive und brauchen ihre id. UnknownUserError, falls eine user_id nicht
+        existiert – dann wird nichts geschrieben.
+        """
+        if not rows:
+            return 0
+        user_ids = {row["user_id"] for row in rows}
+        missing = user_ids - set(self.session.scalars(select(User.id).where(User.id.in_(user_ids))))
+        if missing:
+            raise UnknownUserError(missing)
+        now = utcnow()
+        hot, archived = [], []
+        for row in rows:
+            row = {**row, "version": row.get("version") or 1, "updated_at": row.get("updated_at") or now}
+            if row.get("archived_at") is None:
+                row.pop("archived_at", None)
+                hot.append(row)
+            else:
+                archived.append(row)
+        if hot:
+            self.session.execute(insert(Todo), hot)
+            self._count(counter_deltas(added=[(row["user_id"], row.get("state")) for row in hot]))
+        if archived:
+            self.session.execute(insert(TodoArchive), archived)
+        self.session.commit()
+        if hot:
+            todos_changed(*(row["user_id"] for row in hot))
+            # ids kennt nur die DB – statt tausender Deltas laden die Clients neu
+            todo_events.reset(*(row["user_id"] for row in hot))
+        return len(rows)
+
+    def archive_done(self, before: datetime, below_id: int, limit: int) -> list[dict]:
+        """Ein Batch: DONE-Todos mit updated_at < before nach todos_archive verschieben (eine Transaktion).
+
+        Die Zeilen werden vorher gesperrt (SKIP LOCKED: parallele Writes und andere Worker
+        warten nicht). below_id: die neueste id bleibt stehen – sonst vergeben SQLite bzw.
+        MySQL < 8 sie nach dem DELETE evtl. neu. Liefert die verschobenen {"id", "user_id"}.
+        """
+        rows = self.session.execute(
+            select(Todo.id, Todo.user_id)
+            .where(Todo.state == TodoState.DONE, Todo.updated_at < before, Todo.id < below_id)
+            .order_by(Todo.updated_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not rows:
+            self.session.rollback()
+            return []
+        ids = [todo_id for todo_id, _ in rows]
+        archive = TodoArchive.__table__
+        self.session.execute(
+            insert(archive).from_select(
+                [*(col.key for col in TODO_COLUMNS), "archived_at"],
+                select(*TODO_COLUMNS, literal(utcnow(), archive.c.archived_at.type)).where(Todo.id.in_(ids)),
+            )
+        )
+        self.session.execute(delete(Todo).where(Todo.id.in_(ids)), execution_options=NO_SYNC)
+        self._count(counter_deltas(removed=[(user_id, TodoState.DONE) for _, user_id in rows]))
+        self.session.commit()
+        todos_changed(*(user_id for _, user_id in rows))
+        moved = [{"id": todo_id, "user_id": user_id} for todo_id, user_id in rows]
+        # für Clients wie gelöscht – die Standard-Listen enthalten keine archivierten Todos
+        publish_todos("deleted", [{**todo, "archived": True} for todo in moved])
+        return moved
+
+    def _version(self, todo_id: int) -> Optional[int]:
+        return self.session.scalar(select(Todo.version).where(Todo.id == todo_id))
+
+    def _stale_or_missing(self, todo_id: int) -> None:
+        """Write hat keine Zeile getroffen: StaleTodoError, falls es den Todo noch gibt."""
+        self.session.rollback()
+        version = self._version(todo_id)
+        if version is not None:
+            raise StaleTodoError(todo_id, version)
+
+    def _update_one(self, stmt: Update, todo_id: int) -> Optional[dict]:
+        """UPDATE … RETURNING, wo der Dialekt es kann; sonst rowcount + SELECT in derselben Transaktion."""
+        if self.session.bind.dialect.update_returning:
+            row = self.session.execute(
+                stmt.returning(*Todo.__table__.columns), execution_options=NO_SYNC
+            ).mappings().first()
+            return dict(row) if row is not None else None
+        if self.session.execute(stmt, execution_options=NO_SYNC).rowcount != 1:
+            return None
+        return dict(self.session.execute(todo_row_stmt(todo_id)).mappings().one())
+
+    def update_todo_state(self, todo_id: int, new_state: str, expected_version: Optional[int] = None) -> Optional[dict]:
+        """Ein UPDATE statt get/commit/refresh; version + 1.
+
+        expected_version (If-Match): nur ändern, wenn der Todo noch in dieser Version ist,
+        sonst StaleTodoError. None, falls es den Todo nicht gibt; ValueError bei unbekanntem State.
+        """
+        state_norm = normalize_state(new_state)
+        if not STATS_COUNTERS:
+            todo = self._update_one(update_todo_stmt(todo_id, expected_version, state=state_norm), todo_id)
+            if todo is None:
+                self._stale_or_missing(todo_id)
+                return None
+            self.session.commit()
+            todos_changed(todo["user_id"])
+            publish_todos("updated", [todo])
+            return todo
+
+        # todo_counters brauchen den alten State: lesen und per version-CAS schreiben (ohne Row-Lock)
+        for _ in range(3):
+            old = self.session.execute(
+                select(Todo.user_id, Todo.state, Todo.version).where(Todo.id == todo_id)
+            ).first()
+            if old is None:
+                return None
+            if expected_version is not None and old.version != expected_version:
+                raise StaleTodoError(todo_id, old.version)
+            todo = self._update_one(update_todo_stmt(todo_id, old.version, state=state_norm), todo_id)
+            if todo is not None:
+                self._count(counter_deltas(added=[(old.user_id, state_norm)], removed=[(old.user_id, old.state)]))
+                self.session.commit()
+                todos_changed(old.user_id)
+                publish_todos("updated", [todo])
+                return todo
+            # paralleler Write dazwischen -> neu lesen
+            self.session.rollback()
+        raise StaleTodoError(todo_id, self._version(todo_id) or 0)
+
+    def delete_todo(self, todo_id: int, expected_version: Optional[int] = None) -> bool:
+        """Ein DELETE (… RETURNING user_id, state); StaleTodoError bei falscher expected_version."""
+        stmt = delete_todo_stmt(todo_id, expected_version)
+        if self.session.bind.dialect.delete_returning:
+            old = self.session.execute(stmt.returning(Todo.user_id, Todo.state), execution_options=NO_SYNC).first()
+        else:
+            old = self.session.execute(select(Todo.user_id, Todo.state, Todo.version).where(Todo.id == todo_id)).first()
+            if old is not None and expected_version is not None and old.version != expected_version:
+                raise StaleTodoError(todo_id, old.version)
+            if old is not None and self.session.execute(
+                delete_todo_stmt(todo_id, old.version), execution_options=NO_SYNC
+            ).rowcount != 1:
+                old = None
+        if old is None:
+            self._stale_or_missing(todo_id)
             return False
-        self.session.delete(todo)
+        self._count(counter_deltas(removed=[(old.user_id, old.state)]))
         self.session.commit()
+        todos_changed(old.user_id)
+        publish_todos("deleted", [{"id": todo_id, "user_id": old.user_id}])
         return True
 
 
@@ -72,34 +701,76 @@ class UserRepository:
         self.session.add(user)
         self.session.commit()
         self.session.refresh(user)
+        primary_pins.pin(user.id)
         return user
 
-    def get_users(self) -> list[User]:
-        return self.session.query(User).order_by(User.id.asc()).all()
+    def get_users(self, include_todos: bool = False) -> list[User]:
+        return list(self.session.scalars(users_stmt(include_todos)))
 
-    def get_user_by_id(self, user_id: int) -> Optional[User]:
-        return self.session.get(User, user_id)
+    def get_user_by_id(self, user_id: int, include_todos: bool = False) -> Optional[User]:
+        options = [selectinload(User.todos)] if include_todos else None
+        return self.session.get(User, user_id, options=options)
+
+    def count_todos_by_state(self, user_ids: list[int]) -> dict[int, dict[str, int]]:
+        """Anzahl Todos je User und State – eine GROUP BY Query für alle user_ids."""
+        if not user_ids:
+            return {}
+        return collect_state_counts(user_ids, self.session.execute(state_counts_stmt(user_ids)))
 
     # Für die Router-Endpunkte /users/{id}/done_todos und /open_todos
-    def get_done_todos(self, user_id: int) -> list[Todo]:
-        return (
-            self.session.query(Todo)
-            .filter(and_(Todo.user_id == user_id, Todo.state == "DONE"))
-            .order_by(Todo.id.asc())
-            .all()
-        )
+    def get_done_todos(self, user_id: int, include_archived: bool = False) -> list[dict]:
+        return self._todos_by_state(user_id, "DONE", include_archived)
 
-    def get_open_todos(self, user_id: int) -> list[Todo]:
-        return (
-            self.session.query(Todo)
-            .filter(and_(Todo.user_id == user_id, Todo.state == "OPEN"))
-            .order_by(Todo.id.asc())
-            .all()
+    def get_open_todos(self, user_id: int) -> list[dict]:
+        return self._todos_by_state(user_id, "OPEN")
+
+    def _todos_by_state(self, user_id: int, state: str, include_archived: bool = False) -> list[dict]:
+        return todo_cache.get_or_load(
+            user_id,
+            ("state", state, include_archived),
+            lambda: todo_rows(self.session.execute(todos_by_state_stmt(user_id, state, include_archived))),
         )
 
     # Login bleibt wie gehabt
     def authenticate(self, name: str, password: str) -> User | None:
-        user = self.session.query(User).filter(User.name == name).first()
+        user = self.session.scalars(user_by_name_stmt(name)).first()
         if user and verify_password(password, user.password):
+            if needs_rehash(user.password):
+                # Cost-Faktor geändert -> beim Login transparent neu hashen
+                user.password = hash_password(password)
+                self.session.commit()
             return user
         return None
+
+
+class StatsRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def user_stats(self, user_id: int, today: date) -> dict:
+        # Cache-Key mit Datum: overdue/next_deadline ändern sich um Mitternacht ohne Write
+        return todo_cache.get_or_load(user_id, ("stats", today), lambda: self._user_stats(user_id, today))
+
+    def _user_stats(self, user_id: int, today: date) -> dict:
+        if STATS_COUNTERS:
+            counts = dict(self.session.execute(counters_stmt(user_id)).all())
+            overdue, next_deadline = self.session.execute(open_deadlines_stmt(today, user_id)).one()
+            return stats_dict(counts, overdue, next_deadline)
+        return collect_stats(self.session.execute(stats_stmt(today, user_id)))
+
+    def global_stats(self, today: date) -> dict:
+        stats = collect_stats(self.session.execute(stats_stmt(today)))
+        stats["users"] = self.session.scalar(select(func.count()).select_from(User))
+        return stats
+
+    def rebuild_counters(self) -> int:
+        """todo_counters komplett aus todos neu berechnen (nach Aktivieren von STATS_COUNTERS)."""
+        self.session.execute(delete(TodoCounter))
+        self.session.execute(
+            insert(TodoCounter).from_select(
+                ["user_id", "state", "n"],
+                select(Todo.user_id, Todo.state, func.count()).group_by(Todo.user_id, Todo.state),
+            )
+        )
+        self.session.commit()
+        return self.session.scalar(select(func.count()).select_from(TodoCounter))
@@ -0,0 +1,272 @@
+# todo_backend/database/crud_async.py
+# Async-Varianten von TodoRepository/UserRepository (DB_ASYNC=1).
+# Die Statements kommen aus database.crud, damit beide Pfade gleich bleiben.
+from collections import Counter
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import Update, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from database.cache import todo_cache
+from database.db_session import primary_pins
+from database.search import search_stmt, search_terms, split_search_page
+from database.crud import (
+    NO_SYNC,
+    STATS_COUNTERS,
+    StaleTodoError,
+    collect_state_counts,
+    collect_stats,
+    counter_deltas,
+    counter_upsert_stmts,
+    counters_stmt,
+    delete_todo_stmt,
+    due_todos_stmt,
+    insert_todo_stmt,
+    normalize_state,
+    open_deadlines_stmt,
+    page_cache_key,
+    publish_todos,
+    split_page,
+    state_counts_stmt,
+    stats_dict,
+    stats_stmt,
+    todos_by_state_stmt,
+    todo_rows,
+    todos_changed,
+    todos_page_stmt,
+    todo_row_stmt,
+    todo_values,
+    update_todo_stmt,
+    user_by_name_stmt,
+    users_stmt,
+)
+from model.enums import TodoState
+from model.models import Todo, User
+from security.pwd import hash_password_async, needs_rehash, verify_password_async
+
+
+class AsyncTodoRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _count(self, deltas: Counter) -> None:
+        for stmt in counter_upsert_stmts(self.session.bind.dialect.name, deltas):
+            await self.session.execute(stmt)
+
+    async def create_todo(self, todo: Todo) -> dict:
+        user_id = todo.user_id
+        values = todo_values(todo)
+        stmt = insert_todo_stmt(user_id, values)
+        if self.session.bind.dialect.insert_returning:
+            todo_id = await self.session.scalar(stmt.returning(Todo.id))
+        else:
+            result = await self.session.execute(stmt)
+            todo_id = result.lastrowid if result.rowcount == 1 else None
+        if todo_id is None:
+            await self.session.rollback()
+            raise ValueError(f"User {user_id} not found")
+        await self._count(counter_deltas(added=[(user_id, values["state"])]))
+        await self.session.commit()
+        todos_changed(user_id)
+        todo = {"id": todo_id, "user_id": user_id, **values}
+        publish_todos("created", [todo])
+        return todo
+
+    async def get_todos_by_user(self, user_id: int) -> list[dict]:
+        todos, _ = await self.get_todos_page(user_id)
+        return todos
+
+    async def get_todos_page(
+        self,
+        user_id: int,
+        *,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+        state: Optional[TodoState] = None,
+        deadline_before: Optional[date] = None,
+        deadline_after: Optional[date] = None,
+        include_archived: bool = False,
+    ) -> tuple[list[dict], Optional[int]]:
+        filters = dict(
+            limit=limit,
+            after=after,
+            state=state,
+            deadline_before=deadline_before,
+            deadline_after=deadline_after,
+            include_archived=include_archived,
+        )
+
+        async def load():
+            return split_page(todo_rows(await self.session.execute(todos_page_stmt(user_id, **filters))), limit)
+
+        return await todo_cache.get_or_load_async(user_id, page_cache_key(**filters), load)
+
+    async def search_todos(self, user_id: int, q: str, *, limit: int, offset: int = 0) -> tuple[list[dict], Optional[int]]:
+        terms = search_terms(q)
+        if not terms:
+            return [], None
+
+        async def load():
+            todos = todo_rows(await self.session.execute(search_stmt(user_id, terms, limit=limit, offset=offset)))
+            return split_search_page(todos, limit, offset)
+
+        return await todo_cache.get_or_load_async(user_id, ("search", tuple(terms), limit, offset), load)
+
+    async def get_due_todos(self, user_id: int, today: date, within_days: int, limit: int) -> list[dict]:
+        end = today + timedelta(days=within_days)
+
+        async def load():
+            return todo_rows(await self.session.execute(due_todos_stmt(user_id, today, end, limit)))
+
+        return await todo_cache.get_or_load_async(user_id, ("due", today, within_days, limit), load)
+
+    async def get_overdue_todos(self, user_id: int, today: date, limit: int) -> list[dict]:
+        yesterday = today - timedelta(days=1)
+
+        async def load():
+            return todo_rows(await self.session.execute(due_todos_stmt(user_id, None, yesterday, limit)))
+
+        return await todo_cache.get_or_load_async(user_id, ("overdue", today, limit), load)
+
+    async def _version(self, todo_id: int) -> Optional[int]:
+        return await self.session.scalar(select(Todo.version).where(Todo.id == todo_id))
+
+    async def _stale_or_missing(self, todo_id: int) -> None:
+        await self.session.rollback()
+        version = await self._version(todo_id)
+        if version is not None:
+            raise StaleTodoError(todo_id, version)
+
+    async def _update_one(self, stmt: Update, todo_id: int) -> Optional[dict]:
+        if self.session.bind.dialect.update_returning:
+            result = await self.session.execute(stmt.returning(*Todo.__table__.columns), execution_options=NO_SYNC)
+            row = result.mappings().first()
+            return dict(row) if row is not None else None
+        if (await self.session.execute(stmt, execution_options=NO_SYNC)).rowcount != 1:
+            return None
+        return dict((await self.session.execute(todo_row_stmt(todo_id))).mappings().one())
+
+    async def update_todo_state(
+        self, todo_id: int, new_state: str, expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        state_norm = normalize_state(new_state)
+        if not STATS_COUNTERS:
+            todo = await self._update_one(update_todo_stmt(todo_id, expected_version, state=state_norm), todo_id)
+            if todo is None:
+                await self._stale_or_missing(todo_id)
+                return None
+            await self.session.commit()
+            todos_changed(todo["user_id"])
+            publish_todos("updated", [todo])
+            return todo
+
+        for _ in range(3):
+            old = (await self.session.execute(
+                select(Todo.user_id, Todo.state, Todo.version).where(Todo.id == todo_id)
+            )).first()
+            if old is None:
+                return None
+            if expected_version is not None and old.version != expected_version:
+                raise StaleTodoError(todo_id, old.version)
+            todo = await self._update_one(update_todo_stmt(todo_id, old.version, state=state_norm), todo_id)
+            if todo is not None:
+                await self._count(counter_deltas(added=[(old.user_id, state_norm)],
+                                                 removed=[(old.user_id, old.state)]))
+                await self.session.commit()
+                todos_changed(old.user_id)
+                publish_todos("updated", [todo])
+                return todo
+            await self.session.rollback()
+        raise StaleTodoError(todo_id, await self._version(todo_id) or 0)
+
+    async def delete_todo(self, todo_id: int, expected_version: Optional[int] = None) -> bool:
+        stmt = delete_todo_stmt(todo_id, expected_version)
+        if self.session.bind.dialect.delete_returning:
+            old = (await self.session.execute(
+                stmt.returning(Todo.user_id, Todo.state), execution_options=NO_SYNC
+            )).first()
+        else:
+            old = (await self.session.execute(
+                select(Todo.user_id, Todo.state, Todo.version).where(Todo.id == todo_id)
+            )).first()
+            if old is not None and expected_version is not None and old.version != expected_version:
+                raise StaleTodoError(todo_id, old.version)
+            if old is not None and (await self.session.execute(
+                delete_todo_stmt(todo_id, old.version), execution_options=NO_SYNC
+            )).rowcount != 1:
+                old = None
+        if old is None:
+            await self._stale_or_missing(todo_id)
+            return False
+        await self._count(counter_deltas(removed=[(old.user_id, old.state)]))
+        await self.session.commit()
+        todos_changed(old.user_id)
+        publish_todos("deleted", [{"id": todo_id, "user_id": old.user_id}])
+        return True
+
+
+class AsyncUserRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_user(self, user: User) -> User:
+        self.session.add(user)
+        await self.session.commit()
+        await self.session.refresh(user)
+        primary_pins.pin(user.id)
+        return user
+
+    async def get_users(self, include_todos: bool = False) -> list[User]:
+        return list(await self.session.scalars(users_stmt(include_todos)))
+
+    async def get_user_by_id(self, user_id: int, include_todos: bool = False) -> Optional[User]:
+        options = [selectinload(User.todos)] if include_todos else None
+        return await self.session.get(User, user_id, options=options)
+
+    async def load_todos(self, user: User) -> User:
+        # Lazy Loading geht im async-Pfad nicht – Collection explizit laden
+        await self.session.refresh(user, ["todos"])
+        return user
+
+    async def count_todos_by_state(self, user_ids: list[int]) -> dict[int, dict[str, int]]:
+        if not user_ids:
+            return {}
+        return collect_state_counts(user_ids, await self.session.execute(state_counts_stmt(user_ids)))
+
+    async def get_done_todos(self, user_id: int, include_archived: bool = False) -> list[dict]:
+        return await self._todos_by_state(user_id, "DONE", include_archived)
+
+    async def get_open_todos(self, user_id: int) -> list[dict]:
+        return await self._todos_by_state(user_id, "OPEN")
+
+    async def _todos_by_state(self, user_id: int, state: str, include_archived: bool = False) -> list[dict]:
+        async def load():
+            return todo_rows(await self.session.execute(todos_by_state_stmt(user_id, state, include_archived)))
+
+        return await todo_cache.get_or_load_async(user_id, ("state", state, include_archived), load)
+
+    async def authenticate(self, name: str, password: str) -> User | None:
+        user = (await self.session.scalars(user_by_name_stmt(name))).first()
+        if user and await verify_password_async(password, user.password):
+            if needs_rehash(user.password):
+                user.password = await hash_password_async(password)
+                await self.session.commit()
+            return user
+        return None
+
+
+class AsyncStatsRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def user_stats(self, user_id: int, today: date) -> dict:
+        async def load():
+            if STATS_COUNTERS:
+                counts = dict((await self.session.execute(counters_stmt(user_id))).all())
+                overdue, next_deadline = (await self.session.execute(open_deadlines_stmt(today, user_id))).one()
+                return stats_dict(counts, overdue, next_deadline)
+            return collect_stats(await self.session.execute(stats_stmt(today, user_id)))
+
+        return await todo_cache.get_or_load_async(user_id, ("stats", today), load)
@@ -0,0 +1,150 @@
+# todo_backend/database/events.py
+# In-Process Pub/Sub für Todo-Änderungen (Server-Sent Events, fast/events.py).
+#
+# Die Repositories veröffentlichen nach jedem commit Deltas pro User:
+#   created / updated  – die komplette Zeile (gleiche Keys wie todo_dict)
+#   deleted            – {"id", "user_id"}
+#   reset              – Client soll die Liste neu laden (Import, Queue übergelaufen, Lücke)
+#
+# Jedes Event bekommt eine fortlaufende Nummer (seq, global pro Prozess). Die
+# letzten EVENTS_BUFFER Events bleiben im Ringpuffer, damit ein Client nach
+# einem Reconnect per Last-Event-ID nachholen kann. Jeder Subscriber hat eine
+# begrenzte Queue (EVENTS_QUEUE); läuft sie über, wird sie geleert und durch
+# ein reset ersetzt – ein langsamer Client bremst weder Writes noch andere Clients.
+#
+# Der Bus ist pro Prozess: Event-IDs tragen eine Epoche (Zufallswert pro
+# Prozess), eine ID aus einem anderen Worker oder von vor einem Neustart
+# führt zu reset statt zu stillen Lücken.
+import asyncio
+import os
+import secrets
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from monitoring.metrics import EVENT_RESETS, EVENT_SUBSCRIBERS, TODO_EVENTS
+
+EVENTS_BUFFER = int(os.getenv("EVENTS_BUFFER", "1024"))  # Events im Ringpuffer (alle User)
+EVENTS_QUEUE = int(os.getenv("EVENTS_QUEUE", "64"))      # Events pro Subscriber
+
+
+@dataclass(frozen=True)
+class TodoEvent:
+    seq: int
+    user_id: int
+    type: str  # created | updated | deleted | reset
+    data: dict
+
+
+class Subscription:
+    """Ein offener Stream; die Queue wird nur im Event-Loop des Subscribers befüllt."""
+
+    def __init__(self, user_id: int, start: int, backlog: Optional[list[TodoEvent]], maxsize: int):
+        self.user_id = user_id
+        self.start = start        # seq beim Subscribe – alles danach kommt über die Queue
+        self.backlog = backlog    # verpasste Events seit Last-Event-ID, None = Lücke
+        self.queue: asyncio.Queue[TodoEvent] = asyncio.Queue(maxsize)
+        self.loop = asyncio.get_running_loop()
+
+    def _put(self, event: TodoEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(TodoEvent(event.seq, event.user_id, "reset", {}))
+            EVENT_RESETS.inc(reason="overflow")
+
+
+class TodoEventBus:
+    def __init__(self, buffer_size: int = EVENTS_BUFFER, queue_size: int = EVENTS_QUEUE):
+        self.epoch = secrets.token_hex(4)
+        self.queue_size = queue_size
+        self._seq = 0
+        self._evicted = 0  # höchste seq, die aus dem Ringpuffer gefallen ist
+        self._buffer: deque[TodoEvent] = deque(maxlen=buffer_size)
+        self._subscribers: dict[int, set[Subscription]] = {}
+        # Writes kommen aus dem Threadpool (sync Router) und aus dem Loop (async Router)
+        self._lock = threading.Lock()
+
+    @property
+    def seq(self) -> int:
+        with self._lock:
+            return self._seq
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def parse_id(self, event_id: Optional[str]) -> Optional[int]:
+        """seq aus einer Last-Event-ID dieses Prozesses, sonst None."""
+        epoch, _, seq = (event_id or "").partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, user_id: int, type: str, items: Iterable[dict]) -> None:
+        """Ein Event pro Eintrag von items; aufrufen erst nach dem commit."""
+        with self._lock:
+            for data in items:
+                self._seq += 1
+                event = TodoEvent(self._seq, user_id, type, data)
+                if len(self._buffer) == self._buffer.maxlen:
+                    self._evicted = self._buffer[0].seq
+                self._buffer.append(event)
+                # call_soon_threadsafe hält die Reihenfolge pro Loop ein
+                dead = []
+                for sub in self._subscribers.get(user_id, ()):
+                    try:
+                        sub.loop.call_soon_threadsafe(sub._put, event)
+                    except RuntimeError:
+                        # Loop schon geschlossen (Worker fährt herunter) – der Write ist
+                        # committet und darf daran nicht scheitern
+                        dead.append(sub)
+                for sub in dead:
+                    self._drop(sub)
+                TODO_EVENTS.inc(type=type)
+
+    def reset(self, *user_ids: int) -> None:
+        """Zu viele/unbekannte Änderungen (z. B. Import): Clients laden die Liste neu."""
+        for user_id in set(user_ids):
+            self.publish(user_id, "reset", [{}])
+
+    def subscribe(self, user_id: int, last_event_id: Optional[str] = None) -> Subscription:
+        """Im Event-Loop aufrufen. Backlog und Registrierung unter einem Lock: nichts fehlt, nichts doppelt."""
+        after = self.parse_id(last_event_id)
+        with self._lock:
+            backlog = None
+            if after is not None and self._evicted <= after <= self._seq:
+                backlog = [e for e in self._buffer if e.seq > after and e.user_id == user_id]
+            sub = Subscription(user_id, self._seq, backlog, self.queue_size)
+            self._subscribers.setdefault(user_id, set()).add(sub)
+        EVENT_SUBSCRIBERS.inc()
+        return sub
+
+    def _after_fork(self) -> None:
+        """Neuer Prozess (gunicorn-Worker nach preload): eigene Epoche, Puffer und Subscriber."""
+        self.epoch = secrets.token_hex(4)
+        self._seq = self._evicted = 0
+        self._buffer.clear()
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def _drop(self, sub: Subscription) -> bool:
+        """Unter self._lock; False, falls sub schon entfernt war."""
+        subs = self._subscribers.get(sub.user_id)
+        if subs is None or sub not in subs:
+            return False
+        subs.discard(sub)
+        if not subs:
+            del self._subscribers[sub.user_id]
+        EVENT_SUBSCRIBERS.dec()
+        return True
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._drop(sub)
+
+
+todo_events = TodoEventBus()
+os.register_at_fork(after_in_child=todo_events._after_fork)
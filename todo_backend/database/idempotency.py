@@ -0,0 +1,182 @@
+# todo_backend/database/idempotency.py
+# Speicher für Idempotency-Keys: pro Key der Fingerprint des ersten Requests
+# und – sobald fertig – dessen Antwort. Wiederholungen mit demselben Key
+# bekommen die gespeicherte Antwort, ohne dass der Write erneut läuft.
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from enum import Enum
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+from database.db_session import SessionLocal, get_engine
+from model.models import IdempotencyKey
+
+IDEMPOTENCY_STORE = os.getenv("IDEMPOTENCY_STORE", "memory")  # memory | db | off
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "86400"))  # Sekunden
+# Reservierung ohne Antwort: nach so vielen Sekunden darf ein Retry den Key übernehmen
+# (Worker während des Requests abgestürzt -> sonst 409 bis zum Ende der TTL)
+IDEMPOTENCY_LEASE = float(os.getenv("IDEMPOTENCY_LEASE", "60"))
+IDEMPOTENCY_SIZE = int(os.getenv("IDEMPOTENCY_SIZE", "10000"))  # Keys (nur memory)
+
+
+class Claim(Enum):
+    NEW = "new"                  # Key war frei – Request ausführen, danach complete()
+    REPLAY = "replay"            # fertige Antwort liegt vor
+    IN_PROGRESS = "in_progress"  # gleicher Key läuft gerade noch
+    MISMATCH = "mismatch"        # Key schon mit anderem Request benutzt
+
+
+class IdempotencyStore(ABC):
+    """Schnittstelle für die Backends."""
+
+    def __init__(self, ttl: float = IDEMPOTENCY_TTL, lease: float = IDEMPOTENCY_LEASE):
+        self.ttl = ttl
+        self.lease = lease
+        self.replays = 0
+
+    @abstractmethod
+    def claim(self, key: str, fingerprint: str) -> tuple[Claim, tuple[int, str] | None]:
+        """Reserviert den Key; bei REPLAY kommt (status_code, body) mit."""
+
+    @abstractmethod
+    def complete(self, key: str, status_code: int, body: str) -> None: ...
+
+    @abstractmethod
+    def release(self, key: str) -> None:
+        """Reservierung aufheben (Request fehlgeschlagen) – ein Retry darf neu ausführen."""
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """In-Process, begrenzt auf max_entries (älteste zuerst raus) – nur für einen Worker."""
+
+    def __init__(self, max_entries: int = IDEMPOTENCY_SIZE, ttl: float = IDEMPOTENCY_TTL,
+                 lease: float = IDEMPOTENCY_LEASE):
+        super().__init__(ttl, lease)
+        self.max_entries = max_entries
+        # key -> (expires_at, fingerprint, (status_code, body) | None)
+        self._entries: OrderedDict[str, tuple[float, str, tuple[int, str] | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, key, fingerprint):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= now:
+                _, stored_fingerprint, response = entry
+                if stored_fingerprint != fingerprint:
+                    return Claim.MISMATCH, None
+                if response is None:
+                    return Claim.IN_PROGRESS, None
+                self.replays += 1
+                return Claim.REPLAY, response
+            self._entries[key] = (now + self.lease, fingerprint, None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return Claim.NEW, None
+
+    def complete(self, key, status_code, body):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (time.monotonic() + self.ttl, entry[1], (status_code, body))
+
+    def release(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class NullIdempotencyStore(IdempotencyStore):
+    """IDEMPOTENCY_STORE=off – Header wird ignoriert."""
+
+    def claim(self, key, fingerprint):
+        return Claim.NEW, None
+
+    def complete(self, key, status_code, body):
+        pass
+
+    def release(self, key):
+        pass
+
+
+class DbIdempotencyStore(IdempotencyStore):
+    """Tabelle idempotency_keys – gemeinsam für mehrere Worker/Instanzen.
+
+    Der Primary Key sorgt dafür, dass genau ein Request einen Key reservieren kann;
+    abgelaufene Zeilen (auch liegengebliebene Reservierungen) übernimmt ein claim()
+    per bedingtem UPDATE, sodass auch dabei nur einer gewinnt.
+    """
+
+    PURGE_EVERY = 100  # abgelaufene Zeilen bei jedem n-ten claim() löschen
+
+    def __init__(self, ttl: float = IDEMPOTENCY_TTL, lease: float = IDEMPOTENCY_LEASE):
+        super().__init__(ttl, lease)
+        self._claims = 0
+
+    @staticmethod
+    def _session():
+        return SessionLocal(bind=get_engine())
+
+    def claim(self, key, fingerprint):
+        now = time.time()
+        with self._session() as db:
+            self._claims += 1
+            if self._claims % self.PURGE_EVERY == 0:
+                db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < now))
+                db.commit()
+            row = db.get(IdempotencyKey, key)
+            if row is not None and row.expires_at < now:
+                taken = db.execute(
+                    update(IdempotencyKey)
+                    .where(IdempotencyKey.key == key, IdempotencyKey.expires_at < now)
+                    .values(fingerprint=fingerprint, expires_at=now + self.lease, status_code=None, body=None)
+                ).rowcount
+                db.commit()
+                if taken:
+                    return Claim.NEW, None
+                # ein anderer Request hat den Key gerade übernommen (commit hat row expired)
+                row = db.get(IdempotencyKey, key)
+            if row is None:
+                db.add(IdempotencyKey(key=key, fingerprint=fingerprint, expires_at=now + self.lease))
+                try:
+                    db.commit()
+                    return Claim.NEW, None
+                except IntegrityError:
+                    # paralleler Request mit demselben Key war schneller
+                    db.rollback()
+                    row = db.get(IdempotencyKey, key)
+                    if row is None:
+                        return Claim.IN_PROGRESS, None
+            if row.fingerprint != fingerprint:
+                return Claim.MISMATCH, None
+            if row.status_code is None:
+                return Claim.IN_PROGRESS, None
+            self.replays += 1
+            return Claim.REPLAY, (row.status_code, row.body)
+
+    def complete(self, key, status_code, body):
+        with self._session() as db:
+            db.execute(update(IdempotencyKey).where(IdempotencyKey.key == key)
+                       .values(status_code=status_code, body=body, expires_at=time.time() + self.ttl))
+            db.commit()
+
+    def release(self, key):
+        with self._session() as db:
+            db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key,
+                                                    IdempotencyKey.status_code.is_(None)))
+            db.commit()
+
+
+def build_store(kind: str = IDEMPOTENCY_STORE) -> IdempotencyStore:
+    if kind == "off":
+        return NullIdempotencyStore()
+    if kind == "db":
+        return DbIdempotencyStore()
+    return MemoryIdempotencyStore()
+
+
+idempotency_store = build_store()
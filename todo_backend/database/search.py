@@ -0,0 +1,144 @@
+# todo_backend/database/search.py
+# Volltextsuche über todos.task/description.
+#
+#   MySQL:  FULLTEXT-Index ft_todos_owner_task_description, MATCH … AGAINST (BOOLEAN MODE)
+#   SQLite: FTS5-Tabelle todos_fts (external content) + Trigger auf todos
+#   sonst:  LIKE-Fallback (ohne Index, nur für kleine Datenmengen)
+#
+# Der Index wird von der DB selbst aktuell gehalten (InnoDB bzw. Trigger) –
+# auch für Batch-, Import- und set-basierte Writes aus dem TodoRepository.
+#
+# Der User steht in beiden Varianten als Token mit im Index (MySQL: generierte
+# Spalte fts_owner = "__u<user_id>"), die Suche schneidet also die Posting-
+# Listen "User" × "Begriff" – die Kosten hängen an den Treffern des Users, nicht
+# an allen Treffern der Tabelle. Auf MySQL ist das eine Migration (readme,
+# "Schema-Änderungen"); beim Start wird der Index nur auf einer leeren Tabelle
+# angelegt, damit ein ALTER auf einer großen Tabelle /readyz nicht blockiert.
+import logging
+import re
+
+from sqlalchemy import Select, case, column, inspect, literal_column, or_, select, table, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.engine import Engine
+
+from model.models import Todo
+
+logger = logging.getLogger(__name__)
+
+FT_INDEX_MYSQL = "ft_todos_owner_task_description"
+# DDL wie im readme; auf bestehenden Tabellen per Hand (Tabellen-Rebuild)
+_MYSQL_DDL = [
+    "ALTER TABLE todos ADD COLUMN fts_owner VARCHAR(24) AS (CONCAT('__u', user_id)) STORED",
+    f"ALTER TABLE todos ADD FULLTEXT INDEX {FT_INDEX_MYSQL} (task, description, fts_owner)",
+]
+
+# user_id steht als Token mit im FTS-Index: die Suche schneidet dann nur die
+# Posting-Listen "User" × "Begriff", statt alle Treffer aller User zu joinen.
+_SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(
+        task, description, user_id, content='todos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2')""",
+    """CREATE TRIGGER IF NOT EXISTS todos_fts_ai AFTER INSERT ON todos BEGIN
+        INSERT INTO todos_fts(rowid, task, description, user_id)
+        VALUES (new.id, new.task, new.description, new.user_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS todos_fts_ad AFTER DELETE ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, task, description, user_id)
+        VALUES ('delete', old.id, old.task, old.description, old.user_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS todos_fts_au AFTER UPDATE OF task, description, user_id ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, task, description, user_id)
+        VALUES ('delete', old.id, old.task, old.description, old.user_id);
+        INSERT INTO todos_fts(rowid, task, description, user_id)
+        VALUES (new.id, new.task, new.description, new.user_id);
+    END""",
+]
+
+# "fts5" | "mysql" | "like" – gesetzt von ensure_search_index/detect_search_mode beim Start
+search_mode = "like"
+
+
+def ensure_search_index(engine: Engine) -> str:
+    """Index anlegen, falls er fehlt (idempotent); liefert den Suchmodus."""
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        with engine.begin() as conn:
+            existed = inspect(conn).has_table("todos_fts")
+            for ddl in _SQLITE_DDL:
+                conn.exec_driver_sql(ddl)
+            if not existed:
+                # bestehende Zeilen einmalig übernehmen
+                conn.exec_driver_sql("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')")
+    elif dialect == "mysql":
+        with engine.begin() as conn:
+            if not _mysql_has_index(conn):
+                if conn.execute(text("SELECT 1 FROM todos LIMIT 1")).first() is None:
+                    # neue DB: auf der leeren Tabelle kostet das ALTER nichts
+                    for ddl in _MYSQL_DDL:
+                        conn.exec_driver_sql(ddl)
+                else:
+                    logger.warning("FULLTEXT index %s fehlt – Suche per LIKE bis zur Migration (readme)",
+                                   FT_INDEX_MYSQL)
+    return detect_search_mode(engine)
+
+
+def detect_search_mode(engine: Engine) -> str:
+    """Suchmodus anhand des vorhandenen Index bestimmen (ohne DDL, z.B. bei DB_BOOTSTRAP=0)."""
+    global search_mode
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite" and inspect(conn).has_table("todos_fts"):
+            search_mode = "fts5"
+        elif engine.dialect.name == "mysql" and _mysql_has_index(conn):
+            search_mode = "mysql"
+        else:
+            search_mode = "like"
+    return search_mode
+
+
+def _mysql_has_index(conn, name: str = FT_INDEX_MYSQL) -> bool:
+    return bool(conn.execute(text(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'todos' AND index_name = :name LIMIT 1"
+    ), {"name": name}).first())
+
+
+def search_terms(q: str) -> list[str]:
+    """Nur Wortzeichen – Operatoren der FTS-Syntax aus Nutzereingaben fallen weg."""
+    return re.findall(r"\w+", q)[:10]
+
+
+def search_stmt(user_id: int, terms: list[str], *, limit: int, offset: int = 0) -> Select:
+    """Treffer eines Users, bestes Ranking zuerst; holt eine Zeile mehr (siehe split_search_page).
+
+    Alle Begriffe müssen vorkommen, jeweils als Präfix ("fens" findet "Fenster").
+    """
+    if search_mode == "fts5":
+        fts = table("todos_fts", column("rowid"))
+        words = " AND ".join(f'"{term}"*' for term in terms)
+        query = f'user_id : "{user_id}" AND {{task description}} : ({words})'
+        stmt = (
+            select(*Todo.__table__.columns)
+            .join(fts, fts.c.rowid == Todo.id)
+            .where(literal_column("todos_fts").op("MATCH")(query))
+            # bm25: kleiner = besser; Titel doppelt gewichtet, user_id zählt nicht
+            .order_by(literal_column("bm25(todos_fts, 2.0, 1.0, 0.0)"), Todo.id)
+        )
+    elif search_mode == "mysql":
+        # Spalten exakt wie im Index; +__u<id> beschränkt die Suche im Index auf den User
+        against = " ".join([f"+__u{user_id}", *(f"+{term}*" for term in terms)])
+        score = match(Todo.task, Todo.description, literal_column("todos.fts_owner"), against=against)
+        stmt = select(*Todo.__table__.columns).where(score.in_boolean_mode()).order_by(score.in_boolean_mode().desc(), Todo.id)
+    else:
+        stmt = select(*Todo.__table__.columns)
+        for term in terms:
+            pattern = f"%{term}%"
+            stmt = stmt.where(or_(Todo.task.ilike(pattern), Todo.description.ilike(pattern)))
+        # Treffer im Titel vor Treffern nur in der Beschreibung
+        stmt = stmt.order_by(case((Todo.task.ilike(f"%{terms[0]}%"), 0), else_=1), Todo.id)
+    return stmt.where(Todo.user_id == user_id).limit(limit + 1).offset(offset)
+
+
+def split_search_page(todos: list, limit: int, offset: int) -> tuple[list, int | None]:
+    if len(todos) > limit:
+        return todos[:limit], offset + limit
+    return todos, None
@@ -0,0 +1,33 @@
+# todo_backend/fast/auth.py
+import os
+import secrets
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from security.tokens import TokenError, TokenUser, verify_token
+
+bearer = HTTPBearer(auto_error=False)
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")  # ohne: Admin-Endpunkte gesperrt
+
+
+def get_current_user(credentials: HTTPAuthorizationCredentials | None = Depends(bearer)) -> TokenUser:
+    """FastAPI-Dependency: User aus dem Bearer-Token, ohne DB-Zugriff."""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated",
+                            headers={"WWW-Authenticate": "Bearer"})
+    try:
+        return verify_token(credentials.credentials)
+    except TokenError as e:
+        raise HTTPException(status_code=401, detail=f"Invalid token: {e}",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+
+def require_admin(credentials: HTTPAuthorizationCredentials | None = Depends(bearer)) -> None:
+    """FastAPI-Dependency für Admin-Endpunkte: Authorization: Bearer <ADMIN_TOKEN>."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin-Endpunkte deaktiviert (ADMIN_TOKEN fehlt)")
+    if credentials is None or not secrets.compare_digest(credentials.credentials, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Admin token required",
+                            headers={"WWW-Authenticate": "Bearer"})
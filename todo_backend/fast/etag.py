@@ -0,0 +1,79 @@
+# todo_backend/fast/etag.py
+# Schwache ETags pro User: basieren auf der Cache-Version, die jeder Write
+# im TodoRepository erhöht. Passt If-None-Match, antwortet der Router mit 304,
+# ohne Query und ohne Pydantic-Serialisierung.
+#
+# Die Versionen pro Prozess (TODO_CACHE=memory/off) sehen nur Writes des
+# eigenen Workers – ein anderer Worker bestätigte sonst per 304 einen
+# veralteten Stand. Mit mehreren Workern gibt es User-ETags deshalb nur mit
+# TODO_CACHE=redis; sonst kein ETag und immer 200.
+#
+# Einzelne Todos haben starke ETags aus ihrer version-Spalte ("v3"); If-Match
+# damit macht Writes bedingt (UPDATE … WHERE version = 3, sonst 412).
+import re
+from datetime import date
+
+from fastapi import HTTPException, Request, Response
+
+from database.cache import todo_cache
+from database.db_session import WEB_CONCURRENCY
+
+USER_ETAGS = todo_cache.shared or WEB_CONCURRENCY <= 1
+
+
+def user_etag(user_id: int, day: date | None = None) -> str | None:
+    """Vor der Query berechnen – sonst könnte ein paralleler Write übersehen werden.
+
+    day: für Antworten, die vom heutigen Datum abhängen (fällig/überfällig).
+    None: keine User-ETags (mehrere Worker ohne gemeinsame Versionen).
+    """
+    if not USER_ETAGS:
+        return None
+    suffix = f"-{day.isoformat()}" if day is not None else ""
+    return f'W/"{todo_cache.etag_prefix}-{user_id}-{todo_cache.version(user_id)}{suffix}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # schwacher Vergleich: W/ ignorieren
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, etag: str | None) -> bool:
+    """True, falls der Client die aktuelle Version schon hat."""
+    if etag is None:
+        return False
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and _matches(if_none_match, etag)
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def set_etag(response: Response, etag: str | None) -> None:
+    if etag is None:
+        return
+    response.headers["ETag"] = etag
+    # Browser/Proxies sollen immer revalidieren, statt blind aus dem Cache zu lesen
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def todo_etag(version: int) -> str:
+    return f'"v{version}"'
+
+
+def if_match_version(request: Request) -> int | None:
+    """If-Match -> erwartete version; None ohne Header oder bei "*".
+
+    Schwache ETags zählen für If-Match nicht (RFC 9110) -> 412, ebenso fremde Formate.
+    """
+    if_match = request.headers.get("if-match")
+    if not if_match or if_match.strip() == "*":
+        return None
+    found = re.fullmatch(r'\s*"v(\d+)"\s*', if_match)
+    if found is None:
+        raise HTTPException(status_code=412, detail="If-Match passt nicht zum Todo")
+    return int(found.group(1))
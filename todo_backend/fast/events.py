@@ -0,0 +1,85 @@
+# todo_backend/fast/events.py
+# Server-Sent Events: GET /users/{user_id}/todos/events
+#
+#   event: ready                      ohne Last-Event-ID; jetzt die Liste laden, Deltas kommen ab hier
+#   event: created | updated | deleted  Deltas aus den Repositories (data = JSON)
+#   event: reset                      Liste neu laden (Import, Lücke, Client zu langsam)
+#   id + ": ping"                     Heartbeat alle EVENTS_HEARTBEAT Sekunden
+#
+# Jedes Event trägt eine id; nach einem Reconnect schickt der Browser sie als
+# Last-Event-ID und bekommt die verpassten Events aus dem Ringpuffer
+# (database/events.py). Nach EVENTS_MAX_AGE Sekunden beendet der Server den
+# Stream – EventSource verbindet automatisch neu; so bleibt auch ein
+# Shutdown nicht an offenen Streams hängen.
+#
+# Der Bus ist pro Prozess: ein Stream sieht nur Writes seines Workers. Der
+# Header X-Event-Workers nennt die Worker-Zahl; ist sie > 1, muss der Client
+# die Liste zusätzlich regelmäßig neu laden (todo_frontend/live.py) – oder
+# /todos/events läuft mit einem Worker bzw. Sticky Sessions.
+import asyncio
+import os
+
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+
+from database.events import TodoEvent, todo_events
+from monitoring.metrics import EVENT_RESETS
+
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))  # Sekunden
+EVENTS_MAX_AGE = float(os.getenv("EVENTS_MAX_AGE", "300"))     # Sekunden pro Stream
+EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", "2000"))    # Reconnect-Pause für EventSource
+EVENTS_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))        # gunicorn.conf.py setzt es für die Worker
+
+# ohne DB-Zugriff – auch im async-Modus eingebunden
+events_router = APIRouter(prefix="/users", tags=["events"])
+
+
+def _frame(event: TodoEvent) -> str:
+    return f"id: {todo_events.event_id(event.seq)}\nevent: {event.type}\ndata: {to_json(event.data).decode()}\n\n"
+
+
+async def _stream(user_id: int, last_event_id: str | None):
+    # erst im Generator abonnieren: startet der Stream nie, bleibt auch kein Subscriber hängen
+    loop = asyncio.get_running_loop()
+    sub = todo_events.subscribe(user_id, last_event_id)
+    resume = last_event_id is not None
+    try:
+        yield f"retry: {EVENTS_RETRY_MS}\n\n"
+        if not resume:
+            yield _frame(TodoEvent(sub.start, sub.user_id, "ready", {}))
+        elif sub.backlog is None:
+            EVENT_RESETS.inc(reason="resume")
+            yield _frame(TodoEvent(sub.start, sub.user_id, "reset", {}))
+        else:
+            for event in sub.backlog:
+                yield _frame(event)
+        closes_at = loop.time() + EVENTS_MAX_AGE
+        while (remaining := closes_at - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), min(EVENTS_HEARTBEAT, remaining))
+            except asyncio.TimeoutError:  # vor 3.11 nicht dasselbe wie das eingebaute TimeoutError
+                # Heartbeat mit der aktuellen seq als id, damit ein ruhiger Client nicht
+                # aus dem Ringpuffer fällt. Vorher laufen alle bis dahin geplanten _put-Callbacks.
+                seq = todo_events.seq
+                await asyncio.sleep(0)
+                if sub.queue.empty():
+                    yield f"id: {todo_events.event_id(seq)}\n: ping\n\n"
+                continue
+            yield _frame(event)
+    finally:
+        todo_events.unsubscribe(sub)
+
+
+@events_router.get("/{user_id}/todos/events", response_class=StreamingResponse)
+async def todo_event_stream(user_id: int, last_event_id: str | None = Header(None)):
+    """
+    Example:
+    curl -N http://127.0.0.1:8000/users/1/todos/events
+    curl -N -H "Last-Event-ID: <id>" http://127.0.0.1:8000/users/1/todos/events
+    """
+    return StreamingResponse(
+        _stream(user_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Event-Workers": str(EVENTS_WORKERS)},
+    )
@@ -0,0 +1,79 @@
+# todo_backend/fast/idempotency.py
+# Idempotency-Key für POST-Routen: der erste Request mit einem Key läuft
+# normal und seine Antwort wird gespeichert; Wiederholungen (Client-Retry nach
+# Timeout/502) bekommen dieselbe Antwort, ohne dass die Route erneut schreibt.
+#
+#   @todo_router.post("/")
+#   def create_todo(..., idem: Idempotency = Depends(idempotent)):
+#       if idem.replay is not None:
+#           return idem.replay
+#       ...
+#       return idem.remember(result)
+import hashlib
+import json
+
+from fastapi import Header, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from database.idempotency import Claim, idempotency_store
+
+
+class Idempotency:
+    def __init__(self, key: str | None = None, replay: JSONResponse | None = None):
+        self.key = key
+        self.replay = replay
+        self.completed = False
+
+    def remember(self, result, status_code: int = 200):
+        """Antwort für spätere Wiederholungen ablegen und unverändert zurückgeben."""
+        if self.key is not None:
+            body = json.dumps(jsonable_encoder(result), ensure_ascii=False)
+            idempotency_store.complete(self.key, status_code, body)
+            self.completed = True
+        return result
+
+    async def remember_async(self, result, status_code: int = 200):
+        """Wie remember – für async Routen (DB-Store blockiert sonst den Event-Loop)."""
+        return await run_in_threadpool(self.remember, result, status_code)
+
+
+def _fingerprint(request: Request, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (request.method, request.url.path, request.url.query):
+        digest.update(part.encode() + b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def idempotent(
+    request: Request,
+    idempotency_key: str | None = Header(None, max_length=200),
+):
+    """FastAPI-Dependency (mit yield): reserviert den Key für die Dauer der Route."""
+    if not idempotency_key:
+        yield Idempotency()
+        return
+    key = f"{request.url.path}:{idempotency_key}"
+    # Body ist zu diesem Zeitpunkt schon gelesen (Starlette cached ihn)
+    fingerprint = _fingerprint(request, await request.body())
+    claim, stored = await run_in_threadpool(idempotency_store.claim, key, fingerprint)
+    if claim is Claim.MISMATCH:
+        raise HTTPException(status_code=422, detail="Idempotency-Key wurde bereits für einen anderen Request verwendet")
+    if claim is Claim.IN_PROGRESS:
+        raise HTTPException(status_code=409, detail="Request mit diesem Idempotency-Key läuft noch",
+                            headers={"Retry-After": "1"})
+    if claim is Claim.REPLAY:
+        status_code, body = stored
+        yield Idempotency(replay=JSONResponse(json.loads(body), status_code=status_code,
+                                              headers={"Idempotent-Replayed": "true"}))
+        return
+
+    idem = Idempotency(key)
+    try:
+        yield idem
+    finally:
+        # Fehler (Exception oder Route ohne remember) -> Key wieder freigeben, Retry darf neu ausführen
+        if not idem.completed:
+            await run_in_threadpool(idempotency_store.release, key)
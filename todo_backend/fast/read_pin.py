@@ -0,0 +1,74 @@
+# todo_backend/fast/read_pin.py
+# Read-your-writes über Worker hinweg: nach einem Write bekommt der Client pro
+# betroffenem User den Zeitpunkt als Cookie read_pin_<user_id> und im Header
+# X-Read-Pin ("<user_id>:<zeitpunkt>, …" für Clients ohne Cookie-Jar); schickt
+# er ihn zurück, lesen seine Requests für genau diese User READ_PIN_SECONDS
+# lang vom Primary – egal welcher Worker sie annimmt. Andere User bleiben auf
+# den Replicas, auch wenn sich mehrere User einen Client teilen (Frontend).
+# Nur mit DATABASE_READ_URLS aktiv.
+import time
+
+from database.db_session import READ_PIN_COOKIE, READ_PIN_SECONDS, ReadPin, current_read_pin
+
+PIN_HEADER = b"x-read-pin"
+
+
+def _pins(headers) -> dict[int, float]:
+    """user_id -> Zeitpunkt aus Header X-Read-Pin und Cookies read_pin_<user_id>; kaputte Werte ignorieren."""
+    raw_pins: list[tuple[str, str]] = []
+    prefix = READ_PIN_COOKIE + "_"
+    for name, raw in headers:
+        if name == PIN_HEADER:
+            for part in raw.decode("latin-1").split(","):
+                user_id, _, written_at = part.strip().partition(":")
+                raw_pins.append((user_id, written_at))
+        elif name == b"cookie":
+            for part in raw.decode("latin-1").split(";"):
+                key, _, written_at = part.strip().partition("=")
+                if key.startswith(prefix):
+                    raw_pins.append((key.removeprefix(prefix), written_at))
+    pins: dict[int, float] = {}
+    for user_id, written_at in raw_pins:
+        try:
+            user, at = int(user_id), float(written_at)
+        except ValueError:
+            continue
+        pins[user] = max(at, pins.get(user, at))
+    return pins
+
+
+class ReadPinMiddleware:
+    """Reines ASGI-Middleware wie MetricsMiddleware: setzt current_read_pin pro Request."""
+
+    def __init__(self, app, seconds: float = READ_PIN_SECONDS):
+        self.app = app
+        self.seconds = seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        # Wanduhr statt monotonic: der Wert wird von einem anderen Prozess ausgewertet
+        now = time.time()
+        pin = ReadPin(pinned={user_id for user_id, written_at in _pins(scope.get("headers", ())).items()
+                              if 0 <= now - written_at < self.seconds})
+        token = current_read_pin.set(pin)
+
+        async def send_wrapper(message):
+            # bei Streams ist der Kopf schon raus, bevor geschrieben wird – dort kein Pin (nur lesend)
+            if message["type"] == "http.response.start" and pin.wrote:
+                value = f"{time.time():.3f}"
+                max_age = max(int(self.seconds), 1)
+                headers = [*message.get("headers", ())]
+                for user_id in sorted(pin.wrote):
+                    cookie = f"{READ_PIN_COOKIE}_{user_id}={value}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                    headers.append((b"set-cookie", cookie.encode("latin-1")))
+                pins = ", ".join(f"{user_id}:{value}" for user_id in sorted(pin.wrote))
+                headers.append((PIN_HEADER, pins.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_read_pin.reset(token)
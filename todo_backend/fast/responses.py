@@ -0,0 +1,58 @@
+# todo_backend/fast/responses.py
+# Schnelle JSON-Antworten für die Todo-Listen.
+#
+# Die Repositories liefern Listen als dicts aus Spalten-Queries (database.crud.TODO_COLUMNS).
+# todo_list_response serialisiert sie direkt – ohne pro Zeile ein TodoRead zu
+# validieren (response_model bleibt für die OpenAPI-Doku stehen):
+#   orjson installiert:  ein C-Aufruf (date, Enum nativ)
+#   sonst:               gecachter TypeAdapter(list[TodoRead]) im Pydantic-Core
+#
+# JSON_RESPONSE=orjson macht OrjsonResponse zur default_response_class der App.
+import os
+from typing import Any
+
+from fastapi import Response
+from fastapi.datastructures import Default
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from fast.schemas import TodoRead
+
+try:
+    import orjson  # optional, pip install orjson
+except ImportError:
+    orjson = None
+
+JSON_RESPONSE = os.getenv("JSON_RESPONSE", "default")  # default | orjson
+
+todo_list_adapter = TypeAdapter(list[TodoRead])
+
+
+class OrjsonResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def default_response_class():
+    """Für FastAPI(default_response_class=…).
+
+    "default" lässt FastAPIs eigenen Pfad (Pydantic dump_json direkt aus dem response_model).
+    """
+    if JSON_RESPONSE == "orjson":
+        if orjson is None:
+            raise RuntimeError("JSON_RESPONSE=orjson braucht das Paket orjson")
+        return OrjsonResponse
+    return Default(JSONResponse)
+
+
+def dump_todos(todos: list[dict]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(todos)
+    return todo_list_adapter.dump_json(todo_list_adapter.validate_python(todos))
+
+
+def todo_list_response(todos: list[dict], response: Response) -> Response:
+    """Liste als fertige Response; Header (ETag, X-Next-Cursor, …) aus dem injizierten response."""
+    result = Response(content=dump_todos(todos), media_type="application/json")
+    result.headers.raw.extend(response.headers.raw)
+    return result
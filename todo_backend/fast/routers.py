@@ -1,15 +1,39 @@
 # todo_backend/fast/routers.py
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from database.db_session import get_db
-from database.crud import UserRepository, TodoRepository
+from database.cache import todo_cache
+from database.db_session import get_db, get_read_db
+from database.crud import StatsRepository, UserRepository, TodoRepository
 from security.pwd import hash_password
-from fast.schemas import UserCreate, UserRead, TodoCreate, TodoRead, UserLogin
+from security.tokens import TOKEN_TTL_SECONDS, TokenUser, create_token
+from fast.auth import get_current_user, require_admin
+from fast.etag import if_match_version, not_modified, not_modified_response, set_etag, todo_etag, user_etag
+from fast.idempotency import Idempotency, idempotent
+from fast.responses import todo_list_response
+from fast.schemas import (
+    UserCreate, UserRead, UserSummary, TodoCreate, TodoRead, UserLogin, TokenResponse,
+    TodoBatchCreate, TodoBatchIds, TodoBatchState, BatchItemResult, UserStats, GlobalStats,
+)
 from model.models import User, Todo
+from model.enums import TodoState
+
+MAX_PAGE_SIZE = 500
+MAX_SEARCH_PAGE = 100
+MAX_DUE_DAYS = 366
+
 user_router = APIRouter(prefix="/users", tags=["users"])
 todo_router = APIRouter(prefix="/todos", tags=["todos"])
+# eigener Router, damit /todos/batch vor /todos/{todo_id} registriert wird
+# (und auch im async-Modus verfügbar ist)
+batch_router = APIRouter(prefix="/todos/batch", tags=["todos"])
+# Admin-Auswertungen über alle User (sync, auch im async-Modus eingebunden)
+stats_router = APIRouter(prefix="/stats", tags=["stats"], dependencies=[Depends(require_admin)])
 
 
 status_router = APIRouter()
@@ -21,72 +45,234 @@ def status():
 @status_router.get("/status/db")
 def status_db(db: Session = Depends(get_db)):
     try:
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         return {"database": "connected"}
     except Exception as e:
         return {"database": "error", "detail": str(e)}
 
+@status_router.get("/status/cache")
+def status_cache():
+    return todo_cache.stats()
+
 # ================= USERS ==================================================
 
-@user_router.get("/", response_model=list[UserRead])
-def list_users(db: Session = Depends(get_db)):
+# ?include=todos liefert die volle Todo-Liste, sonst nur die Zusammenfassung
+Include = Literal["todos"] | None
+
+
+def within_days(within: str = Query("7d", pattern=r"^\d+[dw]?$", description="z.B. 7d, 2w oder 10")) -> int:
+    """?within=7d|2w|10 -> Tage (Deadline ist ein Datum, feiner geht es nicht)."""
+    days = int(within.rstrip("dw")) * (7 if within.endswith("w") else 1)
+    if days > MAX_DUE_DAYS:
+        raise HTTPException(status_code=422, detail=f"within max. {MAX_DUE_DAYS} Tage")
+    return days
+
+
+def _user_views(repo: UserRepository, users: list[User], include: Include) -> list[UserRead | UserSummary]:
+    if include == "todos":
+        return [UserRead.model_validate(u) for u in users]
+    counts = repo.count_todos_by_state([u.id for u in users])
+    return [UserSummary(id=u.id, name=u.name, counts=counts[u.id]) for u in users]
+
+
+@user_router.get("/", response_model=list[UserSummary] | list[UserRead])
+def list_users(include: Include = None, db: Session = Depends(get_read_db)):
     """
     Example URL:
     http://127.0.0.1:8000/users/
+    http://127.0.0.1:8000/users/?include=todos
     """
     repo = UserRepository(db)
-    return repo.get_users()
+    users = repo.get_users(include_todos=include == "todos")
+    return _user_views(repo, users, include)
+
 
+@user_router.get("/me", response_model=UserSummary | UserRead)
+def get_me(request: Request, response: Response, include: Include = None,
+           current: TokenUser = Depends(get_current_user), db: Session = Depends(get_db)):
+    """
+    Example URL:
+    http://127.0.0.1:8000/users/me   (Header: Authorization: Bearer <token>)
+    """
+    return get_user(current.id, request, response, include=include, db=db)
 
-@user_router.get("/{user_id}", response_model=UserRead)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+
+@user_router.get("/{user_id}", response_model=UserSummary | UserRead)
+def get_user(user_id: int, request: Request, response: Response, include: Include = None,
+             db: Session = Depends(get_read_db)):
     """
     Example URL:
     http://127.0.0.1:8000/users/1
+    http://127.0.0.1:8000/users/1?include=todos
     """
+    etag = user_etag(user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
     repo = UserRepository(db)
-    user = repo.get_user_by_id(user_id)
+    user = repo.get_user_by_id(user_id, include_todos=include == "todos")
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    set_etag(response, etag)
+    return _user_views(repo, [user], include)[0]
 
 
 @user_router.get("/{user_id}/todos", response_model=list[TodoRead])
-def get_todos_by_user(user_id: int, db: Session = Depends(get_db)):
+def get_todos_by_user(
+    user_id: int,
+    request: Request,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: int | None = Query(None, ge=0),
+    state: TodoState | None = None,
+    deadline_before: date | None = None,
+    deadline_after: date | None = None,
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+):
     """
     Example URL:
     http://127.0.0.1:8000/users/2/todos
+    http://127.0.0.1:8000/users/2/todos?limit=50&state=OPEN
+    http://127.0.0.1:8000/users/2/todos?limit=50&after=<X-Next-Cursor>
+    http://127.0.0.1:8000/users/2/todos?include_archived=true
+
+    Ohne limit kommt die komplette Liste (wie bisher). Gibt es weitere
+    Seiten, steht der Cursor für ?after= im Header X-Next-Cursor.
+    include_archived=true nimmt die archivierten (erledigten) Todos dazu.
     """
+    etag = user_etag(user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
     repo = TodoRepository(db)
-    return repo.get_todos_by_user(user_id)
+    todos, next_cursor = repo.get_todos_page(
+        user_id,
+        limit=limit,
+        after=after,
+        state=state,
+        deadline_before=deadline_before,
+        deadline_after=deadline_after,
+        include_archived=include_archived,
+    )
+    set_etag(response, etag)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return todo_list_response(todos, response)
+
+
+@user_router.get("/{user_id}/todos/search", response_model=list[TodoRead])
+def search_todos(
+    user_id: int,
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_PAGE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Example URL:
+    http://127.0.0.1:8000/users/2/todos/search?q=fenster
+    http://127.0.0.1:8000/users/2/todos/search?q=fenster küche&limit=20&offset=<X-Next-Offset>
+
+    Alle Wörter müssen (als Präfix) in task oder description vorkommen,
+    bester Treffer zuerst. Weitere Seiten: Header X-Next-Offset.
+    """
+    etag = user_etag(user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    todos, next_offset = TodoRepository(db).search_todos(user_id, q, limit=limit, offset=offset)
+    set_etag(response, etag)
+    if next_offset is not None:
+        response.headers["X-Next-Offset"] = str(next_offset)
+    return todo_list_response(todos, response)
+
+
+@user_router.get("/{user_id}/todos/due", response_model=list[TodoRead])
+def get_due_todos(user_id: int, request: Request, response: Response, days: int = Depends(within_days),
+                  limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_read_db)):
+    """
+    Example URL:
+    http://127.0.0.1:8000/users/1/todos/due?within=7d
+    Nicht erledigte Todos mit Deadline von heute bis heute + within, früheste zuerst.
+    """
+    today = date.today()
+    etag = user_etag(user_id, today)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    todos = TodoRepository(db).get_due_todos(user_id, today, days, limit)
+    set_etag(response, etag)
+    return todo_list_response(todos, response)
+
+
+@user_router.get("/{user_id}/todos/overdue", response_model=list[TodoRead])
+def get_overdue_todos(user_id: int, request: Request, response: Response,
+                      limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_read_db)):
+    """
+    Example URL:
+    http://127.0.0.1:8000/users/1/todos/overdue
+    Nicht erledigte Todos mit Deadline vor heute, älteste zuerst.
+    """
+    today = date.today()
+    etag = user_etag(user_id, today)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    todos = TodoRepository(db).get_overdue_todos(user_id, today, limit)
+    set_etag(response, etag)
+    return todo_list_response(todos, response)
 
 
 @user_router.get("/{user_id}/done_todos", response_model=list[TodoRead])
-def get_done_todos(user_id: int, db: Session = Depends(get_db)):
+def get_done_todos(user_id: int, request: Request, response: Response, include_archived: bool = False,
+                   db: Session = Depends(get_read_db)):
     """
     Example URL:
     http://127.0.0.1:8000/users/1/done_todos
+    http://127.0.0.1:8000/users/1/done_todos?include_archived=true
     """
+    etag = user_etag(user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
     repo = UserRepository(db)
-    return repo.get_done_todos(user_id)
+    todos = repo.get_done_todos(user_id, include_archived)
+    set_etag(response, etag)
+    return todo_list_response(todos, response)
 
 
 @user_router.get("/{user_id}/open_todos", response_model=list[TodoRead])
-def get_open_todos(user_id: int, db: Session = Depends(get_db)):
+def get_open_todos(user_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """
     Example URL:
     http://127.0.0.1:8000/users/1/open_todos
     """
+    etag = user_etag(user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
     repo = UserRepository(db)
-    return repo.get_open_todos(user_id)
+    todos = repo.get_open_todos(user_id)
+    set_etag(response, etag)
+    return todo_list_response(todos, response)
 
-@user_router.post("/", response_model=UserRead)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+@user_router.get("/{user_id}/stats", response_model=UserStats)
+def get_user_stats(user_id: int, db: Session = Depends(get_read_db)):
+    """
+    Example URL:
+    http://127.0.0.1:8000/users/1/stats
+    Anzahl je State, überfällige Todos und nächste Deadline – ohne die Liste zu laden.
+    """
+    return UserStats(user_id=user_id, **StatsRepository(db).user_stats(user_id, date.today()))
+
+@user_router.post("/", response_model=UserSummary)
+def create_user(user: UserCreate, db: Session = Depends(get_db), idem: Idempotency = Depends(idempotent)):
+    """
+    Mit Header "Idempotency-Key: <uuid>" liefert eine Wiederholung die erste Antwort.
+    """
+    if idem.replay is not None:
+        return idem.replay
     repo = UserRepository(db)
     try:
         hashed_pw = hash_password(user.password)
-        new_user = User(name=user.name, password=hashed_pw)
-        return repo.create_user(new_user)
+        new_user = repo.create_user(User(name=user.name, password=hashed_pw))
+        return idem.remember(UserSummary(id=new_user.id, name=new_user.name))
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=409, detail="Username existiert bereits")
@@ -94,20 +280,40 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"DB-Fehler: {e.__class__.__name__}")
 
-@user_router.post("/authenticate", response_model=UserRead)
-def authenticate_user(credentials: UserLogin, db: Session = Depends(get_db)):
+@user_router.post("/authenticate", response_model=UserSummary | UserRead)
+def authenticate_user(credentials: UserLogin, include: Include = None, db: Session = Depends(get_db)):
     repo = UserRepository(db)
     user = repo.authenticate(credentials.name, credentials.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid name or password")
-    return user
+    return _user_views(repo, [user], include)[0]
+
+
+@user_router.post("/login", response_model=TokenResponse)
+def login(credentials: UserLogin, db: Session = Depends(get_db)):
+    """
+    Einmal bcrypt, danach reicht das Token:
+    POST http://127.0.0.1:8000/users/login
+    {"name": "anna", "password": "geheim123"}
+    """
+    repo = UserRepository(db)
+    user = repo.authenticate(credentials.name, credentials.password)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid name or password")
+    return TokenResponse(
+        access_token=create_token(user.id, user.name),
+        expires_in=TOKEN_TTL_SECONDS,
+        user=_user_views(repo, [user], None)[0],
+    )
 # ================= TODOS ==================================================
 
 @todo_router.post("/", response_model=TodoRead)
-def create_todo(todo: TodoCreate, user_id: int, db: Session = Depends(get_db)):
+def create_todo(todo: TodoCreate, user_id: int, db: Session = Depends(get_db),
+                idem: Idempotency = Depends(idempotent)):
     """
     Example URL:
     POST http://127.0.0.1:8000/todos/?user_id=1
+    Idempotency-Key: 9b2f0c1e-…   (optional, Wiederholung liefert dasselbe Todo)
     Request body:
     {
         "task": "Fenster putzen",
@@ -116,29 +322,113 @@ def create_todo(todo: TodoCreate, user_id: int, db: Session = Depends(get_db)):
         "state": "OPEN"
     }
     """
+    if idem.replay is not None:
+        return idem.replay
     repo = TodoRepository(db)
     todo_db = Todo(**todo.model_dump(), user_id=user_id)
-    return repo.create_todo(todo_db)
+    try:
+        return idem.remember(TodoRead.model_validate(repo.create_todo(todo_db)))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="User not found")
 
 
 @todo_router.put("/{todo_id}/state", response_model=TodoRead)
-def update_todo_state(todo_id: int, new_state: str, db: Session = Depends(get_db)):
+def update_todo_state(todo_id: int, new_state: str, request: Request, response: Response,
+                      db: Session = Depends(get_db)):
     """
     Example URL:
     PUT http://127.0.0.1:8000/todos/1/state?new_state=DONE
+    If-Match: "v3"   (optional, sonst 412 falls der Todo inzwischen geändert wurde)
     """
     repo = TodoRepository(db)
-    todo = repo.update_todo_state(todo_id, new_state)
+    try:
+        todo = repo.update_todo_state(todo_id, new_state, if_match_version(request))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
+    response.headers["ETag"] = todo_etag(todo["version"])
     return todo
 
 
 @todo_router.delete("/{todo_id}", response_model=bool)
-def delete_todo(todo_id: int, db: Session = Depends(get_db)):
+def delete_todo(todo_id: int, request: Request, db: Session = Depends(get_db)):
     """
     Example URL:
     DELETE http://127.0.0.1:8000/todos/1
+    If-Match: "v3"   (optional)
+    """
+    repo = TodoRepository(db)
+    return repo.delete_todo(todo_id, if_match_version(request))
+
+
+# ================= TODOS (Batch) ==========================================
+
+@batch_router.post("", response_model=list[TodoRead])
+def create_todos(batch: TodoBatchCreate, user_id: int, db: Session = Depends(get_db),
+                 idem: Idempotency = Depends(idempotent)):
+    """
+    Example URL:
+    POST http://127.0.0.1:8000/todos/batch?user_id=1
+    Request body:
+    {"items": [{"task": "Fenster putzen"}, {"task": "Müll", "state": "DONE"}]}
+    """
+    if idem.replay is not None:
+        return idem.replay
+    repo = TodoRepository(db)
+    try:
+        return idem.remember(repo.create_todos(user_id, [item.model_dump() for item in batch.items]))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="User not found")
+
+
+@batch_router.patch("/state", response_model=list[BatchItemResult])
+def update_todo_states(batch: TodoBatchState, db: Session = Depends(get_db)):
+    """
+    Example URL:
+    PATCH http://127.0.0.1:8000/todos/batch/state
+    Request body:
+    {"ids": [1, 2, 3], "state": "DONE"}
     """
     repo = TodoRepository(db)
-    return repo.delete_todo(todo_id)
+    try:
+        result = repo.update_todo_states(batch.ids, batch.state.value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return [BatchItemResult(id=todo_id, ok=ok) for todo_id, ok in result.items()]
+
+
+@batch_router.delete("", response_model=list[BatchItemResult])
+def delete_todos(batch: TodoBatchIds, db: Session = Depends(get_db)):
+    """
+    Example URL:
+    DELETE http://127.0.0.1:8000/todos/batch
+    Request body:
+    {"ids": [1, 2, 3]}
+    """
+    repo = TodoRepository(db)
+    result = repo.delete_todos(batch.ids)
+    return [BatchItemResult(id=todo_id, ok=ok) for todo_id, ok in result.items()]
+
+
+# ================= STATS (Admin) ==========================================
+
+@stats_router.get("", response_model=GlobalStats)
+def get_global_stats(db: Session = Depends(get_read_db)):
+    """
+    Example URL:
+    GET http://127.0.0.1:8000/stats
+    Authorization: Bearer <ADMIN_TOKEN>
+    """
+    return GlobalStats(**StatsRepository(db).global_stats(date.today()))
+
+
+@stats_router.post("/rebuild-counters")
+def rebuild_counters(db: Session = Depends(get_db)):
+    """
+    Example URL:
+    POST http://127.0.0.1:8000/stats/rebuild-counters
+    Authorization: Bearer <ADMIN_TOKEN>
+    todo_counters aus der todos-Tabelle neu aufbauen (nach dem Einschalten von STATS_COUNTERS).
+    """
+    return {"rows": StatsRepository(db).rebuild_counters()}
@@ -0,0 +1,262 @@
+# todo_backend/fast/routers_async.py
+# Dieselben Endpunkte wie fast/routers.py, aber async (DB_ASYNC=1):
+# kein Threadpool, Concurrency nur durch die DB-Pool-Größe begrenzt.
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.cache import todo_cache
+from database.db_session import get_async_db, get_async_read_db
+from database.crud_async import AsyncStatsRepository, AsyncUserRepository, AsyncTodoRepository
+from security.pwd import hash_password_async
+from security.tokens import TOKEN_TTL_SECONDS, TokenUser, create_token
+from fast.auth import get_current_user
+from fast.etag import if_match_version, not_modified, not_modified_response, set_etag, todo_etag, user_etag
+from fast.idempotency import Idempotency, idempotent
+from fast.responses import todo_list_response
+from fast.routers import MAX_PAGE_SIZE, MAX_SEARCH_PAGE, Include, within_days
+from fast.schemas import (
+    UserCreate, UserRead, UserSummary, TodoCreate, TodoRead, UserLogin, TokenResponse, UserStats,
+)
+from model.models import User, Todo
+from model.enums import TodoState
+
+user_router = APIRouter(prefix="/users", tags=["users"])
+todo_router = APIRouter(prefix="/todos", tags=["todos"])
+
+
+status_router = APIRouter()
+
+@status_router.get("/status")
+async def status():
+    return {"status": "running"}
+
+@status_router.get("/status/db")
+async def status_db(db: AsyncSession = Depends(get_async_db)):
+    try:
+        await db.execute(text("SELECT 1"))
+        return {"database": "connected"}
+    except Exception as e:
+        return {"database": "error", "detail": str(e)}
+
+@status_router.get("/status/cache")
+async def status_cache():
+    return todo_cache.stats()
+
+# ================= USERS ==================================================
+
+async def _user_views(repo: AsyncUserRepository, users: list[User], include: Include) -> list[UserRead | UserSummary]:
+    if include == "todos":
+        return [UserRead.model_validate(u) for u in users]
+    counts = await repo.count_todos_by_state([u.id for u in users])
+    return [UserSummary(id=u.id, name=u.name, counts=counts[u.id]) for u in users]
+
+
+@user_router.get("/", response_model=list[UserSummary] | list[UserRead])
+async def list_users(include: Include = None, db: AsyncSession = Depends(get_async_read_db)):
+    repo = AsyncUserRepository(db)
+    users = await repo.get_users(include_todos=include == "todos")
+    return await _user_views(repo, users, include)
+
+
+@user_router.get("/me", response_model=UserSummary | UserRead)
+async def get_me(request: Request, response: Response, include: Include = None,
+                 current: TokenUser = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    return await get_user(current.id, request, response, include=include, db=db)
+
+
+@user_router.get("/{user_id}", response_model=UserSummary | UserRead)
+async def get_user(user_id: int, request: Request, response: Response, include: Include = None,
+                   db: AsyncSession = Depends(get_async_read_db)):
+    etag = user_etag(user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    repo = AsyncUserRepository(db)
+    user = await repo.get_user_by_id(user_id, include_todos=include == "todos")
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    set_etag(response, etag)
+    return (await _user_views(repo, [user], include))[0]
+
+
+@user_router.get("/{user_id}/todos", response_model=list[TodoRead])
+async def get_todos_by_user(
+    user_id: int,
+    request: Request,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: int | None = Query(None, ge=0),
+    state: TodoState | None = None,
+    deadline_before: date | None = None,
+    deadline_after: date | None = None,
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    etag = user_etag(user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    repo = AsyncTodoRepository(db)
+    todos, next_cursor = await repo.get_todos_page(
+        user_id,
+        limit=limit,
+        after=after,
+        state=state,
+        deadline_before=deadline_before,
+        deadline_after=deadline_after,
+        include_archived=include_archived,
+    )
+    set_etag(response, etag)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return todo_list_response(todos, response)
+
+
+@user_router.get("/{user_id}/todos/search", response_model=list[TodoRead])
+async def search_todos(
+    user_id: int,
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_PAGE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    etag = user_etag(user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    todos, next_offset = await AsyncTodoRepository(db).search_todos(user_id, q, limit=limit, offset=offset)
+    set_etag(response, etag)
+    if next_offset is not None:
+        response.headers["X-Next-Offset"] = str(next_offset)
+    return todo_list_response(todos, response)
+
+
+@user_router.get("/{user_id}/todos/due", response_model=list[TodoRead])
+async def get_due_todos(user_id: int, request: Request, response: Response, days: int = Depends(within_days),
+                        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: AsyncSession = Depends(get_async_read_db)):
+    today = date.today()
+    etag = user_etag(user_id, today)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    todos = await AsyncTodoRepository(db).get_due_todos(user_id, today, days, limit)
+    set_etag(response, etag)
+    return todo_list_response(todos, response)
+
+
+@user_router.get("/{user_id}/todos/overdue", response_model=list[TodoRead])
+async def get_overdue_todos(user_id: int, request: Request, response: Response,
+                            limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+                            db: AsyncSession = Depends(get_async_read_db)):
+    today = date.today()
+    etag = user_etag(user_id, today)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    todos = await AsyncTodoRepository(db).get_overdue_todos(user_id, today, limit)
+    set_etag(response, etag)
+    return todo_list_response(todos, response)
+
+
+@user_router.get("/{user_id}/done_todos", response_model=list[TodoRead])
+async def get_done_todos(user_id: int, request: Request, response: Response, include_archived: bool = False,
+                         db: AsyncSession = Depends(get_async_read_db)):
+    etag = user_etag(user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    repo = AsyncUserRepository(db)
+    todos = await repo.get_done_todos(user_id, include_archived)
+    set_etag(response, etag)
+    return todo_list_response(todos, response)
+
+
+@user_router.get("/{user_id}/open_todos", response_model=list[TodoRead])
+async def get_open_todos(user_id: int, request: Request, response: Response,
+                         db: AsyncSession = Depends(get_async_read_db)):
+    etag = user_etag(user_id)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    repo = AsyncUserRepository(db)
+    todos = await repo.get_open_todos(user_id)
+    set_etag(response, etag)
+    return todo_list_response(todos, response)
+
+@user_router.get("/{user_id}/stats", response_model=UserStats)
+async def get_user_stats(user_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    stats = await AsyncStatsRepository(db).user_stats(user_id, date.today())
+    return UserStats(user_id=user_id, **stats)
+
+@user_router.post("/", response_model=UserSummary)
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db),
+                      idem: Idempotency = Depends(idempotent)):
+    if idem.replay is not None:
+        return idem.replay
+    repo = AsyncUserRepository(db)
+    try:
+        hashed_pw = await hash_password_async(user.password)
+        new_user = await repo.create_user(User(name=user.name, password=hashed_pw))
+        return await idem.remember_async(UserSummary(id=new_user.id, name=new_user.name))
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Username existiert bereits")
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"DB-Fehler: {e.__class__.__name__}")
+
+@user_router.post("/authenticate", response_model=UserSummary | UserRead)
+async def authenticate_user(credentials: UserLogin, include: Include = None,
+                            db: AsyncSession = Depends(get_async_db)):
+    repo = AsyncUserRepository(db)
+    user = await repo.authenticate(credentials.name, credentials.password)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid name or password")
+    if include == "todos":
+        await repo.load_todos(user)
+    return (await _user_views(repo, [user], include))[0]
+
+
+@user_router.post("/login", response_model=TokenResponse)
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    repo = AsyncUserRepository(db)
+    user = await repo.authenticate(credentials.name, credentials.password)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid name or password")
+    return TokenResponse(
+        access_token=create_token(user.id, user.name),
+        expires_in=TOKEN_TTL_SECONDS,
+        user=(await _user_views(repo, [user], None))[0],
+    )
+# ================= TODOS ==================================================
+
+@todo_router.post("/", response_model=TodoRead)
+async def create_todo(todo: TodoCreate, user_id: int, db: AsyncSession = Depends(get_async_db),
+                      idem: Idempotency = Depends(idempotent)):
+    if idem.replay is not None:
+        return idem.replay
+    repo = AsyncTodoRepository(db)
+    todo_db = Todo(**todo.model_dump(), user_id=user_id)
+    try:
+        return await idem.remember_async(TodoRead.model_validate(await repo.create_todo(todo_db)))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="User not found")
+
+
+@todo_router.put("/{todo_id}/state", response_model=TodoRead)
+async def update_todo_state(todo_id: int, new_state: str, request: Request, response: Response,
+                            db: AsyncSession = Depends(get_async_db)):
+    repo = AsyncTodoRepository(db)
+    try:
+        todo = await repo.update_todo_state(todo_id, new_state, if_match_version(request))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    response.headers["ETag"] = todo_etag(todo["version"])
+    return todo
+
+
+@todo_router.delete("/{todo_id}", response_model=bool)
+async def delete_todo(todo_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    repo = AsyncTodoRepository(db)
+    return await repo.delete_todo(todo_id, if_match_version(request))
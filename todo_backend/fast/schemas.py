@@ -1,8 +1,11 @@
 # schemas.py
+import os
 from pydantic import BaseModel,Field,ConfigDict
-from datetime import date
+from datetime import date, datetime
 from model.enums import TodoState
 
+MAX_BATCH_SIZE = int(os.getenv("TODO_BATCH_MAX", "500"))
+
 class TodoBase(BaseModel):
     task: str
     description: str | None = None
@@ -15,8 +18,52 @@ class TodoCreate(TodoBase):
 class TodoRead(TodoBase):
     id: int
     user_id: int
+    version: int  # für If-Match (ETag "v<version>") bei PUT /todos/{id}/state und DELETE
+    updated_at: datetime | None = None  # letzter Write (UTC); DONE + alt genug -> Archiv
 
     model_config = ConfigDict(from_attributes=True) # NEU!!!
+
+class TodoBatchCreate(BaseModel):
+    items: list[TodoCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+class TodoBatchIds(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+class TodoBatchState(TodoBatchIds):
+    state: TodoState
+
+class BatchItemResult(BaseModel):
+    id: int
+    ok: bool
+
+class TodoImport(TodoBase):
+    """Eine NDJSON-Zeile für POST /todos/import (id optional, siehe keep_ids).
+
+    version/updated_at wie exportiert übernehmen; archived_at (Export mit
+    include_archived) -> Zeile kommt wieder nach todos_archive, nur mit keep_ids.
+    """
+    id: int | None = None
+    user_id: int
+    version: int | None = Field(None, ge=1)
+    updated_at: datetime | None = None
+    archived_at: datetime | None = None
+
+class ImportResult(BaseModel):
+    rows: int
+    seconds: float
+    rows_per_sec: float
+class TodoStats(BaseModel):
+    """Aggregierte Zahlen aus einer GROUP BY Query (bzw. todo_counters)."""
+    counts: dict[str, int] = {}
+    total: int = 0
+    overdue: int = 0  # Deadline vor heute und nicht DONE
+    next_deadline: date | None = None  # früheste Deadline ab heute, nicht DONE
+
+class UserStats(TodoStats):
+    user_id: int
+
+class GlobalStats(TodoStats):
+    users: int
 #----------------------- User ------------------------------------------
 class UserBase(BaseModel):
     name: str
@@ -32,5 +79,16 @@ class UserRead(UserBase):
     #     from_attributes = True
     model_config = ConfigDict(from_attributes=True) # NEU!!!
 
+class UserSummary(UserBase):
+    """Kompakte Sicht ohne Todo-Liste: nur Anzahl je State."""
+    id: int
+    counts: dict[str, int] = {}
+
 class UserLogin(UserBase):
-    password: str
\ No newline at end of file
+    password: str
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
+    user: UserSummary
@@ -0,0 +1,128 @@
+# todo_backend/fast/transfer.py
+# NDJSON Export/Import für Backups und Migrationen – Speicherbedarf bleibt
+# unabhängig von der Zeilenzahl konstant (Streaming in beide Richtungen).
+import json
+import logging
+import os
+import time
+from enum import Enum
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+from database.crud import TodoRepository, UnknownUserError
+from database.db_session import SessionLocal, get_engine
+from fast.auth import require_admin
+from fast.schemas import ImportResult, TodoImport
+from model.enums import TodoState
+
+TRANSFER_CHUNK = int(os.getenv("TODO_TRANSFER_CHUNK", "1000"))
+
+logger = logging.getLogger(__name__)
+
+# Export aller User bzw. Bulk-Import: nur mit Authorization: Bearer <ADMIN_TOKEN>
+transfer_router = APIRouter(prefix="/todos", tags=["todos"], dependencies=[Depends(require_admin)])
+
+
+def _json_default(value):
+    if isinstance(value, Enum):
+        return value.value
+    return value.isoformat()  # date, datetime
+
+
+def _export_lines(user_id: int | None, state: TodoState | None, include_archived: bool):
+    # eigene Session: der Stream läuft noch, wenn die Request-Dependencies schon zu sind
+    started, rows = time.perf_counter(), 0
+    with SessionLocal(bind=get_engine()) as db:
+        for row in TodoRepository(db).iter_todos(user_id=user_id, state=state, chunk_size=TRANSFER_CHUNK,
+                                                include_archived=include_archived):
+            rows += 1
+            yield json.dumps(row, default=_json_default, ensure_ascii=False) + "\n"
+    seconds = time.perf_counter() - started
+    logger.info("todo export: %d rows in %.2fs (%.0f rows/s)", rows, seconds, rows / seconds if seconds else 0)
+
+
+@transfer_router.get("/export")
+def export_todos(user_id: int | None = None, state: TodoState | None = None, include_archived: bool = False):
+    """
+    Example URL:
+    GET http://127.0.0.1:8000/todos/export   (Header: Authorization: Bearer <ADMIN_TOKEN>)
+    GET http://127.0.0.1:8000/todos/export?user_id=1&state=DONE
+    GET http://127.0.0.1:8000/todos/export?include_archived=true  (Backup inkl. todos_archive)
+    Eine Zeile JSON pro Todo (application/x-ndjson), mit version und updated_at;
+    archivierte Todos zusätzlich mit archived_at.
+    """
+    return StreamingResponse(_export_lines(user_id, state, include_archived), media_type="application/x-ndjson")
+
+
+def _insert_chunk(rows: list[dict]) -> int:
+    with SessionLocal(bind=get_engine()) as db:
+        return TodoRepository(db).insert_rows(rows)
+
+
+@transfer_router.post("/import", response_model=ImportResult)
+async def import_todos(request: Request, keep_ids: bool = False):
+    """
+    Example URL:
+    POST http://127.0.0.1:8000/todos/import?keep_ids=true   (Header: Authorization: Bearer <ADMIN_TOKEN>)
+    Body: NDJSON wie von /todos/export. Der Body wird zeilenweise gelesen und
+    in Chunks (TODO_TRANSFER_CHUNK) mit je einer Transaktion geschrieben.
+    Bei einer fehlerhaften Zeile bleiben die bereits geschriebenen Chunks erhalten.
+    version/updated_at bleiben wie exportiert; Zeilen mit archived_at landen wieder
+    in todos_archive und brauchen keep_ids=true (ids sind über beide Tabellen eindeutig).
+    """
+    started, imported, line_no = time.perf_counter(), 0, 0
+    exclude = None if keep_ids else {"id"}
+    chunk: list[dict] = []
+    chunk_lines: list[int] = []  # Zeilennummer je Eintrag in chunk
+    buffer = b""
+
+    def failed(line: int, error) -> HTTPException:
+        return HTTPException(status_code=422, detail={"line": line, "error": error, "imported": imported})
+
+    async def flush():
+        nonlocal imported, chunk, chunk_lines
+        try:
+            imported += await run_in_threadpool(_insert_chunk, chunk)
+        except UnknownUserError as e:
+            line = next(n for n, row in zip(chunk_lines, chunk) if row["user_id"] in e.user_ids)
+            raise failed(line, str(e))
+        except IntegrityError:
+            # z.B. doppelte id mit keep_ids=true; der ganze Chunk ist zurückgerollt
+            raise failed(chunk_lines[0], f"Chunk ab Zeile {chunk_lines[0]} verletzt eine Constraint (doppelte id?)")
+        chunk, chunk_lines = [], []
+
+    async def lines():
+        nonlocal buffer
+        async for part in request.stream():
+            buffer += part
+            *complete, buffer = buffer.split(b"\n")
+            for line in complete:
+                yield line
+        if buffer:
+            yield buffer
+
+    async for line in lines():
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            todo = TodoImport.model_validate_json(line)
+        except ValidationError as e:
+            # ohne input/ctx: die enthalten die rohe Zeile (bytes) und sind nicht JSON-serialisierbar
+            raise failed(line_no, e.errors(include_url=False, include_input=False, include_context=False))
+        if todo.archived_at is not None and not keep_ids:
+            raise failed(line_no, "archivierte Todos (archived_at) nur mit keep_ids=true importierbar")
+        chunk.append(todo.model_dump(exclude=exclude))
+        chunk_lines.append(line_no)
+        if len(chunk) >= TRANSFER_CHUNK:
+            await flush()
+    await flush()
+
+    seconds = time.perf_counter() - started
+    rows_per_sec = imported / seconds if seconds else 0.0
+    logger.info("todo import: %d rows in %.2fs (%.0f rows/s)", imported, seconds, rows_per_sec)
+    return ImportResult(rows=imported, seconds=round(seconds, 3), rows_per_sec=round(rows_per_sec, 1))
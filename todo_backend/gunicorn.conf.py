@@ -0,0 +1,103 @@
+# todo_backend/gunicorn.conf.py
+# Produktiv-Start mit mehreren Prozessen (start.sh): gunicorn als Master,
+# UvicornWorker als Worker – Request-Parsing, Serialisierung und bcrypt
+# verteilen sich so auf alle Kerne.
+#
+#   gunicorn app.main:app -c gunicorn.conf.py
+#
+# Worker-Anzahl: WEB_CONCURRENCY, sonst CPUs (Affinity bzw. cgroup-Quota des
+# Containers) mal WORKERS_PER_CPU. Die App wird im Master importiert (preload),
+# Engines/Pools entstehen erst im Lifespan der Worker; was trotzdem vor dem
+# fork existiert, setzen die os.register_at_fork-Hooks in database/ zurück.
+#
+# Worker-Recycling: nach GUNICORN_MAX_REQUESTS (+ Jitter, damit nicht alle
+# gleichzeitig) beendet sich ein Worker nach den laufenden Requests, der
+# Master startet sofort einen neuen – die anderen nehmen solange an.
+# `kill -HUP <master>` tauscht alle Worker ebenso nacheinander aus.
+import math
+import os
+
+try:
+    import uvicorn_worker  # noqa: F401  # pip install uvicorn-worker
+    _worker_class = "uvicorn_worker.UvicornWorker"
+except ImportError:
+    _worker_class = "uvicorn.workers.UvicornWorker"  # ältere uvicorn-Versionen
+
+
+def cgroup_cpus() -> float | None:
+    """CPU-Quota des Containers (cgroup v2 cpu.max bzw. v1 cfs_quota/period), None = unbegrenzt."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> float:
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota = cgroup_cpus()
+    return min(cpus, quota) if quota else cpus
+
+
+def default_workers() -> int:
+    per_cpu = float(os.getenv("WORKERS_PER_CPU", "1"))
+    return max(math.ceil(available_cpus() * per_cpu), 1)
+
+
+workers = int(os.getenv("WEB_CONCURRENCY") or default_workers())
+worker_class = _worker_class
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))  # 0 = nie recyceln
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", str(max_requests // 10)))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))                # hängender Worker -> neu starten
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))  # laufende Requests (SSE-Streams brechen ab)
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None  # "" = aus
+
+# Für die App (database/db_session.py teilt DB_CONNECTION_BUDGET durch die Worker).
+# Mehrere Worker: Prozess-lokale Zustände passen nicht mehr zusammen – Defaults, die
+# über Worker hinweg stimmen, sofern nicht explizit gesetzt:
+#   TODO_CACHE=off          Invalidierung ist pro Prozess (sonst redis); ohne redis
+#                           auch keine User-ETags/304 (fast/etag.py)
+#   IDEMPOTENCY_STORE=db    Keys müssen jeder Worker sehen
+#   BCRYPT_WORKERS=0        die Worker sind schon die Prozesse für bcrypt
+# Der SSE-Bus (/todos/events) bleibt pro Worker: Streams sehen nur Writes ihres
+# Workers, Clients laden deshalb regelmäßig neu (Header X-Event-Workers); exakte
+# Live-Deltas nur mit einem Worker oder Sticky Sessions pro User.
+os.environ["WEB_CONCURRENCY"] = str(workers)
+if workers > 1:
+    os.environ.setdefault("TODO_CACHE", "off")
+    os.environ.setdefault("IDEMPOTENCY_STORE", "db")
+    os.environ.setdefault("BCRYPT_WORKERS", "0")
+
+
+def when_ready(server):
+    from database.db_session import DB_CONNECTION_BUDGET, DB_MAX_OVERFLOW, DB_POOL_SIZE, SYNC_POOL_RESERVED
+
+    server.log.info(
+        "%d workers (%.1f cpus), pool per worker %d + %d overflow%s%s, max_requests %d (+0..%d)",
+        workers, available_cpus(), DB_POOL_SIZE, DB_MAX_OVERFLOW,
+        f" + sync pool {SYNC_POOL_RESERVED}" if SYNC_POOL_RESERVED else "",
+        f" (budget {DB_CONNECTION_BUDGET})" if DB_CONNECTION_BUDGET else "",
+        max_requests, max_requests_jitter,
+    )
+    per_worker = DB_POOL_SIZE + DB_MAX_OVERFLOW + SYNC_POOL_RESERVED
+    if DB_CONNECTION_BUDGET and workers * per_worker > DB_CONNECTION_BUDGET:
+        server.log.warning("DB_CONNECTION_BUDGET %d too small: %d workers need %d",
+                           DB_CONNECTION_BUDGET, workers, workers * per_worker)
+    if workers > 1 and os.environ.get("TODO_CACHE") != "redis":
+        server.log.info("%d workers without TODO_CACHE=redis: no user ETags, If-None-Match always gets 200", workers)
+    if workers > 1:
+        server.log.warning("%d workers: SSE events are per worker, clients fall back to periodic reloads "
+                           "(use one worker or sticky sessions for exact live updates)", workers)
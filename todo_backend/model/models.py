@@ -1,5 +1,6 @@
 
-from sqlalchemy import Column, Integer, String, Text, Date, Enum, ForeignKey
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Enum, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database.db_session import Base
 from model.enums import TodoState
@@ -17,6 +18,10 @@ class BaseRepr:
         )
         return f"<{self.__class__.__name__}({fields})>"
 
+def utcnow() -> datetime:
+    """Zeitstempel für DateTime-Spalten: UTC ohne tzinfo (MySQL DATETIME kennt keine Zeitzone)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 class Todo(Base, BaseRepr):
     __tablename__="todos"
     id=Column(Integer,primary_key=True)
@@ -24,14 +29,81 @@ class Todo(Base, BaseRepr):
     description=Column(Text)
     deadline=Column(Date)
     state= Column(Enum(TodoState),nullable=False,default="OPEN")
+    # Optimistic Locking: jeder Write erhöht die version, If-Match prüft sie im UPDATE … WHERE
+    version=Column(Integer,nullable=False,default=1,server_default="1")
+    # letzter Write (onupdate greift auch bei Core-UPDATEs); Archivierung erledigter Todos
+    updated_at=Column(DateTime,default=utcnow,onupdate=utcnow)
     #  user_id,  evtl. user
 
     user_id=Column(Integer, ForeignKey("users.id"),nullable=False)
     user = relationship("User",back_populates="todos") # User-> Klasse
 
+    __table_args__ = (
+        # Keyset-Pagination: WHERE user_id=? AND id > ? ORDER BY id (ohne state-Filter) …
+        Index("ix_todos_user_id", "user_id", "id"),
+        # … und WHERE user_id=? AND state=? AND id > ? ORDER BY id
+        Index("ix_todos_user_state_id", "user_id", "state", "id"),
+        # Stats: GROUP BY user_id, state mit overdue/next_deadline – nur aus dem Index
+        Index("ix_todos_user_state_deadline", "user_id", "state", "deadline"),
+        # /users/{id}/todos/due und /overdue: Range über die Deadline eines Users
+        Index("ix_todos_user_deadline", "user_id", "deadline"),
+        # Reminder-Sweeper: Keyset (deadline, id) über alle User
+        Index("ix_todos_deadline_id", "deadline", "id"),
+        # Archivierung: WHERE state = 'DONE' AND updated_at < ? ORDER BY updated_at
+        Index("ix_todos_state_updated", "state", "updated_at"),
+    )
+
+class TodoArchive(Base, BaseRepr):
+    """Erledigte Todos nach ARCHIVE_AFTER_DAYS (app/archiver.py) – gleiche Spalten wie todos + archived_at.
+
+    Ohne Foreign Key und mit nur einem Index, damit das Verschieben billig bleibt.
+    """
+    __tablename__="todos_archive"
+    id=Column(Integer,primary_key=True,autoincrement=False)  # id aus todos
+    task=Column(String(100),nullable=False)
+    description=Column(Text)
+    deadline=Column(Date)
+    state=Column(Enum(TodoState),nullable=False)
+    version=Column(Integer,nullable=False)
+    updated_at=Column(DateTime)
+    user_id=Column(Integer,nullable=False)
+    archived_at=Column(DateTime,nullable=False)
+
+    __table_args__ = (
+        # include_archived: WHERE user_id=? [AND state=?] AND id > ? ORDER BY id
+        Index("ix_todos_archive_user_id", "user_id", "id"),
+    )
+
 class User(Base,BaseRepr):
     __tablename__="users" 
     id=Column(Integer,primary_key=True)
-    name=Column(String(100),nullable=False)
+    name=Column(String(100),nullable=False,unique=True,index=True) # Login-Lookup
     password=Column(String(100),nullable=False) # FIXME Verschlüsselung
-    todos = relationship("Todo",back_populates="user")
\ No newline at end of file
+    todos = relationship("Todo",back_populates="user",order_by="Todo.id")
+
+
+class TodoCounter(Base, BaseRepr):
+    """Anzahl Todos je User und State (STATS_COUNTERS=1), gepflegt von den Writes im TodoRepository."""
+    __tablename__="todo_counters"
+    user_id=Column(Integer, ForeignKey("users.id"),primary_key=True)
+    state=Column(String(20),primary_key=True)
+    n=Column(Integer,nullable=False,default=0)
+
+
+class SweeperState(Base, BaseRepr):
+    """High-Water-Mark des Reminder-Sweepers (app/reminders.py)."""
+    __tablename__="sweeper_state"
+    name=Column(String(50),primary_key=True)
+    deadline=Column(Date,nullable=False)  # zuletzt verarbeitetes (deadline, todo_id)
+    todo_id=Column(Integer,nullable=False)
+    max_id=Column(Integer,nullable=False)  # höchste Todo-id beim letzten Sweep (für nachträglich angelegte)
+
+
+class IdempotencyKey(Base, BaseRepr):
+    """Gespeicherte Antworten für Idempotency-Key (IDEMPOTENCY_STORE=db)."""
+    __tablename__="idempotency_keys"
+    key=Column(String(255),primary_key=True)  # "<scope>:<Header-Wert>"
+    fingerprint=Column(String(64),nullable=False)  # sha256 über Methode, Query und Body
+    status_code=Column(Integer)  # NULL = Request läuft noch
+    body=Column(Text)
+    expires_at=Column(Float,nullable=False,index=True)  # Unix-Zeit
@@ -0,0 +1,70 @@
+# todo_backend/monitoring/db.py
+# SQLAlchemy-Hooks: Anzahl/Dauer der Statements pro Route und Pool-Status.
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from monitoring.metrics import (
+    DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT, DB_POOL_OVERFLOW, DB_POOL_SIZE, DB_QUERIES, DB_QUERY_LATENCY,
+)
+from monitoring.middleware import current_request
+
+
+class _TimedCheckout:
+    """Misst die Wartezeit auf eine Connection (inkl. Neuaufbau)."""
+    metrics_label = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - started, engine=self.metrics_label)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def _operation(statement: str) -> str:
+    return statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "?"
+
+
+def instrument_engine(engine: Engine, label: str = "primary") -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = current_request.get()
+        route = stats.route if stats else "<background>"
+        if stats:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+            if stats.profile is not None:
+                stats.profile.record(conn, cursor, statement, parameters, context, executemany, elapsed)
+        operation = _operation(statement)
+        DB_QUERIES.inc(route=route, operation=operation)
+        DB_QUERY_LATENCY.observe(elapsed, route=route, operation=operation)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+    pool = engine.pool
+    if isinstance(pool, _TimedCheckout):
+        pool.metrics_label = label
+    if isinstance(pool, QueuePool):
+        DB_POOL_CHECKED_OUT.set_function(pool.checkedout, engine=label)
+        DB_POOL_OVERFLOW.set_function(lambda: max(pool.overflow(), 0), engine=label)
+        DB_POOL_SIZE.set_function(pool.size, engine=label)
@@ -0,0 +1,170 @@
+# todo_backend/monitoring/metrics.py
+# Kleine Prometheus-Metriken ohne Zusatz-Abhängigkeit, Ausgabe im Text-Format
+# unter GET /metrics. Alle Werte gelten pro Prozess.
+import threading
+from typing import Callable
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self):
+        return [f"{self.name}{_labels(self.labelnames, k)} {v}" for k, v in list(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class CallbackGauge(_Metric):
+    """Wert wird erst beim Scrape abgefragt (z.B. Pool-Status)."""
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._callbacks: dict[tuple, Callable[[], float]] = {}
+
+    def set_function(self, fn: Callable[[], float], **labels) -> None:
+        self._callbacks[self._key(labels)] = fn
+
+    def _samples(self):
+        return [f"{self.name}{_labels(self.labelnames, k)} {fn()}" for k, fn in list(self._callbacks.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._values: dict[tuple, list] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def _samples(self):
+        lines = []
+        for key, data in list(self._values.items()):
+            for bound, n in zip(self.buckets, data):
+                le = _labels(self.labelnames, key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{le} {n}")
+            le = _labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {data[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {data[-2]}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {data[-1]}")
+        return lines
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+# ---- HTTP ----
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+
+# ---- DB ----
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed", ("route", "operation"))
+DB_QUERY_LATENCY = Histogram("db_query_duration_seconds", "SQL statement latency", ("route", "operation"))
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "SQL statements per HTTP request", ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TIME_PER_REQUEST = Histogram("db_time_per_request_seconds", "SQL time per HTTP request", ("route",))
+DB_POOL_CHECKOUT = Histogram("db_pool_checkout_seconds", "Time to get a connection from the pool", ("engine",))
+DB_POOL_CHECKED_OUT = CallbackGauge("db_pool_checked_out", "Connections currently checked out", ("engine",))
+DB_POOL_OVERFLOW = CallbackGauge("db_pool_overflow", "Connections above pool_size", ("engine",))
+DB_POOL_SIZE = CallbackGauge("db_pool_size", "Configured pool_size", ("engine",))
+DB_READ_SESSIONS = Counter("db_read_sessions_total", "Sessions from get_read_db by engine", ("engine",))
+SQL_PROFILES = Counter("sql_profiled_requests_total", "Requests with SQL profiling", ("reason",))
+SQL_SLOW = Counter("sql_profile_slow_queries_total", "Profiled statements over SQL_SLOW_MS", ("operation",))
+SQL_REPEATED = Counter("sql_profile_repeated_statements_total", "Profiled statements repeated per request (N+1)", ("route",))
+
+# ---- bcrypt ----
+BCRYPT_LATENCY = Histogram("bcrypt_duration_seconds", "bcrypt hash/verify incl. queueing", ("op",))
+BCRYPT_REJECTED = Counter("bcrypt_rejected_total", "bcrypt jobs rejected (pool saturated)")
+
+# ---- Reminder-Sweeper ----
+REMINDER_SWEEP_SECONDS = Histogram("reminder_sweep_duration_seconds", "Duration of one reminder sweep")
+REMINDER_TODOS = Counter("reminder_todos_total", "Todos handed to the reminder sink", ("kind",))
+REMINDER_ERRORS = Counter("reminder_errors_total", "Failed reminder sweeps")
+
+# ---- Archivierung ----
+ARCHIVE_ROWS = Counter("todo_archive_rows_total", "Todos moved to todos_archive")
+ARCHIVE_BATCH_SECONDS = Histogram("todo_archive_batch_duration_seconds", "Duration of one archive batch")
+ARCHIVE_ERRORS = Counter("todo_archive_errors_total", "Failed archive runs")
+DB_TABLE_ROWS = CallbackGauge("db_table_rows", "Rows per table (estimate where the DB has one)", ("table",))
+
+# ---- Todo-Events (SSE) ----
+TODO_EVENTS = Counter("todo_events_total", "Todo change events published", ("type",))
+EVENT_SUBSCRIBERS = Gauge("todo_event_subscribers", "Open todo event streams")
+EVENT_RESETS = Counter("todo_event_resets_total", "Streams told to reload the full list", ("reason",))
+
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
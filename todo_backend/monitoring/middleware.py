@@ -0,0 +1,68 @@
+# todo_backend/monitoring/middleware.py
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from monitoring.metrics import (
+    DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST, HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS,
+)
+from monitoring.profiler import SqlProfile, start_profile
+
+
+@dataclass
+class RequestStats:
+    """Pro Request; wird im Threadpool mutiert (ContextVar-Werte wandern mit, Zuweisungen nicht)."""
+    scope: dict
+    queries: int = 0
+    db_seconds: float = 0.0
+    extra: dict = field(default_factory=dict)
+    profile: SqlProfile | None = None  # SQL-Profil (monitoring/profiler.py), nur wenn angefordert
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", "<unmatched>")
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class MetricsMiddleware:
+    """Reines ASGI-Middleware: Latenz, Status und In-Flight pro Route-Template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope, profile=start_profile(scope))
+        token = current_request.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if stats.profile is not None:
+                    # Stand bei Antwortbeginn; bei Streams laufen danach evtl. noch Queries (-> Log)
+                    timing = stats.profile.server_timing().encode("latin-1")
+                    message = {**message, "headers": [*message.get("headers", ()), (b"server-timing", timing)]}
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            current_request.reset(token)
+            route = stats.route  # Router hat scope["route"] inzwischen gesetzt
+            method = scope["method"]
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+            DB_QUERIES_PER_REQUEST.observe(stats.queries, route=route)
+            DB_TIME_PER_REQUEST.observe(stats.db_seconds, route=route)
+            if stats.profile is not None:
+                stats.profile.finish(method, scope["path"], route, status)
@@ -0,0 +1,190 @@
+# todo_backend/monitoring/profiler.py
+# SQL-Profil pro Request (Debug): alle Statements mit Parameter-Form (nur
+# Typen, keine Werte), Dauer und Zeilenzahl. Eingeschaltet pro Request per
+#   X-SQL-Profile: <SQL_PROFILE_TOKEN bzw. ADMIN_TOKEN>
+# oder global für einen Anteil SQL_PROFILE_SAMPLE der Requests.
+#
+# Im Profil:
+#   * Statements über SQL_SLOW_MS bekommen ein EXPLAIN (nur SELECT, über den
+#     DBAPI-Cursor derselben Connection – läuft an den Engine-Hooks vorbei)
+#   * gleiche Statements >= SQL_REPEAT_THRESHOLD mal pro Request -> N+1-Verdacht
+#     (z. B. Lazy Load von User.todos in einer Schleife)
+#   * Zusammenfassung im Header Server-Timing, Details als eine JSON-Zeile im
+#     Log (logger monitoring.profiler), wenn es langsame/wiederholte Statements
+#     gab oder das Profil per Header angefordert wurde
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import time
+from dataclasses import dataclass, field
+
+from monitoring.metrics import SQL_PROFILES, SQL_REPEATED, SQL_SLOW
+
+SQL_PROFILE_SAMPLE = float(os.getenv("SQL_PROFILE_SAMPLE", "0"))      # Anteil der Requests, 0..1
+SQL_PROFILE_TOKEN = os.getenv("SQL_PROFILE_TOKEN") or os.getenv("ADMIN_TOKEN")  # ohne: Header aus
+SQL_SLOW_MS = float(os.getenv("SQL_SLOW_MS", "100"))                  # ab hier EXPLAIN + Slow-Log
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))    # gleiche Statements pro Request
+SQL_EXPLAIN = os.getenv("SQL_EXPLAIN", "1") == "1"
+SQL_PROFILE_MAX = int(os.getenv("SQL_PROFILE_MAX", "500"))            # Statements mit Details pro Request
+
+PROFILE_HEADER = b"x-sql-profile"
+EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "mysql": "EXPLAIN ", "mariadb": "EXPLAIN ", "postgresql": "EXPLAIN "}
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%s|:\w+|\$\d+)\s*,)+\s*(?:\?|%s|:\w+|\$\d+)\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """Gleiche Statements gleich schreiben: Whitespace, IN-Listen beliebiger Länge."""
+    return _IN_LIST.sub("(…)", _SPACE.sub(" ", statement).strip())
+
+
+def params_shape(parameters, executemany: bool = False) -> str:
+    """Form der Parameter ohne Werte: (int, str) bzw. {user_id: int} bzw. 3x (…)."""
+    if executemany:
+        return f"{len(parameters)}x {params_shape(parameters[0])}" if parameters else "0x"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in parameters or ()) + ")"
+
+
+def explain(conn, statement: str, parameters) -> list:
+    """EXPLAIN über einen eigenen DBAPI-Cursor; Fehler landen im Ergebnis statt im Request."""
+    dialect = conn.dialect.name
+    prefix = EXPLAIN_PREFIX.get(dialect)
+    if prefix is None:
+        return [f"EXPLAIN für {dialect} nicht unterstützt"]
+    cursor = conn.connection.cursor()
+    try:
+        if dialect == "postgresql":  # ein Fehler bräche sonst die ganze Transaktion ab
+            cursor.execute("SAVEPOINT sql_profile_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            columns = [d[0] for d in cursor.description]
+            rows = cursor.fetchall()
+        except Exception as e:
+            if dialect == "postgresql":
+                cursor.execute("ROLLBACK TO SAVEPOINT sql_profile_explain")
+            return [f"EXPLAIN fehlgeschlagen: {e.__class__.__name__}: {e}"]
+        if dialect == "postgresql":
+            cursor.execute("RELEASE SAVEPOINT sql_profile_explain")
+    finally:
+        cursor.close()
+    if "detail" in columns:  # SQLite: nur der Plan-Text
+        return [row[columns.index("detail")] for row in rows]
+    if len(columns) == 1:    # PostgreSQL: eine Textzeile pro Plan-Knoten
+        return [row[0] for row in rows]
+    return [dict(zip(columns, row)) for row in rows]
+
+
+@dataclass
+class QueryRecord:
+    statement: str
+    params: str
+    ms: float
+    rows: int | None
+    explain: list | None = None
+
+
+@dataclass
+class SqlProfile:
+    reason: str  # header | sample
+    started: float = field(default_factory=time.perf_counter)
+    queries: list[QueryRecord] = field(default_factory=list)
+    count: int = 0
+    db_seconds: float = 0.0
+    explain_seconds: float = 0.0
+    slow: int = 0
+    # normalisiertes Statement -> [Anzahl, Sekunden]
+    by_statement: dict[str, list] = field(default_factory=dict)
+
+    def record(self, conn, cursor, statement: str, parameters, context, executemany: bool, elapsed: float) -> None:
+        """Aus after_cursor_execute (monitoring/db.py)."""
+        self.count += 1
+        self.db_seconds += elapsed
+        key = normalize(statement)
+        entry = self.by_statement.setdefault(key, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+        if len(self.queries) >= SQL_PROFILE_MAX:
+            return
+        rows = cursor.rowcount if cursor.rowcount >= 0 else None  # SELECT: je nach Treiber unbekannt
+        record = QueryRecord(key, params_shape(parameters, executemany), round(elapsed * 1000, 3), rows)
+        if elapsed * 1000 >= SQL_SLOW_MS:
+            operation = key.split(" ", 1)[0].upper()
+            self.slow += 1
+            SQL_SLOW.inc(operation=operation)
+            # Streaming-Cursor (yield_per) nicht stören: dort ist die Connection noch belegt
+            streaming = context is not None and context.execution_options.get("stream_results")
+            if SQL_EXPLAIN and not executemany and not streaming and operation in ("SELECT", "WITH"):
+                t0 = time.perf_counter()
+                record.explain = explain(conn, statement, parameters)
+                self.explain_seconds += time.perf_counter() - t0
+        self.queries.append(record)
+
+    def repeated(self) -> list[dict]:
+        return sorted(
+            ({"statement": key, "count": count, "ms": round(seconds * 1000, 3)}
+             for key, (count, seconds) in self.by_statement.items() if count >= SQL_REPEAT_THRESHOLD),
+            key=lambda r: -r["count"],
+        )
+
+    def server_timing(self) -> str:
+        """Header-Wert; Zeiten in ms, desc ohne SQL-Text."""
+        parts = [
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.count} queries"',
+            f"app;dur={(time.perf_counter() - self.started) * 1000:.1f}",
+        ]
+        if self.queries:
+            slowest = max(self.queries, key=lambda r: r.ms)
+            parts.append(f'db-max;dur={slowest.ms:.1f};desc="{slowest.statement.split(" ", 1)[0].upper()}"')
+        if self.slow:
+            parts.append(f'db-slow;desc="{self.slow} over {SQL_SLOW_MS:g}ms"')
+        if repeated := self.repeated():
+            parts.append(f'db-repeat;desc="{len(repeated)} statements, max {repeated[0]["count"]}x"')
+        if self.explain_seconds:
+            parts.append(f"explain;dur={self.explain_seconds * 1000:.1f}")
+        return ", ".join(parts)
+
+    def finish(self, method: str, path: str, route: str, status: int) -> None:
+        """Ende des Requests: Metriken und ggf. eine JSON-Zeile ins Log."""
+        repeated = self.repeated()
+        if repeated:
+            SQL_REPEATED.inc(len(repeated), route=route)
+        if not (self.slow or repeated or self.reason == "header"):
+            return
+        summary = {
+            "method": method,
+            "path": path,
+            "route": route,
+            "status": status,
+            "reason": self.reason,
+            "ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "db_ms": round(self.db_seconds * 1000, 3),
+            "queries": self.count,
+            "slow": [vars(r) for r in self.queries if r.ms >= SQL_SLOW_MS],
+            "repeated": repeated,
+        }
+        if self.reason == "header":
+            summary["statements"] = [vars(r) for r in self.queries]
+        logger.warning("sql profile %s", json.dumps(summary, default=str, ensure_ascii=False))
+
+
+def start_profile(scope: dict) -> SqlProfile | None:
+    """Vom MetricsMiddleware pro HTTP-Request: Header mit gültigem Token oder Stichprobe."""
+    if SQL_PROFILE_TOKEN:
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER:
+                if secrets.compare_digest(value, SQL_PROFILE_TOKEN.encode()):
+                    SQL_PROFILES.inc(reason="header")
+                    return SqlProfile("header")
+                break
+    if SQL_PROFILE_SAMPLE > 0 and random.random() < SQL_PROFILE_SAMPLE:
+        SQL_PROFILES.inc(reason="sample")
+        return SqlProfile("sample")
+    return None
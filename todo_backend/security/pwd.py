@@ -1,12 +1,109 @@
+import asyncio
+import os
+import threading
+import time
+
 import bcrypt
 
-def hash_password(password:str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'),bcrypt.gensalt()).decode('utf-8')
+from monitoring.metrics import BCRYPT_LATENCY, BCRYPT_REJECTED
+
+# bcrypt ist reine CPU-Arbeit (~250 ms bei cost 12) – läuft deshalb in einem
+# eigenen, begrenzten Prozess-Pool statt im Threadpool von FastAPI.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "2"))        # 0 = inline, ohne Pool
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "16"))  # laufend + wartend
+BCRYPT_RETRY_AFTER = int(os.getenv("BCRYPT_RETRY_AFTER", "2"))   # Sekunden
+
+
+class PasswordHasherBusy(Exception):
+    """Hash-Pool ist ausgelastet – Router antwortet mit 503 + Retry-After."""
+
+    def __init__(self, retry_after: int = BCRYPT_RETRY_AFTER):
+        super().__init__("password hasher saturated")
+        self.retry_after = retry_after
+
+
+_pool = None  # ProcessPoolExecutor
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(BCRYPT_MAX_PENDING, 1))
+
+
+def _get_pool():
+    """Pool erst beim ersten Hash starten (nicht beim Import)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                _pool = ProcessPoolExecutor(
+                    max_workers=BCRYPT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _hashpw(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def _run(fn, *args):
+    started = time.perf_counter()
+    try:
+        if BCRYPT_WORKERS <= 0:
+            return fn(*args)
+        # Admission Control: lieber sofort 503 als alle Threads blockieren
+        if not _slots.acquire(blocking=False):
+            BCRYPT_REJECTED.inc()
+            raise PasswordHasherBusy()
+        try:
+            return _get_pool().submit(fn, *args).result()
+        finally:
+            _slots.release()
+    finally:
+        BCRYPT_LATENCY.observe(time.perf_counter() - started, op=fn.__name__.strip("_"))
+
+
+async def _run_async(fn, *args):
+    started = time.perf_counter()
+    try:
+        if BCRYPT_WORKERS <= 0:
+            return await asyncio.to_thread(fn, *args)
+        if not _slots.acquire(blocking=False):
+            BCRYPT_REJECTED.inc()
+            raise PasswordHasherBusy()
+        try:
+            return await asyncio.wrap_future(_get_pool().submit(fn, *args))
+        finally:
+            _slots.release()
+    finally:
+        BCRYPT_LATENCY.observe(time.perf_counter() - started, op=fn.__name__.strip("_"))
+
+
+def hash_password(password: str) -> str:
+    return _run(_hashpw, password.encode('utf-8'), BCRYPT_ROUNDS).decode('utf-8')
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    return _run(_checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+async def hash_password_async(password: str) -> str:
+    return (await _run_async(_hashpw, password.encode('utf-8'), BCRYPT_ROUNDS)).decode('utf-8')
 
-def verify_password(password:str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'),hashed.encode('utf-8'))
 
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _run_async(_checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
 
-text=hash_password("123")
 
-print(verify_password("123",text))
\ No newline at end of file
+def needs_rehash(hashed: str) -> bool:
+    """True, wenn der Hash mit einem anderen Cost-Faktor als BCRYPT_ROUNDS erzeugt wurde."""
+    try:
+        return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
@@ -0,0 +1,61 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from dataclasses import dataclass
+
+# Signierte Access-Tokens (HMAC-SHA256): Prüfung ohne DB und ohne bcrypt.
+# Ohne TOKEN_SECRET gilt ein Zufalls-Secret pro Prozess – Tokens überleben
+# dann keinen Neustart und gelten nicht über mehrere Worker hinweg.
+TOKEN_SECRET = (os.getenv("TOKEN_SECRET") or secrets.token_urlsafe(32)).encode("utf-8")
+TOKEN_TTL_SECONDS = int(os.getenv("TOKEN_TTL_SECONDS", str(12 * 3600)))
+
+
+class TokenError(Exception):
+    """Token fehlt, ist manipuliert oder abgelaufen."""
+
+
+@dataclass(frozen=True)
+class TokenUser:
+    id: int
+    name: str
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(TOKEN_SECRET, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def create_token(user_id: int, name: str, ttl: int = TOKEN_TTL_SECONDS) -> str:
+    claims = {"sub": user_id, "name": name, "exp": int(time.time()) + ttl}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify_token(token: str) -> TokenUser:
+    # Header kommen als latin-1 an; nicht-ASCII kann kein gültiges Token sein (und _sign kodiert ASCII)
+    if not token.isascii():
+        raise TokenError("malformed token")
+    try:
+        payload, signature = token.split(".", 1)
+    except ValueError:
+        raise TokenError("malformed token")
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise TokenError("bad signature")
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        raise TokenError("malformed token")
+    if claims.get("exp", 0) < time.time():
+        raise TokenError("token expired")
+    return TokenUser(id=claims["sub"], name=claims["name"])
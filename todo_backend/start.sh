@@ -1,4 +1,8 @@
 #!/usr/bin/env bash
 set -euo pipefail
-uvicorn app.main:app --host 0.0.0.0 --port $PORT
-
+# gunicorn + UvicornWorker, Worker-Anzahl/Pools siehe gunicorn.conf.py;
+# SERVER=uvicorn startet wie früher einen einzelnen Prozess (z.B. wenig RAM)
+if [ "${SERVER:-gunicorn}" = "uvicorn" ]; then
+  exec uvicorn app.main:app --host 0.0.0.0 --port $PORT
+fi
+exec gunicorn app.main:app -c gunicorn.conf.py
@@ -0,0 +1,83 @@
+# todo_backend/tests/conftest.py
+# App gegen eine frische SQLite-Datei; Env vor dem ersten Import setzen
+# (db_session, cache & Co. lesen sie beim Import).
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+_tmp = tempfile.mkdtemp(prefix="todo-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_tmp}/test.db",
+    TODO_CACHE="off",          # Query-Zahlen ohne Cache-Treffer
+    IDEMPOTENCY_STORE="memory",
+    REMINDER_SWEEPER="0",
+    ARCHIVER="0",
+    BCRYPT_WORKERS="0",
+    BCRYPT_ROUNDS="4",
+    DB_ASYNC="0",
+    ADMIN_TOKEN="test-admin",
+)
+os.environ.pop("DATABASE_READ_URLS", None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from database.db_session import get_engine
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        while client.get("/readyz").status_code != 200:
+            time.sleep(0.05)
+        yield client
+
+
+@pytest.fixture
+def admin():
+    return {"Authorization": "Bearer test-admin"}
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries():
+    """with count_queries() as queries: … -> len(queries) Statements auf der Engine."""
+
+    @contextmanager
+    def counting():
+        counter = QueryCounter()
+
+        def before(conn, cursor, statement, parameters, context, executemany):
+            counter.statements.append(statement)
+
+        engine = get_engine()
+        event.listen(engine, "before_cursor_execute", before)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, "before_cursor_execute", before)
+
+    return counting
+
+
+@pytest.fixture(scope="session")
+def users(client):
+    """Drei User mit je vier Todos (zwei OPEN, zwei DONE) -> Liste der ids."""
+    ids = []
+    for i in range(3):
+        user = client.post("/users/", json={"name": f"user{i}", "password": "geheim123"}).raise_for_status().json()
+        for j in range(4):
+            client.post("/todos/", params={"user_id": user["id"]},
+                        json={"task": f"t{j}", "state": "DONE" if j % 2 else "OPEN"}).raise_for_status()
+        ids.append(user["id"])
+    return ids
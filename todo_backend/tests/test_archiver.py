@@ -0,0 +1,121 @@
+# todo_backend/tests/test_archiver.py
+# Archivierung: alte DONE-Todos wandern in Batches nach todos_archive,
+# ?include_archived=true liest beide Tabellen, Batches sperren mit SKIP LOCKED.
+import itertools
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects import mysql
+
+import app.archiver as archiver
+from app.archiver import TodoArchiver
+from database.crud import TodoRepository
+from database.db_session import SessionLocal, get_engine
+from model.models import Todo, TodoArchive, utcnow
+from monitoring.metrics import render
+
+OLD = datetime(1990, 1, 1)
+# nur Todos vor 1995 sind "alt genug" – Todos anderer Tests bleiben liegen
+AFTER_DAYS = (utcnow() - datetime(1995, 1, 1)).days
+_names = itertools.count()
+
+
+@pytest.fixture
+def archive_user(client):
+    """User mit 5 alten DONE-, einem frischen DONE- und einem alten OPEN-Todo."""
+    user = client.post("/users/", json={"name": f"archiv{next(_names)}", "password": "geheim123"})
+    user_id = user.raise_for_status().json()["id"]
+    ids = {}
+    for name, state in [*((f"alt{i}", "DONE") for i in range(5)), ("frisch", "DONE"), ("offen", "OPEN")]:
+        todo = client.post("/todos/", params={"user_id": user_id}, json={"task": name, "state": state})
+        ids[name] = todo.raise_for_status().json()["id"]
+    with SessionLocal(bind=get_engine()) as db:
+        old = [todo_id for name, todo_id in ids.items() if name != "frisch"]
+        db.execute(update(Todo).where(Todo.id.in_(old)).values(updated_at=OLD))
+        db.commit()
+    return user_id, ids
+
+
+def _tables(user_id: int) -> tuple[set[int], set[int]]:
+    with SessionLocal(bind=get_engine()) as db:
+        hot = set(db.scalars(select(Todo.id).where(Todo.user_id == user_id)))
+        cold = set(db.scalars(select(TodoArchive.id).where(TodoArchive.user_id == user_id)))
+    return hot, cold
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(archiver.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_archive_moves_old_done_todos_in_batches(client, archive_user, sleeps):
+    user_id, ids = archive_user
+    moved = TodoArchiver(after_days=AFTER_DAYS, batch_size=2, pause=0.5).archive()
+    assert moved == 5
+    assert len(sleeps) == 3 and all(s >= 0.5 for s in sleeps)  # Pause nach jedem Batch
+    hot, cold = _tables(user_id)
+    assert cold == {ids[f"alt{i}"] for i in range(5)}
+    assert hot == {ids["frisch"], ids["offen"]}
+    # zweiter Lauf findet nichts mehr
+    assert TodoArchiver(after_days=AFTER_DAYS).archive() == 0
+
+
+def test_archive_respects_max_per_tick(client, archive_user, sleeps):
+    user_id, _ = archive_user
+    arch = TodoArchiver(after_days=AFTER_DAYS, batch_size=2, max_per_tick=3, pause=0)
+    assert arch.archive() == 3
+    assert arch.last_run["rows"] == 3
+    assert len(_tables(user_id)[1]) == 3
+    assert arch.archive() == 2  # der nächste Tick macht weiter
+
+
+def test_newest_todo_is_never_archived(client, sleeps):
+    user = client.post("/users/", json={"name": "neuester", "password": "geheim123"}).raise_for_status().json()
+    todo = client.post("/todos/", params={"user_id": user["id"]}, json={"task": "x", "state": "DONE"}).json()
+    with SessionLocal(bind=get_engine()) as db:
+        db.execute(update(Todo).where(Todo.id == todo["id"]).values(updated_at=OLD))
+        db.commit()
+        assert db.scalar(select(Todo.id).order_by(Todo.id.desc()).limit(1)) == todo["id"]
+    TodoArchiver(after_days=AFTER_DAYS, pause=0).archive()
+    assert _tables(user["id"]) == ({todo["id"]}, set())
+    with SessionLocal(bind=get_engine()) as db:
+        db.execute(update(Todo).where(Todo.id == todo["id"]).values(updated_at=utcnow()))
+        db.commit()
+
+
+def test_include_archived_reads_both_tables(client, archive_user, sleeps):
+    user_id, ids = archive_user
+    TodoArchiver(after_days=AFTER_DAYS, pause=0).archive()
+    url = f"/users/{user_id}/todos"
+    assert {t["id"] for t in client.get(url).json()} == {ids["frisch"], ids["offen"]}
+    both = client.get(url, params={"include_archived": "true"}).json()
+    assert [t["id"] for t in both] == sorted(ids.values())
+    done = client.get(f"/users/{user_id}/done_todos", params={"include_archived": "true"}).json()
+    assert len(done) == 6
+    assert len(client.get(f"/users/{user_id}/done_todos").json()) == 1
+
+
+def test_archive_metrics(client, archive_user, sleeps):
+    TodoArchiver(after_days=AFTER_DAYS, pause=0).archive()
+    text = render()
+    with SessionLocal(bind=get_engine()) as db:
+        archived = len(db.scalars(select(TodoArchive.id)).all())
+    assert f'db_table_rows{{table="todos_archive"}} {archived}' in text
+    assert "todo_archive_rows_total " in text
+
+
+def test_batch_locks_rows_with_skip_locked(client):
+    statements = []
+
+    def capture(orm_execute_state):
+        if orm_execute_state.is_select:
+            statements.append(orm_execute_state.statement)
+
+    with SessionLocal(bind=get_engine()) as db:
+        event.listen(db, "do_orm_execute", capture)
+        TodoRepository(db).archive_done(datetime(1995, 1, 1), 0, 10)
+    sql = str(statements[0].compile(dialect=mysql.dialect()))
+    assert sql.endswith("FOR UPDATE SKIP LOCKED")
@@ -0,0 +1,72 @@
+# todo_backend/tests/test_async.py
+# Async-Pfad (DB_ASYNC=1): Treiber-URL, Pool-Budget neben dem kleinen Sync-Pool und
+# ein Durchlauf der async Router gegen aiosqlite – in einem frischen Interpreter,
+# weil DB_ASYNC beim Import gelesen wird.
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from database.db_session import async_database_url, pool_limits
+
+_SCRIPT = textwrap.dedent("""
+    import json, sys, time
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        while client.get("/readyz").status_code != 200:
+            time.sleep(0.05)
+        user = client.post("/users/", json={"name": "async", "password": "geheim123"}).raise_for_status().json()
+        todo = client.post("/todos/", params={"user_id": user["id"]}, json={"task": "a"}).raise_for_status().json()
+        client.post("/todos/", params={"user_id": user["id"]}, json={"task": "b", "state": "DONE"}).raise_for_status()
+        url = f"/todos/{todo['id']}/state"
+        print(json.dumps({
+            "async_routers": "fast.routers_async" in sys.modules,
+            "todos": [t["task"] for t in client.get(f"/users/{user['id']}/todos").json()],
+            "open": [t["task"] for t in client.get(f"/users/{user['id']}/open_todos").json()],
+            "stale": client.put(url, params={"new_state": "DONE"}, headers={"If-Match": '"v2"'}).status_code,
+            "updated": client.put(url, params={"new_state": "DONE"}, headers={"If-Match": '"v1"'}).json()["version"],
+            "login": client.post("/users/authenticate", json={"name": "async", "password": "geheim123"}).status_code,
+            "deleted": client.delete(f"/todos/{todo['id']}").json(),
+            "left": [t["task"] for t in client.get(f"/users/{user['id']}/todos").json()],
+        }))
+""")
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("mysql+pymysql://u:p@host:3306/db", "mysql+aiomysql://u:p@host:3306/db"),
+    ("sqlite:////tmp/todo.db", "sqlite+aiosqlite:////tmp/todo.db"),
+])
+def test_async_database_url(url, expected):
+    assert async_database_url(url) == expected
+
+
+def test_async_database_url_unknown_backend():
+    with pytest.raises(RuntimeError):
+        async_database_url("oracle://u:p@host/db")
+
+
+def test_async_pool_leaves_room_for_sync_pool():
+    # 40 Connections, 4 Worker, je 4 für den Sync-Pool -> 6 für die AsyncEngine
+    pool_size, max_overflow = pool_limits(40, 4, reserved=4)
+    assert pool_size + max_overflow == 6
+
+
+def test_async_routers_end_to_end(tmp_path):
+    env = {**os.environ, "DB_ASYNC": "1", "DATABASE_URL": f"sqlite:///{tmp_path}/async.db"}
+    result = subprocess.run([sys.executable, "-c", _SCRIPT], capture_output=True, text=True, env=env, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == {
+        "async_routers": True,
+        "todos": ["a", "b"],
+        "open": ["a"],
+        "stale": 412,
+        "updated": 2,
+        "login": 200,
+        "deleted": True,
+        "left": ["b"],
+    }
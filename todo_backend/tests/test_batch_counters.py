@@ -0,0 +1,63 @@
+# todo_backend/tests/test_batch_counters.py
+# Batch-Writes mit STATS_COUNTERS: Zähler nur aus den tatsächlich geänderten Zeilen.
+import pytest
+from sqlalchemy import select
+
+import database.crud as crud
+from database.crud import StatsRepository, TodoRepository
+from database.db_session import SessionLocal
+from model.models import TodoCounter
+
+
+@pytest.fixture
+def counters(client, monkeypatch):
+    monkeypatch.setattr(crud, "STATS_COUNTERS", True)
+    with SessionLocal() as db:
+        StatsRepository(db).rebuild_counters()
+        yield db
+
+
+def counter_values(db, user_id: int) -> dict[str, int]:
+    db.expire_all()
+    rows = db.execute(select(TodoCounter.state, TodoCounter.n).where(TodoCounter.user_id == user_id))
+    return {state: n for state, n in rows if n}
+
+
+def real_counts(db, user_id: int) -> dict[str, int]:
+    return crud.UserRepository(db).count_todos_by_state([user_id])[user_id]
+
+
+def make_user(client, name: str, todos: int) -> tuple[int, list[int]]:
+    user = client.post("/users/", json={"name": name, "password": "geheim123"}).raise_for_status().json()
+    ids = [client.post("/todos/", params={"user_id": user["id"]}, json={"task": f"t{i}"}).raise_for_status().json()["id"]
+           for i in range(todos)]
+    return user["id"], ids
+
+
+@pytest.mark.parametrize("op", ["state", "delete"])
+def test_batch_with_concurrent_write_keeps_counters(client, counters, monkeypatch, op):
+    user_id, ids = make_user(client, f"batch-{op}", 4)
+    with SessionLocal() as db:
+        snapshot = TodoRepository(db)._owners(ids)
+    # "paralleler" Write nach dem Lesen des Batches: Todo 0 wechselt auf IN_PROGRESS
+    client.put(f"/todos/{ids[0]}/state", params={"new_state": "IN_PROGRESS"}).raise_for_status()
+
+    real_owners = TodoRepository._owners
+    rounds = []
+
+    def stale_first_read(self, todo_ids, lock=False):
+        found = real_owners(self, todo_ids, lock)
+        if not rounds:
+            found[ids[0]] = snapshot[ids[0]]  # veralteter Stand (OPEN, alte version)
+        rounds.append(todo_ids)
+        return found
+
+    monkeypatch.setattr(TodoRepository, "_owners", stale_first_read)
+    if op == "state":
+        body = client.patch("/todos/batch/state", json={"ids": ids, "state": "DONE"}).raise_for_status().json()
+    else:
+        body = client.request("DELETE", "/todos/batch", json={"ids": ids}).raise_for_status().json()
+
+    assert all(item["ok"] for item in body)
+    assert rounds[1] == [ids[0]]  # CAS verloren -> nur diese Zeile neu gelesen
+    assert counter_values(counters, user_id) == real_counts(counters, user_id)
@@ -0,0 +1,124 @@
+# todo_backend/tests/test_cache.py
+# Read-Through-Cache pro User: LRU/TTL-Grenzen, Zähler und Invalidierung
+# durch die Writes im TodoRepository.
+import pytest
+
+import database.crud as crud
+import fast.routers as routers
+from database.cache import LRUTodoCache, NullTodoCache, build_cache
+
+
+def _load(value):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return value
+
+    return loader, calls
+
+
+def test_hit_after_miss():
+    cache = LRUTodoCache(max_entries=4, ttl=60)
+    loader, calls = _load(["a"])
+    assert cache.get_or_load(1, "all", loader) == ["a"]
+    assert cache.get_or_load(1, "all", loader) == ["a"]
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_invalidate_user_only_drops_that_user():
+    cache = LRUTodoCache(max_entries=4, ttl=60)
+    loader, calls = _load([])
+    cache.get_or_load(1, "all", loader)
+    cache.get_or_load(2, "all", loader)
+    cache.invalidate_user(1)
+    cache.get_or_load(1, "all", loader)
+    cache.get_or_load(2, "all", loader)
+    assert len(calls) == 3
+
+
+def test_write_during_load_is_not_cached_under_new_version():
+    cache = LRUTodoCache(max_entries=4, ttl=60)
+
+    def racing_loader():
+        cache.invalidate_user(1)  # Write zwischen Versions-Lesen und DB-Zugriff
+        return ["alt"]
+
+    cache.get_or_load(1, "all", racing_loader)
+    loader, calls = _load(["neu"])
+    assert cache.get_or_load(1, "all", loader) == ["neu"]
+    assert len(calls) == 1
+
+
+def test_ttl_expiry_counts_as_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("database.cache.time.monotonic", lambda: now[0])
+    cache = LRUTodoCache(max_entries=4, ttl=30)
+    loader, calls = _load([])
+    cache.get_or_load(1, "all", loader)
+    now[0] += 31
+    cache.get_or_load(1, "all", loader)
+    assert len(calls) == 2
+    assert cache.evictions == 1
+
+
+def test_size_bound_evicts_least_recently_used():
+    cache = LRUTodoCache(max_entries=2, ttl=60)
+    loader, calls = _load([])
+    cache.get_or_load(1, "a", loader)
+    cache.get_or_load(1, "b", loader)
+    cache.get_or_load(1, "a", loader)  # a zuletzt benutzt -> b fliegt
+    cache.get_or_load(1, "c", loader)
+    assert cache.stats()["entries"] == 2
+    assert cache.evictions == 1
+    cache.get_or_load(1, "a", loader)
+    assert len(calls) == 3
+    cache.get_or_load(1, "b", loader)
+    assert len(calls) == 4
+
+
+def test_off_never_caches_but_counts_versions():
+    cache = build_cache("off")
+    assert isinstance(cache, NullTodoCache)
+    loader, calls = _load([])
+    cache.get_or_load(1, "all", loader)
+    cache.get_or_load(1, "all", loader)
+    cache.invalidate_user(1)
+    assert len(calls) == 2
+    assert cache.version(1) == 1
+
+
+@pytest.fixture
+def lru(monkeypatch):
+    cache = LRUTodoCache(max_entries=64, ttl=60)
+    monkeypatch.setattr(crud, "todo_cache", cache)
+    monkeypatch.setattr(routers, "todo_cache", cache)
+    return cache
+
+
+def test_list_reads_served_from_cache_until_write(client, lru, count_queries):
+    user = client.post("/users/", json={"name": "cached", "password": "geheim123"}).raise_for_status().json()
+    url = f"/users/{user['id']}/todos"
+    todo = client.post("/todos/", params={"user_id": user["id"]}, json={"task": "a"}).raise_for_status().json()
+    client.get(url).raise_for_status()
+    with count_queries() as queries:
+        assert [t["task"] for t in client.get(url).json()] == ["a"]
+    assert len(queries) == 0, queries.statements
+
+    # jeder Write-Pfad invalidiert den User
+    writes = [
+        lambda: client.post("/todos/", params={"user_id": user["id"]}, json={"task": "b"}),
+        lambda: client.put(f"/todos/{todo['id']}/state", params={"new_state": "DONE"}),
+        lambda: client.delete(f"/todos/{todo['id']}"),
+    ]
+    for write in writes:
+        write().raise_for_status()
+        with count_queries() as queries:
+            client.get(url).raise_for_status()
+        assert len(queries) == 1, queries.statements
+    assert [t["task"] for t in client.get(url).json()] == ["b"]
+
+    stats = client.get("/status/cache").json()
+    assert stats["backend"] == "LRUTodoCache"
+    assert stats["hits"] >= 2 and stats["misses"] == 4
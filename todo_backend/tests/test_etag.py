@@ -0,0 +1,19 @@
+# todo_backend/tests/test_etag.py
+# User-ETags: 304 mit einem Worker; ohne gemeinsame Versionen (mehrere Worker,
+# kein redis) weder ETag noch 304.
+import fast.etag
+
+
+def test_if_none_match_gets_304(client, users):
+    url = f"/users/{users[0]}/todos"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_no_user_etags_without_shared_versions(client, users, monkeypatch):
+    url = f"/users/{users[0]}/todos"
+    etag = client.get(url).headers["ETag"]
+    monkeypatch.setattr(fast.etag, "USER_ETAGS", False)
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
@@ -0,0 +1,36 @@
+# todo_backend/tests/test_events.py
+# Event-Bus: Heartbeat im ruhigen Stream, tote Subscriber brechen keinen Write.
+import asyncio
+
+import fast.events
+from database.events import TodoEventBus, todo_events
+
+
+def test_publish_to_closed_loop_drops_subscriber():
+    bus = TodoEventBus()
+
+    async def subscribe():
+        return bus.subscribe(7)
+
+    sub = asyncio.run(subscribe())  # danach ist der Loop des Subscribers geschlossen
+    bus.publish(7, "created", [{"id": 1}])  # darf nicht werfen
+    assert 7 not in bus._subscribers
+    bus.unsubscribe(sub)  # später aus dem finally des Streams: kein zweites Abmelden
+    assert bus.seq == 1
+
+
+def test_idle_stream_sends_heartbeat(monkeypatch):
+    monkeypatch.setattr(fast.events, "EVENTS_HEARTBEAT", 0.01)
+
+    async def frames():
+        stream = fast.events._stream(8, None)
+        try:
+            return [await stream.__anext__() for _ in range(3)]
+        finally:
+            await stream.aclose()
+
+    retry, ready, ping = asyncio.run(frames())
+    assert retry.startswith("retry:")
+    assert "event: ready" in ready
+    assert ping.endswith(": ping\n\n")
+    assert 8 not in todo_events._subscribers
@@ -0,0 +1,31 @@
+# todo_backend/tests/test_idempotency.py
+# Reservierung ohne Antwort läuft nach der Lease ab, gespeicherte Antworten erst nach der TTL.
+import time
+
+import pytest
+
+from database.idempotency import Claim, DbIdempotencyStore, MemoryIdempotencyStore
+
+
+@pytest.fixture(params=["memory", "db"])
+def store(request, client):  # client: Tabellen existieren
+    kind = MemoryIdempotencyStore if request.param == "memory" else DbIdempotencyStore
+    return kind(ttl=60, lease=0.05)
+
+
+def test_abandoned_claim_can_be_taken_over(store):
+    key = f"lease:{time.monotonic_ns()}"
+    assert store.claim(key, "fp")[0] is Claim.NEW
+    assert store.claim(key, "fp")[0] is Claim.IN_PROGRESS
+    time.sleep(0.1)
+    assert store.claim(key, "fp")[0] is Claim.NEW
+    assert store.claim(key, "fp")[0] is Claim.IN_PROGRESS
+
+
+def test_completed_response_outlives_lease(store):
+    key = f"done:{time.monotonic_ns()}"
+    assert store.claim(key, "fp")[0] is Claim.NEW
+    store.complete(key, 201, '{"id": 1}')
+    time.sleep(0.1)
+    assert store.claim(key, "fp") == (Claim.REPLAY, (201, '{"id": 1}'))
+    assert store.claim(key, "other")[0] is Claim.MISMATCH
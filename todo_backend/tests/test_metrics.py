@@ -0,0 +1,70 @@
+# todo_backend/tests/test_metrics.py
+# GET /metrics: Text-Format, Route-Templates statt Pfade, SQL pro Request,
+# Pool-Gauges und bcrypt-Zeiten.
+import pytest
+
+from monitoring.metrics import REGISTRY, Histogram, render
+
+
+def _value(text: str, sample: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+@pytest.fixture
+def histogram():
+    metric = Histogram("test_latency_seconds", "Test", ("route",), buckets=(0.1, 1.0))
+    yield metric
+    REGISTRY.remove(metric)
+
+
+def test_histogram_buckets_are_cumulative(histogram):
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, route='/a"b')
+    text = render()
+    assert "# TYPE test_latency_seconds histogram" in text
+    labels = 'route="/a\\"b"'
+    assert _value(text, f'test_latency_seconds_bucket{{{labels},le="0.1"}}') == 1
+    assert _value(text, f'test_latency_seconds_bucket{{{labels},le="1.0"}}') == 2
+    assert _value(text, f'test_latency_seconds_bucket{{{labels},le="+Inf"}}') == 3
+    assert _value(text, f"test_latency_seconds_count{{{labels}}}") == 3
+    assert _value(text, f"test_latency_seconds_sum{{{labels}}}") == pytest.approx(5.55)
+
+
+def test_status_db(client):
+    assert client.get("/status/db").json() == {"database": "connected"}
+
+
+def test_routes_and_queries_per_request(client, users):
+    route = 'route="/users/{user_id}/todos"'
+    before = client.get("/metrics").text
+    client.get(f"/users/{users[0]}/todos").raise_for_status()
+    client.get(f"/users/{users[1]}/todos").raise_for_status()
+    client.get("/gibt-es-nicht")
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = response.text
+
+    def delta(sample):
+        return _value(after, sample) - _value(before, sample)
+
+    # ein Sample pro Route-Template, nicht pro user_id
+    assert delta(f'http_requests_total{{method="GET",{route},status="200"}}') == 2
+    assert f"/users/{users[0]}/todos" not in after
+    assert delta('http_requests_total{method="GET",route="<unmatched>",status="404"}') == 1
+    assert delta(f'http_request_duration_seconds_count{{method="GET",{route}}}') == 2
+    assert delta(f"db_queries_per_request_sum{{{route}}}") == 2
+    assert delta(f'db_queries_total{{{route},operation="SELECT"}}') == 2
+    assert _value(after, "http_requests_in_flight") == 1  # der /metrics-Request selbst
+    assert _value(after, 'db_pool_size{engine="primary"}') >= 1
+
+
+def test_bcrypt_latency(client):
+    before = _value(client.get("/metrics").text, 'bcrypt_duration_seconds_count{op="hashpw"}')
+    client.post("/users/", json={"name": "metriken", "password": "geheim123"}).raise_for_status()
+    client.post("/users/authenticate", json={"name": "metriken", "password": "geheim123"}).raise_for_status()
+    text = client.get("/metrics").text
+    assert _value(text, 'bcrypt_duration_seconds_count{op="hashpw"}') == before + 1
+    assert _value(text, 'bcrypt_duration_seconds_count{op="checkpw"}') >= 1
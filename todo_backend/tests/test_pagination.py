@@ -0,0 +1,76 @@
+# todo_backend/tests/test_pagination.py
+# Keyset-Pagination GET /users/{id}/todos: Cursor, Filter und Query-Plan
+# (jede Seite ein Range-Scan über einen Index, kein Sortieren aller Todos des Users).
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from database.crud import todos_page_stmt
+from database.db_session import get_engine
+from model.enums import TodoState
+
+
+def _plan(stmt) -> str:
+    compiled = stmt.compile(get_engine(), compile_kwargs={"literal_binds": True})
+    with get_engine().connect() as conn:
+        return " | ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+
+
+@pytest.mark.parametrize("state", [None, TodoState.OPEN])
+def test_page_is_index_range_scan(client, users, state):
+    plan = _plan(todos_page_stmt(users[0], limit=10, after=5, state=state))
+    index = "ix_todos_user_state_id" if state else "ix_todos_user_id"
+    assert f"USING COVERING INDEX {index}" in plan or f"USING INDEX {index}" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_cursor_walks_all_pages(client, users):
+    url = f"/users/{users[1]}/todos"
+    seen, params = [], {"limit": 3}
+    while True:
+        response = client.get(url, params=params)
+        seen += [todo["id"] for todo in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 3, "after": cursor}
+    assert seen == sorted(seen)
+    assert len(seen) == 4
+
+
+def test_state_and_deadline_filters(client):
+    user = client.post("/users/", json={"name": "pager", "password": "geheim123"}).raise_for_status().json()
+    today = date.today()
+    for days, state in ((-2, "OPEN"), (0, "DONE"), (3, "OPEN"), (None, "OPEN")):
+        deadline = (today + timedelta(days=days)).isoformat() if days is not None else None
+        client.post("/todos/", params={"user_id": user["id"]},
+                    json={"task": f"t{days}", "state": state, "deadline": deadline}).raise_for_status()
+    url = f"/users/{user['id']}/todos"
+    assert [t["task"] for t in client.get(url, params={"state": "OPEN"}).json()] == ["t-2", "t3", "tNone"]
+    before = client.get(url, params={"deadline_before": today.isoformat()}).json()
+    assert [t["task"] for t in before] == ["t-2", "t0"]
+    after = client.get(url, params={"deadline_after": today.isoformat(), "state": "OPEN"}).json()
+    assert [t["task"] for t in after] == ["t3"]
+
+
+def test_cursor_keeps_state_filter(client, users):
+    url = f"/users/{users[2]}/todos"
+    first = client.get(url, params={"limit": 1, "state": "DONE"})
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(url, params={"limit": 1, "state": "DONE", "after": cursor})
+    assert [t["state"] for t in first.json() + second.json()] == ["DONE", "DONE"]
+    assert second.json()[0]["id"] > int(cursor)
+    # letzte Seite: kein Cursor mehr
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_full_list_has_no_cursor(client, users):
+    response = client.get(f"/users/{users[2]}/todos")
+    assert len(response.json()) == 4
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": 10_000}, {"after": -1}, {"state": "LATER"}])
+def test_invalid_page_params(client, users, params):
+    assert client.get(f"/users/{users[0]}/todos", params=params).status_code == 422
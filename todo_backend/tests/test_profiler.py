@@ -0,0 +1,87 @@
+# todo_backend/tests/test_profiler.py
+# SQL-Profil pro Request: Auslöser per Header/Stichprobe, Server-Timing,
+# EXPLAIN für langsame Statements, N+1-Erkennung und Slow-Query-Log.
+import json
+import logging
+
+import pytest
+from sqlalchemy import select
+
+import monitoring.profiler as profiler
+from database.db_session import SessionLocal
+from model.models import User
+from monitoring.middleware import RequestStats, current_request
+from monitoring.profiler import SqlProfile, normalize, params_shape
+
+PROFILE = {"X-SQL-Profile": "test-admin"}
+
+
+def _log(caplog) -> dict:
+    lines = [r.getMessage() for r in caplog.records if r.name == "monitoring.profiler"]
+    assert len(lines) == 1, lines
+    return json.loads(lines[0].removeprefix("sql profile "))
+
+
+def test_normalize_collapses_in_lists():
+    a = normalize("SELECT * FROM todos\n  WHERE id IN (?, ?, ?)")
+    b = normalize("SELECT * FROM todos WHERE id IN (?,?)")
+    assert a == b == "SELECT * FROM todos WHERE id IN (…)"
+
+
+def test_params_shape_has_no_values():
+    assert params_shape((1, "geheim")) == "(int, str)"
+    assert params_shape({"user_id": 1}) == "{user_id: int}"
+    assert params_shape([(1,), (2,)], executemany=True) == "2x (int)"
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-SQL-Profile": "falsch"}])
+def test_off_without_valid_header(client, users, headers):
+    response = client.get(f"/users/{users[0]}/todos", headers=headers)
+    assert "server-timing" not in response.headers
+
+
+def test_header_profile(client, users, caplog):
+    with caplog.at_level(logging.WARNING, logger="monitoring.profiler"):
+        response = client.get(f"/users/{users[0]}/todos", headers=PROFILE)
+    timing = response.headers["server-timing"]
+    assert timing.startswith('db;dur=') and '"1 queries"' in timing and "app;dur=" in timing
+    summary = _log(caplog)
+    assert summary["reason"] == "header" and summary["route"] == "/users/{user_id}/todos"
+    assert summary["queries"] == 1
+    assert summary["statements"][0]["params"].startswith("(int")  # Typen, keine Werte
+    assert str(users[0]) not in summary["statements"][0]["params"]
+
+
+def test_slow_statement_gets_explain(client, users, caplog, monkeypatch):
+    monkeypatch.setattr(profiler, "SQL_SLOW_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="monitoring.profiler"):
+        response = client.get(f"/users/{users[0]}/todos", headers=PROFILE)
+    assert 'db-slow;desc="1 over 0ms"' in response.headers["server-timing"]
+    assert "explain;dur=" in response.headers["server-timing"]
+    slow = _log(caplog)["slow"]
+    assert len(slow) == 1
+    assert any("ix_todos_user_id" in line for line in slow[0]["explain"]), slow[0]["explain"]
+
+
+def test_sampled_profile_logs_only_findings(client, users, caplog, monkeypatch):
+    monkeypatch.setattr(profiler, "SQL_PROFILE_SAMPLE", 1.0)
+    with caplog.at_level(logging.WARNING, logger="monitoring.profiler"):
+        response = client.get(f"/users/{users[0]}/todos")
+    assert "server-timing" in response.headers
+    assert not [r for r in caplog.records if r.name == "monitoring.profiler"]
+
+
+def test_lazy_loads_detected_as_repeated(client, users, monkeypatch):
+    monkeypatch.setattr(profiler, "SQL_REPEAT_THRESHOLD", 3)
+    profile = SqlProfile("header")
+    token = current_request.set(RequestStats({}, profile=profile))
+    try:
+        with SessionLocal() as db:
+            for user in db.scalars(select(User).where(User.id.in_(users))):
+                len(user.todos)  # Lazy Load pro User
+    finally:
+        current_request.reset(token)
+    repeated = profile.repeated()
+    assert len(repeated) == 1 and repeated[0]["count"] == len(users)
+    assert "FROM todos" in repeated[0]["statement"]
+    assert f'db-repeat;desc="1 statements, max {len(users)}x"' in profile.server_timing()
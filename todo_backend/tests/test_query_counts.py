@@ -0,0 +1,28 @@
+# todo_backend/tests/test_query_counts.py
+# Anzahl SQL-Statements pro Request festnageln – kein N+1 beim Serialisieren.
+
+
+def test_list_users_summary(client, users, count_queries):
+    with count_queries() as queries:
+        body = client.get("/users/").raise_for_status().json()
+    by_id = {user["id"]: user for user in body}
+    assert all(by_id[user_id]["counts"] == {"OPEN": 2, "DONE": 2} for user_id in users)
+    assert "todos" not in body[0]
+    # Users + eine GROUP-BY-Query für alle Zähler
+    assert len(queries) == 2, queries.statements
+
+
+def test_list_users_include_todos(client, users, count_queries):
+    with count_queries() as queries:
+        body = client.get("/users/", params={"include": "todos"}).raise_for_status().json()
+    by_id = {user["id"]: user for user in body}
+    assert [len(by_id[user_id]["todos"]) for user_id in users] == [4] * len(users)
+    # Users + ein selectinload für alle Todos, unabhängig von der Anzahl User
+    assert len(queries) == 2, queries.statements
+
+
+def test_user_todo_list(client, users, count_queries):
+    with count_queries() as queries:
+        body = client.get(f"/users/{users[0]}/todos").raise_for_status().json()
+    assert len(body) == 4
+    assert len(queries) == 1, queries.statements
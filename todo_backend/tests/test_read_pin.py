@@ -0,0 +1,58 @@
+# todo_backend/tests/test_read_pin.py
+# Primary-Pin über den Client: ein Write setzt Cookie/Header pro User, Reads
+# genau dieses Users gelten damit READ_PIN_SECONDS lang als gepinnt – egal
+# welcher Worker sie annimmt, andere User desselben Clients nicht.
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import database.db_session as db_session
+from fast.read_pin import ReadPinMiddleware
+
+
+@pytest.fixture
+def pin_client(monkeypatch):
+    monkeypatch.setattr(db_session, "DATABASE_READ_URLS", ["sqlite://"])
+    monkeypatch.setattr(db_session, "replicas", object())  # nur "nicht None" für _read_target
+    # frische In-Process-Pins: der Test prüft den Weg über den Client
+    monkeypatch.setattr(db_session, "primary_pins", db_session.PrimaryPins())
+    app = FastAPI()
+    app.add_middleware(ReadPinMiddleware, seconds=5)
+
+    @app.post("/users/{user_id}/write")
+    def write(user_id: int):
+        db_session.primary_pins.pin(user_id)
+        return {}
+
+    @app.get("/users/{user_id}/read")
+    def read(user_id: int, request: Request):
+        return {"client_pin": user_id in db_session.current_read_pin.get().pinned,
+                "primary": db_session._read_target(request) is None}
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_write_pins_only_that_user(pin_client):
+    assert pin_client.get("/users/1/read").json() == {"client_pin": False, "primary": False}
+    response = pin_client.post("/users/1/write")
+    assert "read_pin_1=" in response.headers["set-cookie"]
+    assert response.headers["x-read-pin"].startswith("1:")
+    # gemeinsamer Cookie-Jar (ein Client für mehrere User): nur User 1 liest vom Primary
+    assert pin_client.get("/users/1/read").json() == {"client_pin": True, "primary": True}
+    assert pin_client.get("/users/2/read").json() == {"client_pin": False, "primary": False}
+
+
+def test_pin_from_other_worker_via_header(pin_client):
+    # anderer Worker: keine In-Process-Pins, nur der Header des Clients
+    pin_client.cookies.clear()
+    headers = {"X-Read-Pin": f"1:{time.time()}, 3:{time.time()}"}
+    assert pin_client.get("/users/1/read", headers=headers).json() == {"client_pin": True, "primary": True}
+    assert pin_client.get("/users/2/read", headers=headers).json() == {"client_pin": False, "primary": False}
+
+
+def test_pin_header_expiry_and_garbage(pin_client):
+    for value in (f"1:{time.time() - 10}", "1:kaputt", "kaputt", f"x:{time.time()}"):
+        assert pin_client.get("/users/1/read", headers={"X-Read-Pin": value}).json()["client_pin"] is False
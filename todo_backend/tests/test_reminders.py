@@ -0,0 +1,145 @@
+# todo_backend/tests/test_reminders.py
+# Reminder-Sweeper: jedes fällige Todo genau einmal, nachträglich angelegte
+# Todos hinter der Marke, Claim per Compare-and-Swap, Wiederholung nach
+# Sink-Fehlern – und ein zwischen Late-Scan und Keyset-Scan wieder geöffnetes
+# Todo hinter der Marke darf nicht verloren gehen.
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, update
+
+import app.reminders as reminders
+from database.db_session import SessionLocal, get_engine
+from model.enums import TodoState
+from model.models import SweeperState, Todo, User
+
+
+class RecordingSink(reminders.ReminderSink):
+    def __init__(self):
+        self.ids: list[int] = []
+        self.batches = 0
+
+    def send(self, todos):
+        self.batches += 1
+        self.ids.extend(todo["id"] for todo in todos)
+
+
+class FailingSink(RecordingSink):
+    def send(self, todos):
+        raise ConnectionError("webhook down")
+
+
+@pytest.fixture
+def fresh_mark(client, users):
+    """Marke neu anlegen, ohne fällige Todos aus anderen Tests -> (sweeper, add_todo)."""
+    with SessionLocal(bind=get_engine()) as db:
+        db.execute(delete(SweeperState))
+        db.execute(update(Todo).values(deadline=None))
+        db.commit()
+    sweeper = reminders.ReminderSweeper(RecordingSink(), batch_size=2, lead_days=1)
+    assert sweeper.sweep() == 0
+
+    def add_todo(days: int, state: TodoState = TodoState.OPEN) -> int:
+        with SessionLocal(bind=get_engine()) as db:
+            todo = Todo(task=f"in {days}", deadline=date.today() + timedelta(days=days), state=state,
+                        user_id=users[0])
+            db.add(todo)
+            db.commit()
+            return todo.id
+
+    return sweeper, add_todo
+
+
+def test_due_todos_delivered_once_in_batches(fresh_mark):
+    sweeper, add_todo = fresh_mark
+    due = [add_todo(0), add_todo(1), add_todo(0)]
+    add_todo(0, TodoState.DONE)
+    add_todo(5)  # hinter dem Horizont (heute + lead_days)
+    assert sweeper.sweep() == 3
+    assert sorted(sweeper.sink.ids) == sorted(due)
+    assert sweeper.sink.batches == 2
+    assert sweeper.sweep() == 0
+    assert sweeper.last_run["rows"] == 0
+
+
+def test_late_todo_behind_mark_is_delivered(fresh_mark):
+    sweeper, add_todo = fresh_mark
+    add_todo(1)
+    sweeper.sweep()  # Marke steht jetzt auf morgen
+    late = add_todo(0)  # später angelegt, Deadline vor der Marke
+    assert sweeper.sweep() == 1
+    assert sweeper.sink.ids[-1] == late
+    assert sweeper.sweep() == 0
+
+
+def test_max_per_tick(fresh_mark):
+    sweeper, add_todo = fresh_mark
+    for _ in range(5):
+        add_todo(0)
+    sweeper.max_per_tick = 2
+    assert sweeper.sweep() == 2
+    sweeper.max_per_tick = 100
+    assert sweeper.sweep() == 3
+    assert len(set(sweeper.sink.ids)) == 5
+
+
+def test_failed_send_releases_claim(fresh_mark):
+    sweeper, add_todo = fresh_mark
+    todo_id = add_todo(0)
+    failing = reminders.ReminderSweeper(FailingSink(), batch_size=2)
+    with pytest.raises(ConnectionError):
+        failing.sweep()
+    assert sweeper.sweep() == 1
+    assert sweeper.sink.ids == [todo_id]
+
+
+def test_claim_is_compare_and_swap(fresh_mark):
+    sweeper, add_todo = fresh_mark
+    with SessionLocal(bind=get_engine()) as db:
+        stale = sweeper._state(db)
+        db.expunge(stale)
+        # zweiter Worker schiebt die Marke zuerst weiter
+        assert sweeper._claim(db, sweeper._state(db), todo_id=stale.todo_id + 1)
+        db.expire_all()
+        assert not sweeper._claim(db, stale, todo_id=stale.todo_id + 2)
+        assert sweeper._state(db).todo_id == stale.todo_id + 1
+
+
+def test_load_sink():
+    assert isinstance(reminders.load_sink("log"), reminders.LogSink)
+    with pytest.raises(RuntimeError):
+        reminders.load_sink("webhook")  # ohne REMINDER_WEBHOOK_URL
+    assert isinstance(reminders.load_sink("app.reminders:LogSink"), reminders.LogSink)
+
+
+def test_reopened_todo_behind_mark_is_delivered(client, users, monkeypatch):
+    today = date.today()
+    with SessionLocal(bind=get_engine()) as db:
+        db.execute(delete(SweeperState))
+        db.execute(update(Todo).values(deadline=None))
+        db.commit()
+        sweeper = reminders.ReminderSweeper(RecordingSink())
+        sweeper.sweep()  # legt die Marke an: alles bis hier gilt als bekannt
+        user = db.get(User, users[0])
+        reopened = Todo(task="alt", deadline=today - timedelta(days=10), state=TodoState.DONE, user=user)
+        due = Todo(task="heute", deadline=today, state=TodoState.OPEN, user=user)
+        db.add_all([reopened, due])
+        db.commit()
+        reopened_id, due_id = reopened.id, due.id
+
+    class ReopenAfterScans(SessionLocal.class_):
+        scans = 0
+
+        def scalars(self, *args, **kwargs):
+            result = list(super().scalars(*args, **kwargs))
+            ReopenAfterScans.scans += 1
+            if ReopenAfterScans.scans == 2:  # nach Late- und Keyset-Scan des ersten Durchlaufs
+                with SessionLocal(bind=get_engine()) as other:
+                    other.execute(update(Todo).where(Todo.id == reopened_id).values(state=TodoState.OPEN))
+                    other.commit()
+            return result
+
+    monkeypatch.setattr(reminders, "SessionLocal", lambda bind: ReopenAfterScans(bind=bind))
+    sweeper.sweep()
+    assert due_id in sweeper.sink.ids
+    assert reopened_id in sweeper.sink.ids
@@ -0,0 +1,75 @@
+# todo_backend/tests/test_responses.py
+# Listen-Fast-Path: Spalten-Queries ohne ORM-Objekte, JSON direkt über orjson
+# bzw. den TypeAdapter – gleiche Ausgabe wie über TodoRead.
+import json
+from datetime import date, datetime
+
+import pytest
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+
+import fast.responses as responses
+from database.crud import TodoRepository
+from database.db_session import SessionLocal
+from fast.schemas import TodoRead
+from model.enums import TodoState
+
+TODOS = [
+    {"id": 1, "user_id": 7, "task": "Fenster", "description": None, "deadline": date(2025, 11, 5),
+     "state": TodoState.OPEN, "version": 1, "updated_at": datetime(2025, 11, 1, 12, 30, 5, 250000)},
+    {"id": 2, "user_id": 7, "task": "Müll", "description": "gelb", "deadline": None,
+     "state": TodoState.DONE, "version": 3, "updated_at": datetime(2025, 11, 2, 8, 0)},
+]
+
+
+def _via_todo_read(todos: list[dict]) -> list[dict]:
+    return [json.loads(TodoRead.model_validate(todo).model_dump_json()) for todo in todos]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dump_todos_matches_todo_read(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(responses, "orjson", None)
+    assert json.loads(responses.dump_todos(TODOS)) == _via_todo_read(TODOS)
+
+
+def test_list_response_keeps_headers():
+    injected = Response()
+    injected.headers["ETag"] = 'W/"x-1-2"'
+    injected.headers["X-Next-Cursor"] = "2"
+    result = responses.todo_list_response(TODOS, injected)
+    assert result.media_type == "application/json"
+    assert result.headers["etag"] == 'W/"x-1-2"'
+    assert result.headers["x-next-cursor"] == "2"
+
+
+def test_default_response_class(monkeypatch):
+    assert isinstance(responses.default_response_class(), DefaultPlaceholder)
+    monkeypatch.setattr(responses, "JSON_RESPONSE", "orjson")
+    monkeypatch.setattr(responses, "orjson", None)
+    with pytest.raises(RuntimeError):
+        responses.default_response_class()
+
+
+def test_orjson_default_response_class(monkeypatch):
+    pytest.importorskip("orjson")
+    monkeypatch.setattr(responses, "JSON_RESPONSE", "orjson")
+    response_class = responses.default_response_class()
+    assert response_class is responses.OrjsonResponse
+    assert json.loads(response_class({1: date(2025, 1, 2)}).body) == {"1": "2025-01-02"}
+
+
+def test_list_query_loads_no_orm_objects(client, users):
+    with SessionLocal() as db:
+        todos, _ = TodoRepository(db).get_todos_page(users[0])
+        assert todos and all(isinstance(todo, dict) for todo in todos)
+        assert len(db.identity_map) == 0
+
+
+@pytest.mark.parametrize("path", ["todos", "open_todos", "done_todos", "todos?include_archived=true"])
+def test_list_endpoints_match_schema(client, users, path):
+    body = client.get(f"/users/{users[0]}/{path}").raise_for_status().json()
+    assert body == _via_todo_read(body)
+    assert all(set(todo) == set(TodoRead.model_fields) for todo in body)
@@ -0,0 +1,54 @@
+# todo_backend/tests/test_search.py
+# Volltextsuche: FTS5-Trigger halten den Index bei Insert/Update/Delete aktuell
+# (auch bei set-basierten Writes an der API vorbei), LIKE-Fallback ohne Index.
+import pytest
+from sqlalchemy import update
+
+import database.search as search
+from database.db_session import SessionLocal, get_engine
+from model.models import Todo
+
+
+@pytest.fixture(scope="module")
+def owner(client):
+    users = []
+    for name in ("sucher", "andere"):
+        user = client.post("/users/", json={"name": name, "password": "geheim123"}).raise_for_status().json()
+        users.append(user["id"])
+    return users
+
+
+def _search(client, user_id, q):
+    return [todo["task"] for todo in client.get(f"/users/{user_id}/todos/search", params={"q": q}).json()]
+
+
+def _add(client, user_id, task, description=None):
+    return client.post("/todos/", params={"user_id": user_id},
+                       json={"task": task, "description": description}).raise_for_status().json()["id"]
+
+
+def test_fts5_triggers_follow_writes(client, owner):
+    assert search.search_mode == "fts5"
+    me, other = owner
+    fenster = _add(client, me, "Fenster putzen", "Küche und Bad")
+    _add(client, other, "Fenster streichen")
+    assert _search(client, me, "fens") == ["Fenster putzen"]       # Präfix, nur eigene Todos
+    assert _search(client, me, "küche fenster") == ["Fenster putzen"]
+    with SessionLocal(bind=get_engine()) as db:                   # Update an der API vorbei
+        db.execute(update(Todo).where(Todo.id == fenster).values(task="Tür ölen"))
+        db.commit()
+    assert _search(client, me, "fenster") == []
+    assert _search(client, me, "tür") == ["Tür ölen"]
+    client.delete(f"/todos/{fenster}").raise_for_status()
+    assert _search(client, me, "tür") == []
+
+
+def test_like_fallback(client, owner, monkeypatch):
+    me, other = owner
+    _add(client, me, "Rasen mähen", "vor dem Regen")
+    _add(client, me, "Regenrinne", "säubern")
+    _add(client, other, "Regenschirm")
+    monkeypatch.setattr(search, "search_mode", "like")
+    # Treffer im Titel zuerst, nur eigene Todos
+    assert _search(client, me, "regen") == ["Regenrinne", "Rasen mähen"]
+    assert _search(client, me, "regen mähen") == ["Rasen mähen"]
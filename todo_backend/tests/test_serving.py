@@ -0,0 +1,112 @@
+# todo_backend/tests/test_serving.py
+# Multi-Prozess-Start (gunicorn.conf.py): Worker-Anzahl aus CPUs/cgroup-Quota,
+# Aufteilung von DB_CONNECTION_BUDGET auf die Worker, Defaults für mehrere Worker.
+import importlib.util
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from database.db_session import pool_limits
+
+CONF = str(Path(__file__).resolve().parents[1] / "gunicorn.conf.py")
+
+
+@pytest.mark.parametrize("budget, workers", [(40, 4), (100, 3), (30, 8), (5, 1)])
+def test_pool_limits_stay_within_budget(budget, workers):
+    pool_size, max_overflow = pool_limits(budget, workers)
+    assert workers * (pool_size + max_overflow) <= budget
+    assert pool_size >= 1 and max_overflow >= 0
+    assert pool_size == max((pool_size + max_overflow) * 3 // 4, 1)
+
+
+def test_pool_limits_never_below_one_connection():
+    assert pool_limits(2, 8) == (1, 0)
+    assert pool_limits(10, 2, reserved=20) == (1, 0)
+
+
+@pytest.fixture
+def conf(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")  # ein Worker: keine Env-Defaults
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", CONF)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _files(contents: dict[str, str]):
+    def fake_open(path, *args, **kwargs):
+        if path not in contents:
+            raise FileNotFoundError(path)
+        return io.StringIO(contents[path])
+    return fake_open
+
+
+@pytest.mark.parametrize("contents, expected", [
+    ({"/sys/fs/cgroup/cpu.max": "150000 100000\n"}, 1.5),
+    ({"/sys/fs/cgroup/cpu.max": "max 100000\n"}, None),
+    ({"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "200000", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000"}, 2.0),
+    ({"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "-1", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000"}, None),
+    ({}, None),
+])
+def test_cgroup_cpus(conf, contents, expected):
+    conf.open = _files(contents)  # Modul-Global verdeckt das eingebaute open
+    assert conf.cgroup_cpus() == expected
+
+
+def test_default_workers_follow_quota(conf, monkeypatch):
+    conf.cgroup_cpus = lambda: 1.5
+    assert conf.available_cpus() <= 1.5
+    monkeypatch.setenv("WORKERS_PER_CPU", "2")
+    assert conf.default_workers() == math.ceil(conf.available_cpus() * 2)
+
+
+def test_recycling_defaults(conf):
+    assert conf.max_requests == 10000
+    assert conf.max_requests_jitter == 1000
+    assert conf.preload_app is True
+
+
+def test_multi_worker_config(tmp_path):
+    # frischer Interpreter: gunicorn.conf.py setzt die Env, db_session liest sie beim Import
+    code = (
+        "import json, runpy, os; runpy.run_path(%r);"
+        "from database.db_session import DB_POOL_SIZE, DB_MAX_OVERFLOW;"
+        "print(json.dumps({k: os.environ.get(k) for k in ('TODO_CACHE', 'IDEMPOTENCY_STORE', 'BCRYPT_WORKERS')}"
+        " | {'pool': [DB_POOL_SIZE, DB_MAX_OVERFLOW]}))"
+    ) % CONF
+    env = {k: v for k, v in os.environ.items() if k not in ("TODO_CACHE", "IDEMPOTENCY_STORE", "BCRYPT_WORKERS")}
+    env.update(WEB_CONCURRENCY="4", DB_CONNECTION_BUDGET="40", DATABASE_URL=f"sqlite:///{tmp_path}/w.db")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    assert json.loads(result.stdout) == {
+        "TODO_CACHE": "off", "IDEMPOTENCY_STORE": "db", "BCRYPT_WORKERS": "0", "pool": [7, 3],
+    }
+
+
+class FakeLog:
+    def __init__(self):
+        self.warnings: list[str] = []
+
+    def info(self, msg, *args):
+        pass
+
+    def warning(self, msg, *args):
+        self.warnings.append(msg % args)
+
+
+def test_when_ready_warns_about_small_budget(conf, monkeypatch):
+    import database.db_session as db_session
+
+    monkeypatch.setattr(db_session, "DB_CONNECTION_BUDGET", 4)
+    monkeypatch.setattr(db_session, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(db_session, "DB_MAX_OVERFLOW", 1)
+    conf.workers = 2
+    server = type("Server", (), {"log": FakeLog()})()
+    conf.when_ready(server)
+    assert any("DB_CONNECTION_BUDGET 4 too small: 2 workers need 8" in w for w in server.log.warnings)
+    assert any("SSE events are per worker" in w for w in server.log.warnings)
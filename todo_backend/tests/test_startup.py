@@ -0,0 +1,67 @@
+# todo_backend/tests/test_startup.py
+# Start: /livez sofort, /readyz erst nach dem Warmup; Warmup wiederholt bei
+# DB-Fehlern, Schema-Bootstrap läuft genau einmal.
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+
+import app.startup as startup
+import database.db_session as db_session
+
+
+def test_livez_and_readyz_before_warmup(client, monkeypatch):
+    monkeypatch.setattr(startup, "readiness", startup.Readiness())
+    assert client.get("/livez").json() == {"status": "alive"}
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["status"] == "starting"
+
+
+def test_readyz_after_warmup(client):
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert {"import", "bootstrap", "prewarm", "total"} <= response.json()["timings"].keys()
+
+
+def test_warm_up_retries_until_db_is_reachable(monkeypatch):
+    readiness = startup.Readiness()
+    monkeypatch.setattr(startup, "readiness", readiness)
+    calls = []
+
+    def flaky_bootstrap():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("db down")
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(startup, "_bootstrap", flaky_bootstrap)
+    monkeypatch.setattr(startup, "prewarm_pool", lambda engine: 1)
+    monkeypatch.setattr(startup.asyncio, "sleep", no_sleep)
+    asyncio.run(startup.warm_up(0.0))
+    assert len(calls) == 2
+    assert readiness.ready and readiness.attempts == 2 and readiness.error is None
+
+
+def test_bootstrap_schema_runs_once(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(db_session, "_bootstrapped", False)
+    monkeypatch.setattr(db_session.Base.metadata, "create_all", lambda bind: calls.append(bind))
+    threads = [threading.Thread(target=db_session.bootstrap_schema) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+
+
+def test_optional_modules_not_imported_with_app():
+    # frischer Interpreter: nur bei Bedarf geladen (DB_ASYNC=1 bzw. REMINDER_SINK=webhook)
+    code = "import sys, app.main; print(','.join(m for m in ('fast.routers_async', 'urllib.request') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            env={**os.environ, "DB_ASYNC": "0"})
+    assert result.stdout.strip() == ""
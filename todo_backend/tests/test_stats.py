@@ -0,0 +1,96 @@
+# todo_backend/tests/test_stats.py
+# GET /users/{id}/stats und GET /stats: eine GROUP-BY-Query über den Index,
+# mit STATS_COUNTERS=1 aus todo_counters.
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select, text
+
+import database.crud as crud
+from database.crud import stats_stmt
+from database.db_session import SessionLocal, get_engine
+from model.models import Todo, User
+
+TODAY = date.today()
+
+
+def _day(days: int) -> str:
+    return (TODAY + timedelta(days=days)).isoformat()
+
+
+@pytest.fixture(scope="module")
+def stats_user(client):
+    user = client.post("/users/", json={"name": "statistik", "password": "geheim123"}).raise_for_status().json()
+    todos = [
+        ("OPEN", _day(-3)),         # überfällig
+        ("IN_PROGRESS", _day(-1)),  # überfällig
+        ("OPEN", _day(2)),          # nächste Deadline
+        ("IN_PROGRESS", _day(5)),
+        ("DONE", _day(-10)),        # erledigt: weder überfällig noch nächste Deadline
+        ("DONE", _day(1)),
+        ("OPEN", None),
+    ]
+    for state, deadline in todos:
+        client.post("/todos/", params={"user_id": user["id"]},
+                    json={"task": state, "state": state, "deadline": deadline}).raise_for_status()
+    return user["id"]
+
+
+EXPECTED = {
+    "counts": {"OPEN": 3, "IN_PROGRESS": 2, "DONE": 2},
+    "total": 7,
+    "overdue": 2,
+    "next_deadline": _day(2),
+}
+
+
+def test_user_stats(client, stats_user, count_queries):
+    with count_queries() as queries:
+        body = client.get(f"/users/{stats_user}/stats").raise_for_status().json()
+    assert body == {"user_id": stats_user, **EXPECTED}
+    assert len(queries) == 1, queries.statements
+
+
+def test_user_stats_uses_covering_index(client, stats_user):
+    compiled = stats_stmt(TODAY, stats_user).compile(get_engine(), compile_kwargs={"literal_binds": True})
+    with get_engine().connect() as conn:
+        plan = " | ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    assert "USING COVERING INDEX ix_todos_user_state_deadline" in plan, plan
+
+
+def test_user_without_todos(client):
+    user = client.post("/users/", json={"name": "leer", "password": "geheim123"}).raise_for_status().json()
+    body = client.get(f"/users/{user['id']}/stats").json()
+    assert body == {"user_id": user["id"], "counts": {}, "total": 0, "overdue": 0, "next_deadline": None}
+
+
+def test_global_stats_needs_admin(client):
+    assert client.get("/stats").status_code == 401
+
+
+def test_global_stats(client, stats_user, admin):
+    body = client.get("/stats", headers=admin).raise_for_status().json()
+    with SessionLocal() as db:
+        assert body["total"] == db.scalar(select(func.count()).select_from(Todo))
+        assert body["users"] == db.scalar(select(func.count()).select_from(User))
+    assert body["total"] == sum(body["counts"].values())
+    assert body["overdue"] >= EXPECTED["overdue"]
+
+
+def test_counter_table_follows_writes(client, stats_user, admin, monkeypatch, count_queries):
+    monkeypatch.setattr(crud, "STATS_COUNTERS", True)
+    assert client.post("/stats/rebuild-counters").status_code == 401
+    client.post("/stats/rebuild-counters", headers=admin).raise_for_status()
+    url = f"/users/{stats_user}/stats"
+    assert client.get(url).json() == {"user_id": stats_user, **EXPECTED}
+
+    todo = client.post("/todos/", params={"user_id": stats_user}, json={"task": "neu"}).raise_for_status().json()
+    client.put(f"/todos/{todo['id']}/state", params={"new_state": "DONE"}).raise_for_status()
+    with count_queries() as queries:
+        body = client.get(url).json()
+    # Zähler aus todo_counters + ein Range-Scan für overdue/next_deadline
+    assert len(queries) == 2, queries.statements
+    assert body["counts"] == {"OPEN": 3, "IN_PROGRESS": 2, "DONE": 3}
+
+    client.delete(f"/todos/{todo['id']}").raise_for_status()
+    assert client.get(url).json() == {"user_id": stats_user, **EXPECTED}
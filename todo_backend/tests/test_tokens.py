@@ -0,0 +1,20 @@
+# todo_backend/tests/test_tokens.py
+import pytest
+
+from security.tokens import TokenError, create_token, verify_token
+
+
+def test_roundtrip():
+    user = verify_token(create_token(7, "anna"))
+    assert (user.id, user.name) == (7, "anna")
+
+
+@pytest.mark.parametrize("token", ["kein-token", "abc.def", "äöü.ß", create_token(7, "anna") + "ä"])
+def test_invalid_tokens_raise_token_error(token):
+    with pytest.raises(TokenError):
+        verify_token(token)
+
+
+def test_non_ascii_bearer_is_401(client):
+    r = client.get("/users/me", headers={"Authorization": "Bearer é.é".encode("latin-1")})
+    assert r.status_code == 401
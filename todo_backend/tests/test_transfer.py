@@ -0,0 +1,87 @@
+# todo_backend/tests/test_transfer.py
+# NDJSON-Import: Fehler pro Zeile als 422 mit Zeilennummer und bereits importierten Zeilen.
+import pytest
+
+
+@pytest.mark.parametrize("method, path", [("GET", "/todos/export"), ("POST", "/todos/import")])
+def test_transfer_needs_admin_token(client, method, path):
+    assert client.request(method, path).status_code == 401
+    assert client.request(method, path, headers={"Authorization": "Bearer falsch"}).status_code == 401
+
+
+def test_import_malformed_line_is_422(client, users, admin):
+    body = f'{{"task": "ok", "user_id": {users[0]}}}\n{{"task": \n'.encode()
+    r = client.post("/todos/import", headers=admin, content=body)
+    assert r.status_code == 422
+    detail = r.json()["detail"]
+    assert detail["line"] == 2
+    assert detail["imported"] == 0
+    assert "input" not in detail["error"][0]
+
+
+def test_import_unknown_user_is_422(client, users, admin):
+    lines = [f'{{"task": "a", "user_id": {users[0]}}}', '{"task": "b", "user_id": 999999}']
+    r = client.post("/todos/import", headers=admin, content="\n".join(lines).encode())
+    assert r.status_code == 422
+    assert r.json()["detail"]["line"] == 2
+    assert "a" not in [todo["task"] for todo in client.get(f"/users/{users[0]}/todos").json()]  # Chunk verworfen
+
+
+def test_import_duplicate_id_is_422(client, users, admin):
+    todo = client.get(f"/users/{users[0]}/todos").json()[0]
+    r = client.post("/todos/import", params={"keep_ids": "true"}, headers=admin, content=(
+        f'{{"id": {todo["id"]}, "task": "dup", "user_id": {users[0]}}}'
+    ).encode())
+    assert r.status_code == 422
+    assert r.json()["detail"]["line"] == 1
+
+
+def test_export_with_admin_token(client, users, admin):
+    r = client.get("/todos/export", params={"user_id": users[1]}, headers=admin)
+    assert r.status_code == 200
+    assert len(r.text.splitlines()) == 4
+
+
+def test_export_import_round_trip_keeps_version_and_archive(client, admin):
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import delete, select, update
+
+    from database.crud import TodoRepository
+    from database.db_session import SessionLocal, get_engine
+    from model.models import Todo, TodoArchive
+
+    user = client.post("/users/", json={"name": "roundtrip", "password": "geheim123"}).raise_for_status().json()
+    for task in ("a", "b", "c"):
+        client.post("/todos/", params={"user_id": user["id"]}, json={"task": task}).raise_for_status()
+    todos = client.get(f"/users/{user['id']}/todos").json()
+    client.put(f"/todos/{todos[0]['id']}/state", params={"new_state": "DONE"}).raise_for_status()
+    old = datetime(2020, 1, 2, 3, 4, 5)
+    with SessionLocal(bind=get_engine()) as db:
+        db.execute(update(Todo).where(Todo.id == todos[1]["id"]).values(updated_at=old))
+        # ältestes DONE-Todo überhaupt -> limit=1 archiviert genau dieses
+        db.execute(update(Todo).where(Todo.id == todos[0]["id"]).values(updated_at=datetime(1999, 1, 1)))
+        db.commit()
+        TodoRepository(db).archive_done(datetime.now() + timedelta(days=1), todos[-1]["id"], 1)
+
+    def snapshot():
+        with SessionLocal(bind=get_engine()) as db:
+            hot = db.execute(select(Todo.id, Todo.task, Todo.version, Todo.updated_at)
+                             .where(Todo.user_id == user["id"]).order_by(Todo.id)).all()
+            cold = db.execute(select(TodoArchive.id, TodoArchive.version, TodoArchive.archived_at)
+                              .where(TodoArchive.user_id == user["id"])).all()
+        return hot, cold
+
+    before = snapshot()
+    assert before[1] and before[0][0].version == 1 and old in [row.updated_at for row in before[0]]
+    body = client.get("/todos/export", params={"user_id": user["id"], "include_archived": "true"},
+                      headers=admin).content
+    with SessionLocal(bind=get_engine()) as db:
+        db.execute(delete(Todo).where(Todo.user_id == user["id"]))
+        db.execute(delete(TodoArchive).where(TodoArchive.user_id == user["id"]))
+        db.commit()
+
+    assert client.post("/todos/import", headers=admin, content=body).status_code == 422  # Archiv ohne keep_ids
+    r = client.post("/todos/import", params={"keep_ids": "true"}, headers=admin, content=body)
+    assert r.status_code == 200 and r.json()["rows"] == 3
+    assert snapshot() == before
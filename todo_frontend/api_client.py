@@ -0,0 +1,183 @@
+# todo_frontend/api_client.py
+# HTTP-Client für die Streamlit-App: ein gemeinsamer Connection-Pool für alle
+# Browser-Sessions, Deadline pro Aufruf, Retries mit Jitter nur für idempotente
+# Requests und ein Circuit Breaker, der bei totem Backend sofort abbricht.
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUS = {502, 503, 504}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Backend gilt als nicht erreichbar – Aufruf wurde gar nicht erst gesendet."""
+
+
+class CircuitBreaker:
+    """closed -> (failure_threshold Fehler in Folge) -> open -> (reset_timeout) -> half-open.
+
+    Im half-open-Zustand darf genau ein Probe-Request durch; Erfolg schließt den
+    Breaker wieder, ein Fehler öffnet ihn für ein weiteres reset_timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 15.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    def retry_in(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
+
+
+class ApiClient:
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        pool_size: int = 20,
+        connect_timeout: float = 3.05,
+        deadline: float = 15.0,
+        retries: int = 3,
+        backoff_base: float = 0.3,
+        backoff_cap: float = 4.0,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        # die Session teilen sich alle Browser-Sessions: keine Cookies speichern (z.B. read_pin_<user>
+        # vom Backend) – Zustand pro Browser-Session gehört in st.session_state
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        # ein Host -> ein Pool; pool_maxsize = parallele Connections über alle Sessions
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="api")
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponentiell mit Full Jitter: zufällig in [0, min(cap, base * 2^attempt)]."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def request(self, method: str, path: str, *, deadline: float | None = None, **kwargs) -> requests.Response:
+        """Ein Aufruf mit Gesamt-Deadline; wiederholt nur idempotente Requests.
+
+        POST gilt als idempotent, wenn ein Idempotency-Key-Header mitgeschickt wird.
+        """
+        method = method.upper()
+        headers = kwargs.get("headers") or {}
+        idempotent = method in IDEMPOTENT_METHODS or "Idempotency-Key" in headers
+        tries = self.retries + 1 if idempotent else 1
+        give_up_at = time.monotonic() + (deadline or self.deadline)
+
+        for attempt in range(tries):
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"Backend nicht erreichbar, neuer Versuch in {self.breaker.retry_in():.0f} s")
+            remaining = give_up_at - time.monotonic()
+            delay = None
+            try:
+                r = self.session.request(
+                    method, self.url(path), timeout=(self.connect_timeout, max(remaining, 0.1)), **kwargs
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                self.breaker.record_failure()
+                if attempt == tries - 1:
+                    raise
+            except Exception:
+                # alles andere (ChunkedEncodingError, kaputte Antwort, …) zählt auch als Fehler –
+                # sonst bliebe ein half-open-Probe belegt und der Breaker für immer offen
+                self.breaker.record_failure()
+                raise
+            else:
+                if r.status_code not in RETRY_STATUS:
+                    self.breaker.record_success()
+                    return r
+                self.breaker.record_failure()
+                if attempt == tries - 1:
+                    return r
+                retry_after = r.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else None
+            delay = self._backoff(attempt) if delay is None else delay
+            if time.monotonic() + delay >= give_up_at:
+                raise requests.Timeout(f"Deadline für {method} {path} überschritten")
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def request_many(self, calls: dict[str, tuple[str, str, dict]]) -> dict[str, requests.Response | Exception]:
+        """Unabhängige Requests parallel: {name: (method, path, kwargs)} -> {name: Response oder Exception}."""
+        futures = {
+            name: self._executor.submit(self.request, method, path, **kwargs)
+            for name, (method, path, kwargs) in calls.items()
+        }
+        results: dict[str, requests.Response | Exception] = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+        return results
+
+    def wait_until_ready(self, path: str = "/readyz", deadline: float = 90.0) -> bool:
+        """Pollt den Readiness-Endpunkt (am Breaker vorbei) bis 200 oder Deadline."""
+        give_up_at = time.monotonic() + deadline
+        while time.monotonic() < give_up_at:
+            try:
+                r = self.session.get(self.url(path), timeout=(self.connect_timeout, 30))
+                if r.status_code == 200:
+                    self.breaker.record_success()
+                    return True
+                retry_after = r.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else 1.0
+            except requests.RequestException:
+                delay = 2.0
+            time.sleep(min(delay, max(give_up_at - time.monotonic(), 0)))
+        return False
@@ -1,65 +1,153 @@
+import json
 import os
-import time
+import uuid
+from datetime import date
+
 import requests
 import streamlit as st
 
+from api_client import ApiClient
+from live import TodoFeed
+
 # ------------------------------------------------------------
 # Konfiguration
 # ------------------------------------------------------------
 API_BASE = os.getenv("API_BASE", "http://localhost:8000").rstrip("/")
-SESSION = requests.Session()
+WARMUP_DEADLINE = 90  # Sekunden, die warmup_once höchstens auf /readyz wartet
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "20"))  # Connections zum Backend, über alle Sessions
+API_DEADLINE = float(os.getenv("API_DEADLINE", "15"))  # Sekunden pro Aufruf inkl. Retries
+API_LIVE = os.getenv("API_LIVE", "1") == "1"  # Liste per SSE-Deltas aktuell halten statt pro Rerun laden
+LIVE_REFRESH = float(os.getenv("LIVE_REFRESH", "2"))  # Sekunden; rendert nur die lokale Kopie neu
 
 # ------------------------------------------------------------
 # Helper
 # ------------------------------------------------------------
-def api_url(path: str) -> str:
-    return f"{API_BASE}/{path.lstrip('/')}"
+@st.cache_resource
+def get_client() -> ApiClient:
+    """Ein Client (Pool + Circuit Breaker) für alle Browser-Sessions des Prozesses."""
+    return ApiClient(API_BASE, pool_size=API_POOL_SIZE, deadline=API_DEADLINE)
 
 def warmup_once() -> None:
-    """Weckt das Backend (Render Free-Tier) genau einmal pro Session auf."""
+    """Weckt das Backend (Render Free-Tier) genau einmal pro Session auf.
+
+    Pollt /readyz (ohne DB-Zugriff im Backend) bis Schema und Connection-Pool
+    bereit sind; 503 bedeutet "startet noch", Retry-After gibt das Intervall vor.
+    """
     if st.session_state.get("warmed_up"):
         return
     with st.spinner("Backend wird aufgeweckt…"):
-        for i in range(3):
-            try:
-                SESSION.get(api_url("/status"), timeout=25)
-                SESSION.get(api_url("/status/db"), timeout=25)
-                break
-            except Exception:
-                time.sleep(2 * (i + 1))
+        get_client().wait_until_ready("/readyz", deadline=WARMUP_DEADLINE)
     st.session_state["warmed_up"] = True
     return None
 
-def request_with_retry(method: str, path: str, *, tries: int = 5, timeout: int = 35, **kwargs) -> requests.Response:
-    url = api_url(path)
-    last_exc = None
-    for i in range(1, tries + 1):
-        try:
-            r = SESSION.request(method, url, timeout=timeout, **kwargs)
-            if r.status_code in (502, 503, 504):
-                raise RuntimeError(f"Upstream {r.status_code}")
-            return r
-        except Exception as e:
-            last_exc = e
-            if i == tries:
-                break
-            time.sleep(2 * i)
-    raise last_exc
+def auth_headers() -> dict[str, str]:
+    token = st.session_state.get("token")
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+def etag_cache() -> dict[str, requests.Response]:
+    """Letzte 200-Antwort je GET-URL (pro Browser-Session) für If-None-Match."""
+    return st.session_state.setdefault("etag_cache", {})
+
+def read_pins() -> dict[str, str]:
+    """Primary-Pins dieser Browser-Session (user_id -> Zeitpunkt des Writes) aus X-Read-Pin.
+
+    Der Client ist für alle Sessions gemeinsam und speichert keine Cookies –
+    so pinnt ein Write nur die Reads der eigenen Session, nicht die aller User.
+    """
+    return st.session_state.setdefault("read_pins", {})
+
+def _prepare(method: str, path: str, kwargs: dict) -> str | None:
+    """Auth-Header, X-Read-Pin und If-None-Match setzen; liefert den Cache-Key für GETs.
+
+    Läuft im Script-Thread – st.session_state ist in den Worker-Threads nicht verfügbar.
+    """
+    kwargs["headers"] = {**auth_headers(), **kwargs.get("headers", {})}
+    if pins := read_pins():
+        kwargs["headers"]["X-Read-Pin"] = ", ".join(f"{user_id}:{at}" for user_id, at in pins.items())
+    if method != "GET":
+        return None
+    cache_key = requests.Request("GET", get_client().url(path), params=kwargs.get("params")).prepare().url
+    cached = etag_cache().get(cache_key)
+    if cached is not None:
+        kwargs["headers"]["If-None-Match"] = cached.headers["ETag"]
+    return cache_key
+
+def _remember(cache_key: str | None, r: requests.Response) -> requests.Response:
+    for part in r.headers.get("X-Read-Pin", "").split(","):
+        user_id, _, at = part.strip().partition(":")
+        if at:
+            read_pins()[user_id] = at
+    if cache_key is not None:
+        if r.status_code == 304:
+            return etag_cache()[cache_key]
+        if r.status_code == 200 and "ETag" in r.headers:
+            etag_cache()[cache_key] = r
+    return r
+
+def api_request(method: str, path: str, **kwargs) -> requests.Response:
+    cache_key = _prepare(method, path, kwargs)
+    return _remember(cache_key, get_client().request(method, path, **kwargs))
+
+def api_get_many(paths: dict[str, str]) -> dict[str, requests.Response | Exception]:
+    """Mehrere unabhängige GETs parallel ({name: path}); Fehler kommen als Exception zurück."""
+    calls, cache_keys = {}, {}
+    for name, path in paths.items():
+        kwargs: dict = {}
+        cache_keys[name] = _prepare("GET", path, kwargs)
+        calls[name] = ("GET", path, kwargs)
+    results = get_client().request_many(calls)
+    return {
+        name: r if isinstance(r, Exception) else _remember(cache_keys[name], r)
+        for name, r in results.items()
+    }
+
+def todo_feed(user_id: int) -> TodoFeed:
+    """Ein Feed (SSE-Thread + lokale Kopie) pro Browser-Session und User."""
+    feed = st.session_state.get("todo_feed")
+    if feed is None or feed.user_id != user_id or not feed.alive:
+        if feed is not None:
+            feed.stop()
+        feed = TodoFeed(get_client(), user_id, auth_headers())
+        st.session_state["todo_feed"] = feed
+    feed.touch()
+    return feed
+
+def stop_feed() -> None:
+    feed = st.session_state.pop("todo_feed", None)
+    if feed is not None:
+        feed.stop()
+
+def submit_key(action: str, payload: dict) -> str:
+    """Ein Idempotency-Key pro logischem Submit.
+
+    Bleibt über Reruns/Doppelklicks gleich, solange sich die Eingaben nicht
+    ändern und der Submit nicht erfolgreich war (dann submit_done()).
+    """
+    pending = st.session_state.setdefault("submit_keys", {})
+    fingerprint = json.dumps(payload, sort_keys=True, default=str)
+    if action not in pending or pending[action][0] != fingerprint:
+        pending[action] = (fingerprint, str(uuid.uuid4()))
+    return pending[action][1]
+
+def submit_done(action: str) -> None:
+    st.session_state.setdefault("submit_keys", {}).pop(action, None)
 
 def api_post(path: str, **kwargs) -> requests.Response:
-    return request_with_retry("POST", path, **kwargs)
+    return api_request("POST", path, **kwargs)
 
 def api_get(path: str, **kwargs) -> requests.Response:
-    return request_with_retry("GET", path, **kwargs)
+    return api_request("GET", path, **kwargs)
 
 # ------------------------------------------------------------
 # Auth-Logik
 # ------------------------------------------------------------
 def do_login(username: str, password: str) -> tuple[bool, str | None]:
     try:
-        resp = api_post("/users/authenticate", json={"name": username, "password": password})
+        resp = api_post("/users/login", json={"name": username, "password": password})
         if resp.status_code == 200:
-            st.session_state["user"] = resp.json()
+            data = resp.json()
+            st.session_state["token"] = data["access_token"]
+            st.session_state["user"] = data["user"]
             st.session_state["logged_in"] = True
             return True, None
         elif resp.status_code in (401, 404):
@@ -71,8 +159,10 @@ def do_login(username: str, password: str) -> tuple[bool, str | None]:
 
 def do_register(username: str, password: str) -> tuple[bool, str | None]:
     try:
-        resp = api_post("/users/", json={"name": username, "password": password})
+        payload = {"name": username, "password": password}
+        resp = api_post("/users/", json=payload, headers={"Idempotency-Key": submit_key("register", payload)})
         if resp.status_code == 200:
+            submit_done("register")
             return do_login(username, password)
         elif resp.status_code == 409:
             return False, "Benutzername bereits vergeben."
@@ -96,6 +186,9 @@ def header_bar() -> str:
             if st.button("Logout", use_container_width=True):
                 st.session_state["logged_in"] = False
                 st.session_state.pop("user", None)
+                st.session_state.pop("token", None)
+                st.session_state.pop("etag_cache", None)
+                stop_feed()
                 _ = st.success("Abgemeldet.")
                 st.rerun()
     _ = st.divider()
@@ -145,6 +238,50 @@ def register_view() -> None:
                     _ = st.error(msg or "Registrierung fehlgeschlagen.")
     return None
 
+def show_stats(data: dict) -> None:
+    c1, c2, c3, c4 = st.columns(4)
+    _ = c1.metric("Offen", data["counts"].get("OPEN", 0))
+    _ = c2.metric("Erledigt", data["counts"].get("DONE", 0))
+    _ = c3.metric("Überfällig", data["overdue"])
+    _ = c4.metric("Nächste Deadline", data["next_deadline"] or "–")
+
+def live_search(user_id: int, query: str, revision: int) -> list[dict]:
+    """Sucht nur neu, wenn sich Suchbegriff oder Liste geändert haben – das Fragment läuft periodisch."""
+    cached = st.session_state.get("live_search")
+    if cached is not None and cached[0] == (user_id, query, revision):
+        return cached[1]
+    r = api_get(f"/users/{user_id}/todos/search", params={"q": query, "limit": 50})
+    r.raise_for_status()
+    st.session_state["live_search"] = ((user_id, query, revision), r.json())
+    return r.json()
+
+@st.fragment(run_every=LIVE_REFRESH)
+def live_todos(user_id: int) -> None:
+    """Stats und Liste aus der lokalen Kopie des Feeds; ohne Suche kein Request pro Rerun."""
+    feed = todo_feed(user_id)
+    if feed.loaded:
+        show_stats(feed.stats(date.today()))
+    _ = st.subheader("Todos")
+    query = st.text_input("Suche", placeholder="z.B. fenster küche")
+    if query.strip():
+        try:
+            todos = live_search(user_id, query, feed.revision)
+        except Exception as e:
+            _ = st.error(f"Fehler bei der Suche: {e}")
+            return None
+    elif feed.loaded:
+        todos = feed.snapshot()
+    else:
+        _ = st.info(f"Verbindung wird aufgebaut… {feed.error or ''}")
+        return None
+    if feed.error:
+        _ = st.caption(f"Live-Verbindung unterbrochen, Stand evtl. veraltet ({feed.error})")
+    if todos:
+        _ = st.table(todos)
+    else:
+        _ = st.info("Keine Todos.")
+    return None
+
 def authed_view() -> None:
     user = st.session_state.get("user")
     _ = st.title(f"Willkommen, {user['name']}")
@@ -153,7 +290,7 @@ def authed_view() -> None:
     _ = st.subheader("Neues Todo")
     task = st.text_input("Task")
     description = st.text_input("Beschreibung")
-    state = st.selectbox("Status", ["OPEN", "DONE"])  # ggf. im Backend ergänzen
+    state = st.selectbox("Status", ["OPEN", "IN_PROGRESS", "DONE"])
     deadline = st.date_input("Deadline")
 
     if st.button("Todo erstellen", use_container_width=True):
@@ -164,8 +301,12 @@ def authed_view() -> None:
             "state": state,
         }
         try:
-            r = api_post("/todos/", json=payload, params={"user_id": user_id})
+            key = submit_key("create_todo", payload)
+            r = api_post("/todos/", json=payload, params={"user_id": user_id}, headers={"Idempotency-Key": key})
             if r.status_code == 200:
+                submit_done("create_todo")
+                if API_LIVE:
+                    todo_feed(user_id).apply("created", r.json())  # nicht aufs Event warten
                 _ = st.success("Todo gespeichert.")
                 _ = st.json(r.json())
             else:
@@ -173,19 +314,36 @@ def authed_view() -> None:
         except Exception as e:
             _ = st.error(f"Fehler beim Speichern: {e}")
 
+    if API_LIVE:
+        live_todos(user_id)
+        return None
+
+    # Liste und Stats sind unabhängig – parallel laden
+    results = api_get_many({"todos": f"/users/{user_id}/todos", "stats": f"/users/{user_id}/stats"})
+
+    stats = results["stats"]
+    if not isinstance(stats, Exception) and stats.status_code == 200:
+        show_stats(stats.json())
+
     _ = st.subheader("Todos")
-    try:
-        r = api_get(f"/users/{user_id}/todos")
-        if r.status_code == 200:
-            todos = r.json()
-            if todos:
-                _ = st.table(todos)
-            else:
-                _ = st.info("Keine Todos.")
+    query = st.text_input("Suche", placeholder="z.B. fenster küche")
+    if query.strip():
+        try:
+            r = api_get(f"/users/{user_id}/todos/search", params={"q": query, "limit": 50})
+        except Exception as e:
+            r = e
+    else:
+        r = results["todos"]
+    if isinstance(r, Exception):
+        _ = st.error(f"Fehler beim Laden: {r}")
+    elif r.status_code == 200:
+        todos = r.json()
+        if todos:
+            _ = st.table(todos)
         else:
-            _ = st.error(f"Fehler beim Laden ({r.status_code}): {r.text}")
-    except Exception as e:
-        _ = st.error(f"Fehler beim Laden: {e}")
+            _ = st.info("Keine Todos.")
+    else:
+        _ = st.error(f"Fehler beim Laden ({r.status_code}): {r.text}")
     return None
 
 # ------------------------------------------------------------
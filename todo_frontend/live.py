@@ -0,0 +1,156 @@
+# todo_frontend/live.py
+# Live-Liste: ein Hintergrund-Thread pro Browser-Session hält den SSE-Stream
+# GET /users/{id}/todos/events offen und wendet die Deltas auf eine lokale
+# Kopie der Todos an. Die Seite rendert aus der Kopie – Requests gibt es nur
+# noch pro Änderung, nicht pro Rerun.
+#
+#   ready / reset              -> komplette Liste einmal laden
+#   created / updated / deleted -> lokale Kopie anpassen
+#   id-Zeilen (auch Heartbeats) -> Last-Event-ID für den Reconnect
+#
+# Mehrere Backend-Worker (Header X-Event-Workers > 1): der Stream sieht nur
+# Writes seines Workers, deshalb zusätzlich alle FEED_RESYNC Sekunden neu laden.
+import json
+import threading
+import time
+from datetime import date
+from typing import Iterator
+
+import requests
+
+from api_client import ApiClient
+
+FEED_READ_TIMEOUT = 45   # Sekunden ohne Daten (Heartbeat kommt alle 15 s) -> Verbindung gilt als tot
+FEED_MAX_BACKOFF = 30    # Sekunden zwischen Reconnects nach Fehlern
+FEED_IDLE = 300          # Sekunden ohne touch() -> Tab ist zu, Thread beendet sich
+FEED_RESYNC = 30         # Sekunden zwischen vollständigen Reloads, wenn der Bus nicht alle Writes sieht
+
+
+def parse_events(lines: Iterator[str]) -> Iterator[tuple[str | None, str, str | None]]:
+    """SSE-Zeilen -> (id, event, data); data None bei Blöcken ohne data (Heartbeat mit id)."""
+    event_id, event, data = None, "message", []
+    for line in lines:
+        if not line:
+            if event_id is not None or data:
+                yield event_id, event, "\n".join(data) if data else None
+            event_id, event, data = None, "message", []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        value = value.removeprefix(" ")
+        if field == "id":
+            event_id = value
+        elif field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+
+
+class TodoFeed:
+    def __init__(self, client: ApiClient, user_id: int, headers: dict[str, str]):
+        self.client = client
+        self.user_id = user_id
+        self.headers = headers
+        self.todos: dict[int, dict] = {}
+        self.loaded = False
+        self.revision = 0  # zählt angewandte Änderungen
+        self.error: str | None = None
+        self.last_event_id: str | None = None
+        self.reloaded = 0.0  # monotonic des letzten _reload
+        self.touched = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        # eigene Session: ein offener Stream belegt sonst dauerhaft eine Connection im gemeinsamen Pool
+        self._session = requests.Session()
+        self._thread = threading.Thread(target=self._run, name=f"todo-feed-{user_id}", daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def touch(self) -> None:
+        self.touched = time.monotonic()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._session.close()
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            return sorted(self.todos.values(), key=lambda todo: todo["id"])
+
+    def stats(self, today: date) -> dict:
+        """Wie GET /users/{id}/stats, aus der lokalen Kopie."""
+        counts: dict[str, int] = {}
+        overdue, next_deadline = 0, None
+        for todo in self.snapshot():
+            counts[todo["state"]] = counts.get(todo["state"], 0) + 1
+            if todo["state"] == "DONE" or not todo.get("deadline"):
+                continue
+            deadline = date.fromisoformat(todo["deadline"])
+            if deadline < today:
+                overdue += 1
+            elif next_deadline is None or deadline < next_deadline:
+                next_deadline = deadline
+        return {"counts": counts, "overdue": overdue, "next_deadline": next_deadline}
+
+    def apply(self, event: str, todo: dict) -> None:
+        """Delta anwenden; auch für eigene Writes direkt nach der Antwort (das Event kommt dann doppelt, egal)."""
+        with self._lock:
+            if event == "deleted":
+                self.todos.pop(todo["id"], None)
+            elif event in ("created", "updated"):
+                self.todos[todo["id"]] = todo
+            else:
+                return
+            self.revision += 1
+
+    def _reload(self) -> None:
+        r = self.client.request("GET", f"/users/{self.user_id}/todos", headers=self.headers)
+        r.raise_for_status()
+        with self._lock:
+            self.todos = {todo["id"]: todo for todo in r.json()}
+            self.loaded = True
+            self.reloaded = time.monotonic()
+            self.revision += 1
+
+    def _listen(self) -> None:
+        headers = {**self.headers, "Accept": "text/event-stream"}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+        with self._session.get(
+            self.client.url(f"/users/{self.user_id}/todos/events"), headers=headers, stream=True,
+            timeout=(self.client.connect_timeout, FEED_READ_TIMEOUT),
+        ) as r:
+            r.raise_for_status()
+            # pro Worker ein eigener Bus: Writes über andere Worker kommen nur per Reload an
+            partial = int(r.headers.get("X-Event-Workers") or 1) > 1
+            for event_id, event, data in parse_events(r.iter_lines(decode_unicode=True)):
+                if self._stop.is_set() or time.monotonic() - self.touched > FEED_IDLE:
+                    self._stop.set()
+                    return
+                resync = partial and self.loaded and time.monotonic() - self.reloaded > FEED_RESYNC
+                if event in ("ready", "reset") or resync:
+                    # resync spätestens mit dem nächsten Heartbeat; ein Delta ist im Reload schon enthalten
+                    self._reload()
+                elif data is not None:
+                    self.apply(event, json.loads(data))
+                # erst nach dem Anwenden weiterzählen: scheitert _reload, kommt das reset beim Reconnect wieder
+                if event_id is not None:
+                    self.last_event_id = event_id
+                self.error = None
+
+    def _run(self) -> None:
+        delay = 1.0
+        while not self._stop.is_set():
+            try:
+                self._listen()
+                delay = 1.0  # Server beendet Streams regulär nach EVENTS_MAX_AGE
+            except (requests.RequestException, ValueError) as e:
+                if self._stop.is_set():
+                    return
+                self.error = f"{e.__class__.__name__}: {e}"
+                delay = min(delay * 2, FEED_MAX_BACKOFF)
+            self._stop.wait(delay)
@@ -0,0 +1,213 @@
+# todo_frontend/tests/test_api_client.py
+# ApiClient ohne Netz: Session.request und die Uhr sind ersetzt, Sleeps
+# laufen auf der Fake-Uhr.
+from email.message import Message
+
+import pytest
+import requests
+from requests.cookies import MockRequest, MockResponse
+from requests.structures import CaseInsensitiveDict
+
+import api_client
+from api_client import ApiClient, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(api_client.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(api_client.time, "sleep", clock.sleep)
+    return clock
+
+
+def response(status: int, **headers) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    r.headers = CaseInsensitiveDict(headers)
+    return r
+
+
+def scripted(client: ApiClient, *outcomes):
+    """Session.request liefert nacheinander outcomes (Response oder Exception)."""
+    calls = []
+    queue = list(outcomes)
+
+    def request(method, url, **kwargs):
+        calls.append((method, url, kwargs))
+        outcome = queue.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    client.session.request = request
+    return calls
+
+
+def make_client(**kwargs) -> ApiClient:
+    kwargs.setdefault("breaker", CircuitBreaker(failure_threshold=3, reset_timeout=15.0))
+    return ApiClient("http://backend:8000/", **kwargs)
+
+
+# ---- CircuitBreaker ----
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=15.0)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    clock.now += 5
+    assert breaker.retry_in() == pytest.approx(10.0)
+
+
+def test_breaker_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=15.0)
+    breaker.record_failure()
+    clock.now += 15
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()  # zweiter Request wartet auf den Probe
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_breaker_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=15.0)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 15
+    assert breaker.allow()
+    breaker.record_failure()  # ein Fehler genügt, Schwelle gilt nur im closed-Zustand
+    assert breaker.state == "open"
+    assert breaker.retry_in() == pytest.approx(15.0)
+
+
+# ---- Backoff ----
+
+def test_backoff_is_full_jitter_up_to_cap(monkeypatch):
+    client = make_client(backoff_base=0.5, backoff_cap=3.0)
+    monkeypatch.setattr(api_client.random, "uniform", lambda low, high: (low, high))
+    assert [client._backoff(attempt) for attempt in range(4)] == [(0, 0.5), (0, 1.0), (0, 2.0), (0, 3.0)]
+
+
+# ---- request ----
+
+def test_get_retries_connection_errors(clock):
+    client = make_client(retries=3)
+    calls = scripted(client, requests.ConnectionError(), requests.ConnectionError(), response(200))
+    assert client.request("GET", "/users/1/todos").status_code == 200
+    assert len(calls) == 3
+    assert calls[0][1] == "http://backend:8000/users/1/todos"
+    assert len(clock.sleeps) == 2
+    assert client.breaker.state == "closed" and client.breaker.failures == 0
+
+
+def test_post_is_sent_once(clock):
+    client = make_client(retries=3)
+    calls = scripted(client, response(503))
+    assert client.request("POST", "/todos/", json={"task": "a"}).status_code == 503
+    assert len(calls) == 1 and clock.sleeps == []
+
+
+def test_post_with_idempotency_key_is_retried(clock):
+    client = make_client(retries=3)
+    calls = scripted(client, requests.ConnectionError(), response(200))
+    r = client.request("POST", "/todos/", headers={"Idempotency-Key": "k1"}, json={"task": "a"})
+    assert r.status_code == 200 and len(calls) == 2
+
+
+def test_post_connection_error_is_raised(clock):
+    client = make_client(retries=3)
+    scripted(client, requests.ConnectionError())
+    with pytest.raises(requests.ConnectionError):
+        client.request("POST", "/todos/", json={"task": "a"})
+
+
+def test_retry_after_is_honoured(clock):
+    client = make_client(retries=3)
+    scripted(client, response(503, **{"Retry-After": "2"}), response(200))
+    assert client.request("GET", "/users/").status_code == 200
+    assert clock.sleeps == [2.0]
+
+
+def test_last_retry_status_is_returned(clock):
+    client = make_client(retries=1, breaker=CircuitBreaker(failure_threshold=10))
+    calls = scripted(client, response(502), response(502))
+    assert client.request("GET", "/users/").status_code == 502
+    assert len(calls) == 2
+
+
+def test_deadline_stops_retries(clock):
+    client = make_client(retries=5, deadline=3.0)
+    calls = scripted(client, response(503, **{"Retry-After": "2"}), response(503, **{"Retry-After": "2"}))
+    with pytest.raises(requests.Timeout):
+        client.request("GET", "/users/")
+    assert len(calls) == 2 and clock.sleeps == [2.0]
+
+
+def test_timeout_shrinks_with_deadline(clock):
+    client = make_client(retries=1, deadline=10.0, connect_timeout=1.0)
+    calls = scripted(client, response(503, **{"Retry-After": "4"}), response(200))
+    client.request("GET", "/users/")
+    assert [kwargs["timeout"] for _, _, kwargs in calls] == [(1.0, 10.0), (1.0, 6.0)]
+
+
+def test_open_circuit_fails_fast(clock):
+    client = make_client(retries=0)
+    calls = scripted(client, *[requests.ConnectionError()] * 3)
+    for _ in range(3):
+        with pytest.raises(requests.ConnectionError):
+            client.request("GET", "/users/")
+    with pytest.raises(CircuitOpenError):
+        client.request("GET", "/users/")
+    assert len(calls) == 3
+
+
+def test_unexpected_error_releases_half_open_probe(clock):
+    client = make_client(retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=15.0))
+    scripted(client, requests.ConnectionError(), requests.exceptions.ChunkedEncodingError(), response(200))
+    with pytest.raises(requests.ConnectionError):
+        client.request("GET", "/users/")
+    clock.now += 15
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.request("GET", "/users/")
+    clock.now += 15
+    assert client.request("GET", "/users/").status_code == 200
+
+
+def test_request_many_collects_errors():
+    client = make_client(retries=0, breaker=CircuitBreaker(failure_threshold=10))
+
+    def request(method, url, **kwargs):
+        if url.endswith("/kaputt"):
+            raise requests.ConnectionError("weg")
+        return response(200)
+
+    client.session.request = request
+    results = client.request_many({"ok": ("GET", "/users/", {}), "kaputt": ("GET", "/kaputt", {})})
+    assert results["ok"].status_code == 200
+    assert isinstance(results["kaputt"], requests.ConnectionError)
+
+
+def test_shared_session_keeps_no_cookies():
+    # Set-Cookie vom Backend (z.B. read_pin_<user>) darf nicht bei anderen Browser-Sessions landen
+    client = make_client()
+    headers = Message()
+    headers["Set-Cookie"] = "read_pin_1=123; Path=/"
+    request = requests.Request("POST", "http://backend:8000/todos/").prepare()
+    client.session.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+    assert len(client.session.cookies) == 0